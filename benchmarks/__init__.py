@@ -0,0 +1,3 @@
+"""
+Throughput and memory benchmarks for the generation and load pipeline.
+"""
@@ -0,0 +1,444 @@
+"""
+Benchmark suite for data generation, file writers, dashboard loaders and
+bronze ingestion.
+
+Every case runs in a fresh child process against a temporary data root
+(FACTORY_DATA_ROOT), so peak RSS is measured per case and nothing is written
+to the project's raw_data/ or ground_truth/. Cases are parameterized by
+machine count (a generated single-line layout, see scaled_layout) and day
+count. Only the measured section of each case is timed; the best of
+--repeat runs is reported.
+
+Results are written as JSON so runs from different commits can be diffed:
+
+    python -m benchmarks.run_benchmarks --machines 3,30,300 --days 1,7
+    python -m benchmarks.run_benchmarks --output after.json --compare before.json
+
+--compare exits non-zero when any case's throughput drops (or its peak RSS
+grows) by more than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import duckdb
+
+from data_generators import config
+from data_generators.config import START_DATE, RANDOM_SEED, RAW_DATA_DIR, MACHINES
+from data_generators.factory_config import apply_factory_config
+from data_generators.generate_data import (
+    derive_seed, generate_production_batches, generate_sensor_logs, generate_qc_checks,
+    generate_operator_logs, generate_machine_records, generate_day
+)
+from data_generators.output_formats import FORMATS, RAW_TABLES, write_table, find_table_file, read_table_frame
+from data_generators.vectorized import make_rng, generate_production_batches_vectorized, generate_sensor_logs_columnar
+from orchestration.ingest_bronze import ingest
+
+DEFAULT_MACHINES = "3,30,300"
+DEFAULT_DAYS = "1"
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_OUTPUT = Path(__file__).parent / "results" / "latest.json"
+
+# A case returns (amount processed, seconds spent in the measured section)
+CaseResult = Tuple[int, float]
+
+
+# ============================================================================
+# SETUP HELPERS
+# ============================================================================
+
+def scaled_layout(num_machines: int) -> Dict:
+    """
+    Build a one-line factory config with `num_machines` machines.
+
+    Two thirds are smelters and one third assemblers, using the default
+    machines' parameters; a third of the smelters degrade like SMELTER-02.
+
+    Args:
+        num_machines: Total machine count
+
+    Returns:
+        Factory config for apply_factory_config
+    """
+    smelter, assembler = MACHINES[0], MACHINES[2]
+    template_fields = ("machine_type", "input_product", "output_product", "base_output_rate",
+                       "base_efficiency", "typical_batch_minutes", "energy_per_unit")
+
+    num_smelters = max(1, round(num_machines * 2 / 3))
+    machines = [{"template": "smelter", "count": num_smelters}]
+    if num_machines > num_smelters:
+        machines.append({"template": "assembler", "count": num_machines - num_smelters})
+
+    return {
+        "seed": RANDOM_SEED,
+        "degradation_profiles": {"stable": 0.0, "degrading": 0.02},
+        "templates": {
+            "smelter": {**{f: smelter[f] for f in template_fields}, "degradation": {"stable": 2, "degrading": 1}},
+            "assembler": {**{f: assembler[f] for f in template_fields}, "degradation": 0.0}
+        },
+        "factories": [{
+            **config.FACTORY,
+            "factory_id": "F01",
+            "lines": [{"line_id": "L01", "machines": machines}]
+        }]
+    }
+
+
+def bench_dates(days: int) -> List[datetime]:
+    """Return the first `days` production dates."""
+    start = datetime.combine(START_DATE, datetime.min.time())
+    return [start + timedelta(days=i) for i in range(days)]
+
+
+def generate_tables(date: datetime) -> Dict[str, List[Dict]]:
+    """Generate one day's raw records in memory (python engine, no late arrivals)."""
+    days_elapsed = (date.date() - START_DATE).days
+    tables = {table: [] for table in RAW_TABLES}
+    for machine in MACHINES:
+        _, records = generate_machine_records(date, machine, days_elapsed, RANDOM_SEED)
+        for table, rows in records.items():
+            tables[table].extend(rows)
+    return tables
+
+
+def write_days(dates: List[datetime], root: Path, fmt: str) -> List[Path]:
+    """Write generated raw tables for each date under root/<date>/; returns the files."""
+    paths = []
+    for date in dates:
+        day_dir = root / date.strftime("%Y-%m-%d")
+        day_dir.mkdir(parents=True, exist_ok=True)
+        for table, rows in generate_tables(date).items():
+            paths.append(write_table(rows, day_dir, table, fmt))
+    return paths
+
+
+def count_raw_rows(root: Path) -> int:
+    """Count rows in every raw table file under root (including late drops)."""
+    rows = 0
+    for directory in [p for p in root.rglob("*") if p.is_dir()]:
+        for table in RAW_TABLES:
+            path = find_table_file(directory, table)
+            if path:
+                rows += len(read_table_frame(path))
+    return rows
+
+
+# ============================================================================
+# BENCHMARK CASES
+# ============================================================================
+
+# Per-machine generators, called as fn(date, machine, batches, days_elapsed)
+MACHINE_GENERATORS = {
+    "production_batches": lambda date, machine, batches, days_elapsed: generate_production_batches(
+        date.date(), machine, days_elapsed),
+    "sensor_logs": lambda date, machine, batches, days_elapsed: generate_sensor_logs(batches, machine),
+    "qc_checks": lambda date, machine, batches, days_elapsed: generate_qc_checks(batches, date.date()),
+    "operator_logs": lambda date, machine, batches, days_elapsed: generate_operator_logs(batches, machine, date.date())
+}
+
+
+def bench_machine_generator(dates: List[datetime], generator: str) -> CaseResult:
+    """
+    Time one per-machine generator function across machines and days.
+
+    Production batches are generated (untimed) first for generators that
+    consume them, under the same per-machine seed generate_day uses.
+    """
+    records, elapsed = 0, 0.0
+    for date in dates:
+        days_elapsed = (date.date() - START_DATE).days
+        for machine in MACHINES:
+            random.seed(derive_seed(RANDOM_SEED, date, machine["machine_id"]))
+            batches = generate_production_batches(date.date(), machine, days_elapsed)
+
+            started = time.perf_counter()
+            output = MACHINE_GENERATORS[generator](date, machine, batches, days_elapsed)
+            elapsed += time.perf_counter() - started
+            records += len(output)
+    return records, elapsed
+
+
+def bench_vectorized_batches(dates: List[datetime]) -> CaseResult:
+    """Time the numpy batch engine (all machines per call)."""
+    records, elapsed = 0, 0.0
+    for date in dates:
+        rng = make_rng(date.date(), RANDOM_SEED)
+        started = time.perf_counter()
+        columns = generate_production_batches_vectorized(date.date(), MACHINES, (date.date() - START_DATE).days, rng)
+        elapsed += time.perf_counter() - started
+        records += len(columns["start_time"])
+    return records, elapsed
+
+
+def bench_vectorized_sensors(dates: List[datetime]) -> CaseResult:
+    """Time the columnar sensor engine."""
+    records, elapsed = 0, 0.0
+    for date in dates:
+        rng = make_rng(date.date(), RANDOM_SEED)
+        columns = generate_production_batches_vectorized(date.date(), MACHINES, (date.date() - START_DATE).days, rng)
+        started = time.perf_counter()
+        sensors = generate_sensor_logs_columnar(columns, MACHINES, rng)
+        elapsed += time.perf_counter() - started
+        records += len(sensors["timestamp"])
+    return records, elapsed
+
+
+def bench_generate_day(dates: List[datetime], engine: str) -> CaseResult:
+    """Time generate_day end to end (generation, chaos, late arrivals and default-format writes)."""
+    started = time.perf_counter()
+    for date in dates:
+        generate_day(date, engine=engine, late_arrivals=True)
+    elapsed = time.perf_counter() - started
+    return count_raw_rows(RAW_DATA_DIR), elapsed
+
+
+def bench_writer(dates: List[datetime], fmt: str) -> CaseResult:
+    """Time write_table for every raw table; amount is bytes written."""
+    tables_by_date = [generate_tables(date) for date in dates]
+    out_dir = RAW_DATA_DIR / f"write-{fmt}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    written, elapsed = 0, 0.0
+    for tables in tables_by_date:
+        started = time.perf_counter()
+        paths = [write_table(rows, out_dir, table, fmt) for table, rows in tables.items()]
+        elapsed += time.perf_counter() - started
+        written += sum(path.stat().st_size for path in paths)
+    return written, elapsed
+
+
+def bench_loader(dates: List[datetime], fmt: str) -> CaseResult:
+    """Time read_table_frame (the raw file reader behind aggregate rebuilds) on every raw table."""
+    paths = write_days(dates, RAW_DATA_DIR / f"read-{fmt}", fmt)
+
+    started = time.perf_counter()
+    rows = sum(len(read_table_frame(path)) for path in paths)
+    return rows, time.perf_counter() - started
+
+
+def bench_ingest(dates: List[datetime], fmt: str) -> CaseResult:
+    """Time a full bronze ingest of every raw partition into a new warehouse."""
+    write_days(dates, RAW_DATA_DIR, fmt)
+    db_path = config.DATA_ROOT / f"bench-{fmt}.db"
+    db_path.unlink(missing_ok=True)
+
+    con = duckdb.connect(str(db_path))
+    started = time.perf_counter()
+    results = ingest(con, raw_root=RAW_DATA_DIR)
+    elapsed = time.perf_counter() - started
+    con.close()
+    return sum(sum(counts.values()) for counts in results.values()), elapsed
+
+
+# Case name -> (unit of the measured amount, function taking the dates)
+CASES = {
+    **{f"generate.{name}": ("records", lambda d, name=name: bench_machine_generator(d, name))
+       for name in MACHINE_GENERATORS},
+    "generate.vectorized_batches": ("records", bench_vectorized_batches),
+    "generate.vectorized_sensor_logs": ("records", bench_vectorized_sensors),
+    "generate_day.python": ("records", lambda d: bench_generate_day(d, "python")),
+    "generate_day.numpy": ("records", lambda d: bench_generate_day(d, "numpy")),
+    "generate_day.des": ("records", lambda d: bench_generate_day(d, "des")),
+    **{f"write.{fmt}": ("bytes", lambda d, fmt=fmt: bench_writer(d, fmt)) for fmt in FORMATS},
+    **{f"load.{fmt}": ("rows", lambda d, fmt=fmt: bench_loader(d, fmt)) for fmt in FORMATS},
+    **{f"ingest.{fmt}": ("rows", lambda d, fmt=fmt: bench_ingest(d, fmt)) for fmt in FORMATS}
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def run_case(name: str, machines: int, days: int, repeat: int) -> Dict:
+    """
+    Run one case in the current process (called inside the child).
+
+    Args:
+        name: Key of CASES
+        machines: Machine count
+        days: Day count
+        repeat: Timed runs; the fastest is kept
+
+    Returns:
+        Result dictionary (see run_suite)
+    """
+    apply_factory_config(scaled_layout(machines))
+    unit, case = CASES[name]
+    dates = bench_dates(days)
+
+    amount, seconds = 0, float("inf")
+    for _ in range(repeat):
+        run_amount, run_seconds = case(dates)
+        if run_seconds < seconds:
+            amount, seconds = run_amount, run_seconds
+
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+    return {
+        "name": name,
+        "machines": machines,
+        "days": days,
+        "unit": f"{unit}/s",
+        "amount": amount,
+        "seconds": round(seconds, 6),
+        "throughput": round(amount / seconds, 2) if seconds > 0 else None,
+        "peak_rss_mb": round(peak_rss_mb, 1)
+    }
+
+
+def spawn_case(name: str, machines: int, days: int, repeat: int) -> Dict:
+    """Run one case in a child process with its own temporary data root."""
+    with tempfile.TemporaryDirectory(prefix="factory-bench-") as data_root:
+        result_file = Path(data_root) / "result.json"
+        env = {**os.environ, "FACTORY_DATA_ROOT": data_root}
+        env.pop("FACTORY_CONFIG", None)
+
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.run_benchmarks", "--case", name,
+             "--machines", str(machines), "--days", str(days), "--repeat", str(repeat),
+             "--result-file", str(result_file)],
+            cwd=config.PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, check=True
+        )
+        with open(result_file) as f:
+            return json.load(f)
+
+
+def git_commit() -> str:
+    """Return the current commit hash (or "unknown" outside a git checkout)."""
+    result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=config.PROJECT_ROOT,
+                            capture_output=True, text=True)
+    return result.stdout.strip() or "unknown"
+
+
+def run_suite(names: List[str], machine_counts: List[int], day_counts: List[int], repeat: int) -> Dict:
+    """
+    Run the selected cases for every machine/day combination.
+
+    Args:
+        names: Case names
+        machine_counts: Machine counts to test
+        day_counts: Day counts to test
+        repeat: Timed runs per case
+
+    Returns:
+        {"commit", "timestamp", "python", "platform", "results": [...]}
+    """
+    results = []
+    for machines in machine_counts:
+        for days in day_counts:
+            for name in names:
+                result = spawn_case(name, machines, days, repeat)
+                results.append(result)
+                print(f"[OK] {name} machines={machines} days={days}: "
+                      f"{result['throughput']:,.0f} {result['unit']}, peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+
+def compare_results(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """
+    Print throughput and peak RSS changes against a baseline run.
+
+    Args:
+        baseline: Earlier results file
+        current: New results
+        threshold: Relative slowdown / memory growth that counts as a regression
+
+    Returns:
+        Descriptions of regressed cases
+    """
+    def key(result):
+        return result["name"], result["machines"], result["days"]
+
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = []
+
+    print(f"\nComparison against {baseline['commit']} ({baseline['timestamp']}):")
+    for result in current["results"]:
+        before = previous.get(key(result))
+        if not before or not before["throughput"] or not result["throughput"]:
+            continue
+
+        speed = result["throughput"] / before["throughput"] - 1
+        memory = result["peak_rss_mb"] / before["peak_rss_mb"] - 1
+        label = f"{result['name']} machines={result['machines']} days={result['days']}"
+        flag = ""
+        if speed < -threshold or memory > threshold:
+            flag = "  [REGRESSION]"
+            regressions.append(label)
+        print(f"  {label}: throughput {speed:+.1%}, peak RSS {memory:+.1%}{flag}")
+
+    return regressions
+
+
+def parse_counts(value: str) -> List[int]:
+    """Parse a comma-separated list of integers."""
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark generation, writers, loaders and bronze ingestion")
+    parser.add_argument("--machines", type=str, default=DEFAULT_MACHINES, help="Comma-separated machine counts")
+    parser.add_argument("--days", type=str, default=DEFAULT_DAYS, help="Comma-separated day counts")
+    parser.add_argument("--filter", type=str, help="Only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case (best is kept)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Results JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to diff against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative change treated as a regression in --compare")
+    parser.add_argument("--list", action="store_true", help="List case names and exit")
+    # Internal: run a single case in this process (used by spawn_case)
+    parser.add_argument("--case", type=str, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (unit, _) in CASES.items():
+            print(f"{name} ({unit}/s)")
+        return
+
+    if args.case:
+        result = run_case(args.case, int(args.machines), int(args.days), args.repeat)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+        return
+
+    names = [name for name in CASES if not args.filter or args.filter in name]
+    results = run_suite(names, parse_counts(args.machines), parse_counts(args.days), args.repeat)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[OK] Wrote {len(results['results'])} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare_results(json.load(f), results, args.threshold)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n[OK] No regressions")
+
+
+if __name__ == "__main__":
+    main()
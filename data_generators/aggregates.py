@@ -0,0 +1,234 @@
+"""
+Precomputed daily aggregate store for the dashboard.
+
+The generator writes two small Parquet tables per production date into a
+hive-partitioned directory:
+
+    ground_truth/aggregates/date=YYYY-MM-DD/machine_daily.parquet
+    ground_truth/aggregates/date=YYYY-MM-DD/chaos_daily.parquet
+
+machine_daily holds the clean ground-truth totals keyed by machine and
+product; chaos_daily holds the data-quality counts of the on-time raw files
+(sensor nulls, product name spellings, duplicate batch IDs) and sensor sums
+for the gauges. Readers open only the partitions in the requested date range
+instead of every truth.json and raw file.
+
+Aggregates for data generated before the store existed can be rebuilt from
+ground truth and raw files:
+
+    python -m data_generators.aggregates --rebuild
+"""
+import argparse
+import json
+from datetime import date as date_type, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data_generators.config import MACHINES, AGGREGATES_DIR, GROUND_TRUTH_DIR, RAW_DATA_DIR
+from data_generators.output_formats import Records, SCHEMAS, write_table, find_table_file, read_table_frame
+from data_generators.vocabulary import distinct_codes
+
+AGGREGATE_TABLES = ("machine_daily", "chaos_daily")
+
+
+def partition_dir(date: date_type) -> Path:
+    """Return the aggregates/date=<date> partition directory."""
+    return AGGREGATES_DIR / f"date={date.strftime('%Y-%m-%d')}"
+
+
+def new_chaos_metrics() -> Dict:
+    """
+    Create empty data-quality counters for a day.
+
+    Returns:
+        Counter dictionary (product name codes and batch IDs are sets until written)
+    """
+    return {
+        "sensor_readings": 0,
+        "sensor_values": 0,
+        "sensor_nulls": 0,
+        "temperature_sum": 0.0,
+        "temperature_count": 0,
+        "pressure_sum": 0.0,
+        "pressure_count": 0,
+        "batch_rows": 0,
+        "product_codes": set(),
+        "batch_ids": set()
+    }
+
+
+def accumulate_chaos_metrics(metrics: Dict, table: str, records: Records):
+    """
+    Add a chunk of on-time raw records to the day's data-quality counters.
+
+    Args:
+        metrics: Counters from new_chaos_metrics (updated in place)
+        table: Raw table the records belong to
+        records: List of record dictionaries or an Arrow table
+    """
+    if table == "sensor_logs":
+        columns = SCHEMAS["sensor_logs"].names
+        metrics["sensor_readings"] += len(records)
+        metrics["sensor_values"] += len(records) * len(columns)
+
+        if isinstance(records, pa.Table):
+            metrics["sensor_nulls"] += sum(records.column(name).null_count for name in columns)
+            for name in ("temperature", "pressure"):
+                column = records.column(name)
+                metrics[f"{name}_sum"] += pc.sum(column).as_py() or 0.0
+                metrics[f"{name}_count"] += len(column) - column.null_count
+        else:
+            for record in records:
+                metrics["sensor_nulls"] += sum(record[name] is None for name in columns)
+                for name in ("temperature", "pressure"):
+                    if record[name] is not None:
+                        metrics[f"{name}_sum"] += record[name]
+                        metrics[f"{name}_count"] += 1
+
+    elif table == "production_batches":
+        if isinstance(records, pa.Table):
+            names, batch_ids = records.column("product_name"), records.column("batch_id").to_pylist()
+        else:
+            names, batch_ids = [r["product_name"] for r in records], [r["batch_id"] for r in records]
+
+        # Spellings are counted on vocabulary codes, not strings
+        metrics["batch_rows"] += len(batch_ids)
+        metrics["product_codes"].update(distinct_codes(names, "product_name"))
+        metrics["batch_ids"].update(batch_ids)
+
+
+def machine_rows(ground_truth: Dict) -> List[Dict]:
+    """
+    Build machine_daily rows from a ground truth document.
+
+    Args:
+        ground_truth: Output of generate_ground_truth
+
+    Returns:
+        One row per machine that produced batches
+    """
+    machines = {m["machine_id"]: m for m in MACHINES}
+    rows = []
+
+    for machine_id, metrics in ground_truth["by_machine"].items():
+        machine = machines.get(machine_id, {})
+        rows.append({
+            "factory_id": machine.get("factory_id"),
+            "line_id": machine.get("line_id"),
+            "machine_id": machine_id,
+            "machine_type": machine.get("machine_type"),
+            "product_name": machine.get("output_product"),
+            "batches": metrics["batches"],
+            "units_produced": metrics["units_produced"],
+            "units_defective": metrics["units_defective"],
+            "energy_consumed_kwh": metrics["energy_consumed_kwh"]
+        })
+
+    return rows
+
+
+def chaos_row(metrics: Dict) -> Dict:
+    """Turn data-quality counters into the chaos_daily row."""
+    row = {name: value for name, value in metrics.items() if name not in ("product_codes", "batch_ids")}
+    row["product_variations"] = len(metrics["product_codes"])
+    row["duplicate_batches"] = metrics["batch_rows"] - len(metrics["batch_ids"])
+    return row
+
+
+def save_aggregates(date: date_type, ground_truth: Dict, chaos_metrics: Dict):
+    """
+    Write (or replace) a day's aggregate partition.
+
+    Args:
+        date: Production date
+        ground_truth: Ground truth document for the day
+        chaos_metrics: Counters from accumulate_chaos_metrics
+    """
+    directory = partition_dir(date)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    write_table(machine_rows(ground_truth), directory, "machine_daily", "parquet")
+    write_table([chaos_row(chaos_metrics)], directory, "chaos_daily", "parquet")
+
+
+def partition_files(table: str, start: date_type, end: Optional[date_type] = None) -> List[str]:
+    """
+    List the existing partition files of an aggregate table for a date range.
+
+    Args:
+        table: "machine_daily" or "chaos_daily"
+        start: First date (inclusive)
+        end: Last date (inclusive, default = start)
+
+    Returns:
+        File paths, oldest first
+    """
+    end = end or start
+    files = []
+    day = start
+    while day <= end:
+        path = partition_dir(day) / f"{table}.parquet"
+        if path.exists():
+            files.append(path.as_posix())
+        day += timedelta(days=1)
+    return files
+
+
+def rebuild_aggregates(date: date_type) -> bool:
+    """
+    Recompute a day's aggregates from truth.json and the on-time raw files.
+
+    Args:
+        date: Production date
+
+    Returns:
+        False if the day has no ground truth
+    """
+    date_str = date.strftime("%Y-%m-%d")
+    truth_file = GROUND_TRUTH_DIR / date_str / "truth.json"
+    if not truth_file.exists():
+        return False
+
+    with open(truth_file) as f:
+        ground_truth = json.load(f)
+
+    metrics = new_chaos_metrics()
+    for table in ("sensor_logs", "production_batches"):
+        path = find_table_file(RAW_DATA_DIR / date_str, table)
+        if path:
+            frame = read_table_frame(path)
+            records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+            accumulate_chaos_metrics(metrics, table, records)
+
+    save_aggregates(date, ground_truth, metrics)
+    return True
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Maintain the daily aggregate store")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild aggregates from ground truth and raw files")
+    parser.add_argument("--date", type=str, help="Specific date (YYYY-MM-DD); default is every ground truth date")
+    args = parser.parse_args()
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+
+    if args.date:
+        dates = [args.date]
+    else:
+        dates = sorted(p.name for p in GROUND_TRUTH_DIR.glob("????-??-??") if p.is_dir())
+
+    for date_str in dates:
+        if rebuild_aggregates(datetime.strptime(date_str, "%Y-%m-%d").date()):
+            print(f"[OK] Rebuilt aggregates for {date_str}")
+        else:
+            print(f"[SKIP] No ground truth for {date_str}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,14 @@ Chaos injection functions to simulate real-world data quality issues.
 """
 import random
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from data_generators.config import CHAOS_CONFIG
 
+Shape = Union[int, Tuple[int, ...]]
+
 
 def inject_null(value: Any, probability: Optional[float] = None) -> Any:
     """
@@ -78,15 +83,19 @@ def should_duplicate() -> bool:
     return random.random() < CHAOS_CONFIG["duplicate_probability"]
 
 
-def should_arrive_late() -> tuple[bool, int]:
+def should_arrive_late(rng: Optional[random.Random] = None) -> tuple[bool, int]:
     """
     Determine if data should arrive late and by how many days.
 
+    Args:
+        rng: Random stream to draw from (defaults to the global one)
+
     Returns:
         Tuple of (should_be_late, days_delayed)
     """
-    if random.random() < CHAOS_CONFIG["late_arrival_probability"]:
-        days = random.randint(*CHAOS_CONFIG["late_arrival_days"])
+    rng = rng or random
+    if rng.random() < CHAOS_CONFIG["late_arrival_probability"]:
+        days = rng.randint(*CHAOS_CONFIG["late_arrival_days"])
         return True, days
     return False, 0
 
@@ -109,7 +118,7 @@ def inject_timezone_chaos(timestamp: datetime, use_utc: bool = True) -> datetime
         # Convert FROM UTC TO MST (UTC-7)
         # MST is 7 hours behind UTC, so subtract 7 hours
         # Example: 14:00 UTC becomes 07:00 MST
-        return timestamp - timedelta(hours=7)
+        return timestamp + timedelta(hours=CHAOS_CONFIG["local_utc_offset_hours"])
     return timestamp
 
 
@@ -189,3 +198,240 @@ def calculate_degraded_efficiency(base_efficiency: float, degradation_rate: floa
 
     # Don't go below 50% efficiency (machines would be shut down)
     return max(0.5, min(1.0, efficiency))
+
+
+# ============================================================================
+# COLUMN (ARRAY) VERSIONS
+# ============================================================================
+# Each function below applies one chaos type to a whole column with a single
+# draw from a numpy Generator, using the same CHAOS_CONFIG probabilities as
+# its scalar counterpart. Array-likes (lists, pandas Series) are accepted
+# wherever an np.ndarray is.
+
+
+def inject_null_array(shape: Shape, rng: np.random.Generator, probability: Optional[float] = None) -> np.ndarray:
+    """
+    Decide which values of a column (or several columns) are null.
+
+    Nulls are not materialized: the result is a validity mask to pass to
+    pyarrow (``mask=~valid``) or pandas (``values.where(valid)``).
+
+    Args:
+        shape: Column length, or (columns, length) for one draw over several columns
+        rng: Seeded random generator
+        probability: Override default null probability
+
+    Returns:
+        Boolean array, True where the value is kept
+    """
+    prob = probability if probability is not None else CHAOS_CONFIG["null_probability"]
+    return rng.random(shape) >= prob
+
+
+def inject_timestamp_drift_array(timestamps: np.ndarray, rng: np.random.Generator,
+                                 drift_range: Optional[tuple] = None) -> np.ndarray:
+    """
+    Add random whole-minute drift to a column of timestamps.
+
+    Args:
+        timestamps: datetime64 array
+        rng: Seeded random generator
+        drift_range: (min_minutes, max_minutes) tuple
+
+    Returns:
+        Drifted datetime64 array
+    """
+    if drift_range is None:
+        drift_range = CHAOS_CONFIG["timestamp_drift_range"]
+
+    timestamps = np.asarray(timestamps)
+    drift_minutes = rng.integers(drift_range[0], drift_range[1], size=len(timestamps), endpoint=True)
+    return timestamps + drift_minutes.astype("timedelta64[m]")
+
+
+def _draw_variations(values: Sequence, variations: Dict[str, List[str]], rng: np.random.Generator) -> np.ndarray:
+    """
+    Replace each value with a uniformly chosen variation of itself.
+
+    One uniform draw covers the whole column; the per-vocabulary loop only
+    runs over the distinct canonical values.
+    """
+    values = np.asarray(values, dtype=object)
+    draws = rng.random(len(values))
+    result = values.copy()
+
+    for canonical in set(values.tolist()):
+        options = np.array(variations.get(canonical, [canonical]), dtype=object)
+        mask = values == canonical
+        result[mask] = options[(draws[mask] * len(options)).astype(np.int64)]
+
+    return result
+
+
+def inject_product_name_variation_array(canonical_names: Sequence, rng: np.random.Generator) -> np.ndarray:
+    """
+    Replace a column of canonical product names with random variations.
+
+    Args:
+        canonical_names: Canonical product names
+        rng: Seeded random generator
+
+    Returns:
+        Object array of product name variations
+    """
+    return _draw_variations(canonical_names, CHAOS_CONFIG["product_name_variations"], rng)
+
+
+def inject_machine_id_variation_array(canonical_ids: Sequence, rng: np.random.Generator) -> np.ndarray:
+    """
+    Replace a column of canonical machine IDs with random variations.
+
+    Args:
+        canonical_ids: Canonical machine IDs
+        rng: Seeded random generator
+
+    Returns:
+        Object array of machine ID variations
+    """
+    return _draw_variations(canonical_ids, CHAOS_CONFIG["machine_id_variations"], rng)
+
+
+def should_duplicate_array(count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Decide which of `count` records are duplicated.
+
+    Args:
+        count: Number of records
+        rng: Seeded random generator
+
+    Returns:
+        Boolean array, True for records to duplicate
+    """
+    return rng.random(count) < CHAOS_CONFIG["duplicate_probability"]
+
+
+def should_arrive_late_array(count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw how many days late each of `count` records arrives.
+
+    Args:
+        count: Number of records
+        rng: Seeded random generator
+
+    Returns:
+        Integer delay per record (0 = on time)
+    """
+    late = rng.random(count) < CHAOS_CONFIG["late_arrival_probability"]
+    days = rng.integers(*CHAOS_CONFIG["late_arrival_days"], size=count, endpoint=True)
+    return np.where(late, days, 0)
+
+
+def inject_timezone_chaos_array(timestamps: np.ndarray, rng: np.random.Generator, use_utc: bool = True) -> np.ndarray:
+    """
+    Shift a random subset of a UTC timestamp column to local time (MST, UTC-7).
+
+    Args:
+        timestamps: datetime64 array (assumed to be UTC)
+        rng: Seeded random generator
+        use_utc: If False, return the timestamps unchanged
+
+    Returns:
+        datetime64 array with some values in local time
+    """
+    timestamps = np.asarray(timestamps)
+    if not use_utc:
+        return timestamps
+
+    local = rng.random(len(timestamps)) < CHAOS_CONFIG["timezone_chaos_probability"]
+    return np.where(local, timestamps + np.timedelta64(CHAOS_CONFIG["local_utc_offset_hours"], "h"), timestamps)
+
+
+def calculate_defect_rate_array(shape: Shape, rng: np.random.Generator, base_rate: Optional[float] = None) -> np.ndarray:
+    """
+    Draw defect rates with random variance.
+
+    Args:
+        shape: Output shape
+        rng: Seeded random generator
+        base_rate: Override default base defect rate
+
+    Returns:
+        Defect rates (between 0 and 1)
+    """
+    if base_rate is None:
+        base_rate = CHAOS_CONFIG["base_defect_rate"]
+
+    variance = CHAOS_CONFIG["defect_rate_variance"]
+    return np.clip(base_rate + rng.uniform(-variance, variance, shape), 0.0, 1.0)
+
+
+def inject_typo_array(texts: Sequence, rng: np.random.Generator, typo_probability: float = 0.05) -> np.ndarray:
+    """
+    Randomly swap two adjacent characters in a column of strings.
+
+    The selected strings are packed into a fixed-width unicode array and the
+    swap is done on its code points with fancy indexing, not per string.
+
+    Args:
+        texts: Strings
+        rng: Seeded random generator
+        typo_probability: Probability of introducing a typo per string
+
+    Returns:
+        Object array of strings, some with a typo
+    """
+    texts = np.asarray(texts, dtype=object)
+    result = texts.copy()
+    if len(texts) == 0:
+        return result
+
+    lengths = np.char.str_len(texts.astype(str))
+    draws = rng.random((2, len(texts)))
+    chosen = np.flatnonzero((draws[0] < typo_probability) & (lengths >= 3))
+    if chosen.size == 0:
+        return result
+
+    fixed = texts[chosen].astype(str)
+    codes = fixed.view(np.uint32).reshape(len(chosen), -1)
+    rows = np.arange(len(chosen))
+    positions = (draws[1][chosen] * (lengths[chosen] - 1)).astype(np.int64)  # 0 .. len - 2
+
+    codes[rows, positions], codes[rows, positions + 1] = codes[rows, positions + 1], codes[rows, positions]
+    result[chosen] = codes.view(fixed.dtype).ravel().tolist()
+    return result
+
+
+def add_measurement_noise_array(values: np.ndarray, rng: np.random.Generator, noise_percent: float = 0.02) -> np.ndarray:
+    """
+    Add random measurement noise to a numeric column.
+
+    Args:
+        values: Original values
+        rng: Seeded random generator
+        noise_percent: Noise as percentage of value (e.g., 0.02 = ±2%)
+
+    Returns:
+        Values with noise added
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return values + values * noise_percent * rng.uniform(-1, 1, len(values))
+
+
+def calculate_degraded_efficiency_array(base_efficiency: np.ndarray, degradation_rate: np.ndarray,
+                                        days_elapsed: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Calculate efficiency after degradation for a column of machines.
+
+    Args:
+        base_efficiency: Starting efficiency per machine (0-1)
+        degradation_rate: Daily degradation rate per machine
+        days_elapsed: Number of days since start
+        rng: Seeded random generator
+
+    Returns:
+        Degraded efficiencies (clamped to 0.5-1.0)
+    """
+    base_efficiency = np.asarray(base_efficiency, dtype=np.float64)
+    variance = rng.uniform(-0.01, 0.01, len(base_efficiency))  # ±1% random variance
+    efficiency = base_efficiency - np.asarray(degradation_rate) * days_elapsed + variance
+    return np.clip(efficiency, 0.5, 1.0)
@@ -2,7 +2,9 @@
 Configuration for factory data generation.
 Defines machines, products, chaos levels, and simulation parameters.
 """
+import os
 from datetime import datetime, timedelta
+from pathlib import Path
 
 # ============================================================================
 # FACTORY CONFIGURATION
@@ -14,6 +16,9 @@ FACTORY = {
     "timezone": "MST"
 }
 
+# All factories (a scale-out config from factory_config.py may define several)
+FACTORIES = [FACTORY]
+
 # ============================================================================
 # MACHINES CONFIGURATION
 # ============================================================================
@@ -139,6 +144,7 @@ CHAOS_CONFIG = {
 
     # Timezone chaos (some logs in local time, some UTC)
     "timezone_chaos_probability": 0.30,  # 30% in local time
+    "local_utc_offset_hours": -7,  # MST = UTC-7
 
     # Defect rate
     "base_defect_rate": 0.02,  # 2% defective units
@@ -154,15 +160,39 @@ CHAOS_CONFIG = {
 END_DATE = datetime.now().date()
 START_DATE = END_DATE - timedelta(days=6)  # 7 days total (inclusive)
 
+# Output locations (FACTORY_DATA_ROOT moves raw_data/ and ground_truth/ elsewhere)
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_ROOT = Path(os.environ.get("FACTORY_DATA_ROOT", PROJECT_ROOT))
+RAW_DATA_DIR = DATA_ROOT / "raw_data"
+GROUND_TRUTH_DIR = DATA_ROOT / "ground_truth"
+
+# Daily aggregates for the dashboard: aggregates/date=<date>/<table>.parquet
+AGGREGATES_DIR = GROUND_TRUTH_DIR / "aggregates"
+
+# Late records land in raw_data/<arrival_date>/late/<event_date>/
+LATE_DIR_NAME = "late"
+
+# Live stream NDJSON segments: stream/<stream_id>-<first_seq>.ndjson
+STREAM_DIR = DATA_ROOT / "stream"
+
 # Operating hours
 OPERATING_HOURS = {
     "start": 6,  # 6 AM
     "end": 22    # 10 PM (16 hour operation day)
 }
 
+# Global seed for reproducible generation
+RANDOM_SEED = 42
+
 # Batches per machine per day
 BATCHES_PER_DAY_RANGE = (8, 14)  # Random between 8-14 batches
 
+# Sensor reading ranges by machine type: (min, max) before measurement noise
+SENSOR_RANGES = {
+    "Smelter": {"temperature": (1200, 1400), "pressure": (1.5, 2.5)},  # Celsius, bar
+    "Assembler": {"temperature": (25, 45), "pressure": (0.8, 1.2)}  # Much cooler
+}
+
 # QC inspection frequency
 QC_INSPECTION_PROBABILITY = 0.40  # 40% of batches get inspected
 
@@ -172,3 +202,12 @@ OPERATOR_LOG_PROBABILITY = 0.25  # 25% of batches have operator notes
 # Inspector and operator IDs
 INSPECTORS = ["QC-001", "QC-002", "QC-003"]
 OPERATORS = ["OP-101", "OP-102", "OP-103", "OP-104"]
+
+# ============================================================================
+# SCALE-OUT CONFIGURATION
+# ============================================================================
+
+# Replace MACHINES/FACTORIES with a templated layout when FACTORY_CONFIG is set
+if os.environ.get("FACTORY_CONFIG"):
+    from data_generators.factory_config import apply_factory_config_file
+    apply_factory_config_file(os.environ["FACTORY_CONFIG"])
@@ -0,0 +1,239 @@
+"""
+Scale-out factory configuration loaded from YAML or TOML.
+
+A config file declares machine templates (type, products, rate
+distributions, degradation profiles) and a layout of factories and
+production lines that instantiate them. Expanding it yields machine
+dictionaries in the same shape as config.MACHINES, with IDs like
+"F01-L02-SMELTER-007" and generated machine_id_variations for chaos.
+
+The expanded config replaces config.MACHINES, config.FACTORIES and
+CHAOS_CONFIG["machine_id_variations"] in place, so every module that
+imported them sees the new layout. Set the FACTORY_CONFIG environment
+variable (or pass --config to generate_data) to apply a file at import.
+
+Example (YAML):
+
+    seed: 7
+    degradation_profiles:
+      stable: 0.0
+      degrading: 0.02
+    templates:
+      smelter:
+        machine_type: Smelter
+        input_product: Iron Ore
+        output_product: Iron Plate
+        base_output_rate: {min: 70, max: 85}
+        base_efficiency: {min: 0.95, max: 1.0}
+        typical_batch_minutes: [40, 90]
+        energy_per_unit: {mean: 0.115, std: 0.005}
+        degradation: {stable: 0.8, degrading: 0.2}
+    factories:
+      - factory_id: F01
+        name: Factory Alpha
+        location: Phoenix, AZ
+        timezone: MST
+        lines:
+          - line_id: L01
+            machines:
+              - {template: smelter, count: 40}
+"""
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import yaml
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
+
+from data_generators import config
+
+ENV_VAR = "FACTORY_CONFIG"
+
+# Fields copied from a template into every machine it creates
+TEMPLATE_FIELDS = (
+    "machine_type", "input_product", "output_product", "base_output_rate",
+    "base_efficiency", "typical_batch_minutes", "energy_per_unit", "installation_date"
+)
+
+# Decimal places kept for sampled numeric fields
+FIELD_PRECISION = {
+    "base_output_rate": 0,
+    "base_efficiency": 3,
+    "energy_per_unit": 3
+}
+
+
+def read_config_file(path: Union[str, Path]) -> Dict:
+    """
+    Read a factory config file.
+
+    Args:
+        path: .yaml/.yml or .toml file
+
+    Returns:
+        Parsed config dictionary
+    """
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        with open(path) as f:
+            return yaml.safe_load(f)
+    if path.suffix == ".toml":
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    raise ValueError(f"Unsupported factory config format: {path.suffix} (expected .yaml, .yml or .toml)")
+
+
+def sample_value(spec: Any, rng: random.Random) -> Any:
+    """
+    Draw a value from a template field specification.
+
+    Args:
+        spec: A literal, {"min", "max"} (uniform), {"mean", "std"} (normal),
+            or {"choices": [...]} (uniform choice)
+        rng: Seeded random stream
+
+    Returns:
+        Sampled value (literals are returned unchanged)
+    """
+    if not isinstance(spec, dict):
+        return spec
+    if "min" in spec and "max" in spec:
+        return rng.uniform(spec["min"], spec["max"])
+    if "mean" in spec and "std" in spec:
+        return rng.gauss(spec["mean"], spec["std"])
+    if "choices" in spec:
+        return rng.choice(spec["choices"])
+    raise ValueError(f"Unrecognized value specification: {spec}")
+
+
+def pick_degradation_rate(template: Dict, profiles: Dict[str, float], rng: random.Random) -> float:
+    """
+    Choose a degradation rate for a machine from the template's profile weights.
+
+    Args:
+        template: Machine template ("degradation" maps profile name -> weight,
+            or is a fixed rate)
+        profiles: Profile name -> daily degradation rate
+        rng: Seeded random stream
+
+    Returns:
+        Daily degradation rate
+    """
+    degradation = template.get("degradation", 0.0)
+    if not isinstance(degradation, dict):
+        return float(degradation)
+
+    names = list(degradation)
+    profile = rng.choices(names, weights=[degradation[n] for n in names])[0]
+    return profiles[profile]
+
+
+def generate_machine_id_variations(machine: Dict) -> List[str]:
+    """
+    Generate the operator-log spellings of a machine ID.
+
+    Mirrors the hand-written variations for the default machines: the
+    canonical ID, underscores instead of dashes, lowercase without
+    separators, title-case with an unpadded number, and the display name.
+
+    Args:
+        machine: Machine dictionary
+
+    Returns:
+        Unique variations, canonical ID first
+    """
+    machine_id = machine["machine_id"]
+    *prefix, number = machine_id.split("-")
+    title = "-".join(part.capitalize() if part.isalpha() else part for part in prefix)
+
+    variations = [
+        machine_id,
+        machine_id.replace("-", "_"),
+        machine_id.replace("-", "").lower(),
+        f"{title}-{int(number)}" if number.isdigit() else machine_id.title(),
+        machine["machine_name"]
+    ]
+    return list(dict.fromkeys(variations))
+
+
+def expand_factory_config(factory_config: Dict) -> Dict:
+    """
+    Expand templates and layout into concrete machines.
+
+    Args:
+        factory_config: Parsed config (see module docstring)
+
+    Returns:
+        {"factories": [...], "machines": [...], "machine_id_variations": {...}}
+    """
+    rng = random.Random(factory_config.get("seed", config.RANDOM_SEED))
+    templates = factory_config["templates"]
+    profiles = factory_config.get("degradation_profiles", {})
+
+    factories = []
+    machines = []
+
+    for factory in factory_config["factories"]:
+        factories.append({key: value for key, value in factory.items() if key != "lines"})
+
+        for line in factory["lines"]:
+            for entry in line["machines"]:
+                template = templates[entry["template"]]
+                prefix = template.get("id_prefix", template["machine_type"].upper())
+
+                for number in range(1, entry["count"] + 1):
+                    machine = {
+                        "machine_id": f"{factory['factory_id']}-{line['line_id']}-{prefix}-{number:03d}",
+                        "machine_name": f"{template['machine_type']} {factory['factory_id']}/{line['line_id']} #{number}",
+                        "factory_id": factory["factory_id"],
+                        "line_id": line["line_id"]
+                    }
+
+                    for field in TEMPLATE_FIELDS:
+                        if field in template:
+                            value = sample_value(template[field], rng)
+                            if field in FIELD_PRECISION:
+                                value = round(value, FIELD_PRECISION[field])
+                            machine[field] = value
+
+                    machine["typical_batch_minutes"] = tuple(machine["typical_batch_minutes"])
+                    machine["degradation_rate"] = pick_degradation_rate(template, profiles, rng)
+                    machines.append(machine)
+
+    machine_ids = [m["machine_id"] for m in machines]
+    if len(set(machine_ids)) != len(machine_ids):
+        raise ValueError("Factory config produces duplicate machine IDs (check factory/line IDs and id_prefix)")
+
+    return {
+        "factories": factories,
+        "machines": machines,
+        "machine_id_variations": {m["machine_id"]: generate_machine_id_variations(m) for m in machines}
+    }
+
+
+def apply_factory_config(factory_config: Dict):
+    """
+    Replace the configured factories and machines in place.
+
+    Args:
+        factory_config: Parsed config (see module docstring)
+    """
+    expanded = expand_factory_config(factory_config)
+
+    config.MACHINES[:] = expanded["machines"]
+    config.FACTORIES[:] = expanded["factories"]
+    config.FACTORY.clear()
+    config.FACTORY.update(expanded["factories"][0])
+
+    variations = config.CHAOS_CONFIG["machine_id_variations"]
+    variations.clear()
+    variations.update(expanded["machine_id_variations"])
+
+
+def apply_factory_config_file(path: Union[str, Path]):
+    """Read a factory config file and apply it (see apply_factory_config)."""
+    apply_factory_config(read_config_file(path))
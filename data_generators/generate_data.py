@@ -1,31 +1,67 @@
 """
 Main data generation script - generates all data types for a given date.
 """
+import os
 import json
-import csv
 import random
+import shutil
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import numpy as np
+import pyarrow as pa
 from faker import Faker
 
 from data_generators.config import (
-    MACHINES, PRODUCTS, FACTORY, START_DATE, END_DATE,
-    OPERATING_HOURS, BATCHES_PER_DAY_RANGE,
+    MACHINES, PRODUCTS, FACTORY, START_DATE, END_DATE, RANDOM_SEED,
+    OPERATING_HOURS, BATCHES_PER_DAY_RANGE, SENSOR_RANGES,
     QC_INSPECTION_PROBABILITY, OPERATOR_LOG_PROBABILITY,
-    INSPECTORS, OPERATORS
+    INSPECTORS, OPERATORS, RAW_DATA_DIR, GROUND_TRUTH_DIR, LATE_DIR_NAME, CHAOS_CONFIG
 )
 from data_generators.chaos_injectors import (
     inject_null, inject_timestamp_drift, inject_product_name_variation,
-    inject_machine_id_variation, should_duplicate, inject_timezone_chaos,
+    inject_machine_id_variation, should_duplicate, should_arrive_late, inject_timezone_chaos,
     calculate_defect_rate, inject_typo, add_measurement_noise,
-    calculate_degraded_efficiency
+    calculate_degraded_efficiency, should_arrive_late_array
 )
+from data_generators.vectorized import (
+    generate_machine_columns, batch_columns_to_records, sensor_columns_to_arrow
+)
+from data_generators.simulation import simulate_day
+from data_generators.factory_config import apply_factory_config_file, ENV_VAR as FACTORY_CONFIG_ENV_VAR
+from data_generators.output_formats import (
+    FORMATS, COLUMNAR_FORMATS, RAW_TABLES, Records, write_table, open_table_writer,
+    flatten_ground_truth
+)
+from data_generators.aggregates import new_chaos_metrics, accumulate_chaos_metrics, save_aggregates
+
+# Available batch generation engines
+ENGINES = ("python", "numpy", "des")
+
+# Records buffered per file in streaming mode
+DEFAULT_CHUNK_SIZE = 10_000
 
 fake = Faker()
 Faker.seed(42)  # For reproducibility
-random.seed(42)
+
+
+def derive_seed(seed: int, date: datetime, key: str) -> int:
+    """
+    Derive an independent, deterministic seed for one unit of generation.
+
+    Args:
+        seed: Global seed
+        date: Production date
+        key: Stream name within the day (e.g. a machine ID)
+
+    Returns:
+        64-bit seed that depends only on (seed, date, key)
+    """
+    digest = hashlib.sha256(f"{seed}|{date.strftime('%Y-%m-%d')}|{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
 
 
 def generate_batch_id(machine_id: str, date: datetime, batch_num: int) -> str:
@@ -130,12 +166,9 @@ def generate_sensor_logs(batches: List[Dict], machine: Dict) -> List[Dict]:
             drifted_time = inject_timestamp_drift(reading_time)
 
             # Generate sensor readings based on machine type
-            if machine["machine_type"] == "Smelter":
-                temperature = random.uniform(1200, 1400)  # Celsius
-                pressure = random.uniform(1.5, 2.5)  # bar
-            else:  # Assembler
-                temperature = random.uniform(25, 45)  # Celsius (much cooler)
-                pressure = random.uniform(0.8, 1.2)  # bar
+            ranges = SENSOR_RANGES.get(machine["machine_type"], SENSOR_RANGES["Assembler"])
+            temperature = random.uniform(*ranges["temperature"])  # Celsius
+            pressure = random.uniform(*ranges["pressure"])  # bar
 
             # Add measurement noise
             temperature = add_measurement_noise(temperature, 0.03)
@@ -262,20 +295,19 @@ def generate_operator_logs(batches: List[Dict], machine: Dict, date: datetime) -
     return operator_logs
 
 
-def generate_ground_truth(batches: List[Dict], date: datetime) -> Dict:
+def new_ground_truth(date: datetime) -> Dict:
     """
-    Generate ground truth data (clean, canonical) for validation.
+    Create an empty ground truth document for a date.
 
     Args:
-        batches: List of production batches (clean versions)
         date: Production date
 
     Returns:
-        Dictionary with ground truth metrics
+        Ground truth dictionary with zeroed totals
     """
-    truth = {
+    return {
         "date": date.strftime("%Y-%m-%d"),
-        "total_batches": len(batches),
+        "total_batches": 0,
         "by_machine": {},
         "by_product": {},
         "factory_totals": {
@@ -285,6 +317,17 @@ def generate_ground_truth(batches: List[Dict], date: datetime) -> Dict:
         }
     }
 
+
+def accumulate_ground_truth(truth: Dict, batches: List[Dict]):
+    """
+    Add clean batches to a ground truth document in place.
+
+    Args:
+        truth: Ground truth dictionary (from new_ground_truth)
+        batches: Production batches (clean versions)
+    """
+    truth["total_batches"] += len(batches)
+
     for batch in batches:
         machine_id = batch["machine_id"]
         product = batch["product_name"]
@@ -319,6 +362,20 @@ def generate_ground_truth(batches: List[Dict], date: datetime) -> Dict:
         truth["factory_totals"]["units_defective"] += batch["units_defective"]
         truth["factory_totals"]["energy_consumed_kwh"] += batch["energy_consumed_kwh"]
 
+
+def generate_ground_truth(batches: List[Dict], date: datetime) -> Dict:
+    """
+    Generate ground truth data (clean, canonical) for validation.
+
+    Args:
+        batches: List of production batches (clean versions)
+        date: Production date
+
+    Returns:
+        Dictionary with ground truth metrics
+    """
+    truth = new_ground_truth(date)
+    accumulate_ground_truth(truth, batches)
     return truth
 
 
@@ -350,7 +407,27 @@ def apply_chaos_to_batches(batches: List[Dict]) -> List[Dict]:
     return chaotic_batches
 
 
-def save_data(date: datetime, sensor_logs: List, batches: List, qc_checks: List, operator_logs: List, ground_truth: Dict):
+def save_ground_truth(date: datetime, ground_truth: Dict, output_format: Optional[str] = None):
+    """
+    Save ground truth as JSON, plus a flat table for columnar formats.
+
+    Args:
+        date: Production date
+        ground_truth: Ground truth data
+        output_format: Raw file format (None = default layout)
+    """
+    truth_dir = GROUND_TRUTH_DIR / date.strftime("%Y-%m-%d")
+    truth_dir.mkdir(parents=True, exist_ok=True)
+
+    # The flat table goes first: opening its writer removes other formats of "truth", including truth.json
+    if output_format in COLUMNAR_FORMATS:
+        write_table(flatten_ground_truth(ground_truth), truth_dir, "truth", output_format)
+    with open(truth_dir / "truth.json", "w") as f:
+        json.dump(ground_truth, f, indent=2)
+
+
+def save_data(date: datetime, sensor_logs: Records, batches: Records, qc_checks: Records, operator_logs: Records,
+              ground_truth: Dict, output_format: Optional[str] = None):
     """
     Save all generated data to files.
 
@@ -361,56 +438,28 @@ def save_data(date: datetime, sensor_logs: List, batches: List, qc_checks: List,
         qc_checks: QC check data
         operator_logs: Operator log data
         ground_truth: Ground truth data
+        output_format: One of FORMATS for every raw table, or None for the
+            default layout (sensor logs as JSON, everything else as CSV)
     """
     date_str = date.strftime("%Y-%m-%d")
 
     # Create directories
-    raw_dir = Path(__file__).parent.parent / "raw_data" / date_str
+    raw_dir = RAW_DATA_DIR / date_str
     raw_dir.mkdir(parents=True, exist_ok=True)
 
-    truth_dir = Path(__file__).parent.parent / "ground_truth" / date_str
-    truth_dir.mkdir(parents=True, exist_ok=True)
+    # Save raw tables
+    write_table(sensor_logs, raw_dir, "sensor_logs", output_format)
+    write_table(batches, raw_dir, "production_batches", output_format)
+    write_table(qc_checks, raw_dir, "qc_checks", output_format)
+    write_table(operator_logs, raw_dir, "operator_logs", output_format)
 
-    # Save sensor logs (JSON)
-    with open(raw_dir / "sensor_logs.json", "w") as f:
-        json.dump(sensor_logs, f, indent=2)
-
-    # Save production batches (CSV)
-    with open(raw_dir / "production_batches.csv", "w", newline="") as f:
-        if batches:
-            fieldnames = ["batch_id", "machine_id", "product_name", "start_time", "end_time", "units_produced", "units_defective"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for batch in batches:
-                writer.writerow({
-                    "batch_id": batch["batch_id"],
-                    "machine_id": batch["machine_id"],
-                    "product_name": batch["product_name"],
-                    "start_time": batch["start_time"].isoformat(),
-                    "end_time": batch["end_time"].isoformat(),
-                    "units_produced": batch["units_produced"],
-                    "units_defective": batch["units_defective"]
-                })
-
-    # Save QC checks (CSV)
-    with open(raw_dir / "qc_checks.csv", "w", newline="") as f:
-        if qc_checks:
-            fieldnames = ["check_id", "batch_id", "check_timestamp", "inspector_id", "pass_fail", "defect_notes"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(qc_checks)
-
-    # Save operator logs (CSV)
-    with open(raw_dir / "operator_logs.csv", "w", newline="") as f:
-        if operator_logs:
-            fieldnames = ["log_id", "machine_id", "operator_id", "log_timestamp", "action", "notes"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(operator_logs)
-
-    # Save ground truth (JSON)
-    with open(truth_dir / "truth.json", "w") as f:
-        json.dump(ground_truth, f, indent=2)
+    save_ground_truth(date, ground_truth, output_format)
+
+    # Dashboard aggregates describe the on-time files written above
+    chaos_metrics = new_chaos_metrics()
+    accumulate_chaos_metrics(chaos_metrics, "sensor_logs", sensor_logs)
+    accumulate_chaos_metrics(chaos_metrics, "production_batches", batches)
+    save_aggregates(date, ground_truth, chaos_metrics)
 
     print(f"[OK] Generated data for {date_str}:")
     print(f"  - {len(sensor_logs)} sensor readings")
@@ -419,37 +468,299 @@ def save_data(date: datetime, sensor_logs: List, batches: List, qc_checks: List,
     print(f"  - {len(operator_logs)} operator logs")
 
 
-def generate_day(date: datetime):
-    """Generate all data for a single day."""
+def late_arrival_dir(date: datetime, delay: int) -> Path:
+    """Return raw_data/<arrival_date>/late/<event_date> for records delayed by `delay` days."""
+    arrival_str = (date + timedelta(days=delay)).strftime("%Y-%m-%d")
+    return RAW_DATA_DIR / arrival_str / LATE_DIR_NAME / date.strftime("%Y-%m-%d")
+
+
+def clear_late_arrivals(date: datetime):
+    """Remove late drops written for this event date by a previous run."""
+    for delay in range(1, CHAOS_CONFIG["late_arrival_days"][1] + 1):
+        shutil.rmtree(late_arrival_dir(date, delay), ignore_errors=True)
+
+
+def late_arrival_rngs(date: datetime, seed: int) -> Dict[str, random.Random]:
+    """
+    Create one late-arrival random stream per raw table.
+
+    Separate streams keep delay decisions independent of how records are
+    interleaved, so batch and streaming generation agree.
+    """
+    return {table: random.Random(derive_seed(seed, date, f"late_arrivals:{table}")) for table in RAW_TABLES}
+
+
+def split_late_arrivals(records: Records, delays: Sequence[int]) -> Dict[int, Records]:
+    """
+    Group records by how many days late they arrive.
+
+    Args:
+        records: List of record dictionaries or an Arrow table
+        delays: Delay in days for each record (0 = on time)
+
+    Returns:
+        Records per delay; key 0 is always present
+    """
+    if isinstance(records, pa.Table):
+        delays = np.asarray(delays)
+        groups = {0: records.filter(pa.array(delays == 0))}
+        for delay in np.unique(delays[delays > 0]).tolist():
+            groups[delay] = records.filter(pa.array(delays == delay))
+        return groups
+
+    groups = {0: []}
+    for record, delay in zip(records, delays):
+        groups.setdefault(int(delay), []).append(record)
+    return groups
+
+
+def save_late_arrivals(date: datetime, late_tables: Dict[int, Dict[str, Records]], output_format: Optional[str] = None):
+    """
+    Save records that arrive after their production date.
+
+    Each group is written to raw_data/<arrival_date>/late/<event_date>/, so the
+    original event date stays in the path. Late drops from a previous run for
+    the same event date are cleared first.
+
+    Args:
+        date: Production (event) date
+        late_tables: {delay_days: {table: records}}
+        output_format: Raw file format (None = default layout)
+    """
+    clear_late_arrivals(date)
+
+    for delay, tables in sorted(late_tables.items()):
+        late_dir = late_arrival_dir(date, delay)
+        late_dir.mkdir(parents=True, exist_ok=True)
+
+        for table, records in tables.items():
+            write_table(records, late_dir, table, output_format)
+
+        print(f"  - {sum(len(r) for r in tables.values())} late records arriving {late_dir.parent.parent.name}")
+
+
+def generate_day(date: datetime, engine: str = "python", seed: int = RANDOM_SEED,
+                 output_format: Optional[str] = None, late_arrivals: bool = False,
+                 chunk_size: Optional[int] = None):
+    """
+    Generate all data for a single day.
+
+    Each machine's records are drawn from a stream seeded by (seed, date,
+    machine_id), so a day's output does not depend on which other days were
+    generated before it or in which process.
+
+    Args:
+        date: Production date
+        engine: "python" (per-batch loop), "numpy" (vectorized batch and
+            columnar sensor engine) or "des" (batches driven by material flow
+            between machines, see simulation.py; buffers open at the levels
+            a simulated warm-up day leaves, see simulate_day)
+        seed: Global seed
+        output_format: Raw file format (None = default layout, see save_data)
+        late_arrivals: Hold back a fraction of records for later days' drops (off by
+            default: every record is written to its own date's files)
+        chunk_size: Stream records to disk in chunks of this size instead of
+            holding the whole day in memory (python engine only, see stream_day)
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+
+    if chunk_size:
+        if engine != "python":
+            raise ValueError("Streaming generation is only available with the python engine")
+        stream_day(date, seed=seed, output_format=output_format, late_arrivals=late_arrivals, chunk_size=chunk_size)
+        return
+
     days_elapsed = (date.date() - START_DATE).days
 
     all_batches_clean = []
-    all_sensor_logs = []
-    all_qc_checks = []
-    all_operator_logs = []
+    tables = {table: [] for table in RAW_TABLES}
+
+    if engine == "numpy":
+        # One generator per machine, seeded like the Python engine's streams
+        machine_rngs = [np.random.default_rng(derive_seed(seed, date, machine["machine_id"])) for machine in MACHINES]
+        columns, sensor_columns, batch_table = generate_machine_columns(date.date(), MACHINES, days_elapsed, machine_rngs)
+
+        batches_by_machine = {machine["machine_id"]: [] for machine in MACHINES}
+        for batch in batch_columns_to_records(columns, MACHINES, date.date()):
+            batches_by_machine[batch["machine_id"]].append(batch)
+    elif engine == "des":
+        batches_by_machine = simulate_day(date.date(), machines=MACHINES, seed=derive_seed(seed, date, "des"))
 
     # Generate data for each machine
     for machine in MACHINES:
-        batches = generate_production_batches(date.date(), machine, days_elapsed)
-        all_batches_clean.extend(batches)
+        pregenerated = batches_by_machine[machine["machine_id"]] if engine != "python" else None
+        batches, records = generate_machine_records(date, machine, days_elapsed, seed, pregenerated,
+                                                    bulk=engine == "numpy")
 
-        sensors = generate_sensor_logs(batches, machine)
-        all_sensor_logs.extend(sensors)
-
-        qc = generate_qc_checks(batches, date.date())
-        all_qc_checks.extend(qc)
+        all_batches_clean.extend(batches)
+        for table, rows in records.items():
+            tables[table].extend(rows)
 
-        ops = generate_operator_logs(batches, machine, date.date())
-        all_operator_logs.extend(ops)
+    if engine == "numpy":
+        tables["sensor_logs"] = sensor_columns_to_arrow(sensor_columns, MACHINES)
+        tables["production_batches"] = batch_table
 
     # Generate ground truth from clean batches
     ground_truth = generate_ground_truth(all_batches_clean, date.date())
 
-    # Apply chaos to batches
-    chaotic_batches = apply_chaos_to_batches(all_batches_clean)
+    # Hold back late-arriving records
+    late_tables = {}
+    if late_arrivals:
+        rngs = late_arrival_rngs(date, seed)
+        for table, records in tables.items():
+            if engine == "numpy":
+                late_rng = np.random.default_rng(derive_seed(seed, date, f"late_arrivals:{table}"))
+                delays = should_arrive_late_array(len(records), late_rng)
+            else:
+                delays = [should_arrive_late(rngs[table])[1] for _ in range(len(records))]
+            groups = split_late_arrivals(records, delays)
+            tables[table] = groups.pop(0)
+            for delay, group in groups.items():
+                late_tables.setdefault(delay, {})[table] = group
 
     # Save all data
-    save_data(date, all_sensor_logs, chaotic_batches, all_qc_checks, all_operator_logs, ground_truth)
+    save_data(date, tables["sensor_logs"], tables["production_batches"], tables["qc_checks"],
+              tables["operator_logs"], ground_truth, output_format)
+    save_late_arrivals(date, late_tables, output_format)
+
+
+def generate_machine_records(date: datetime, machine: Dict, days_elapsed: int, seed: int,
+                             batches: Optional[List[Dict]] = None,
+                             bulk: bool = True) -> Tuple[List[Dict], Dict[str, List[Dict]]]:
+    """
+    Generate one machine's records for a day under its own seeded stream.
+
+    Args:
+        date: Production date
+        machine: Machine configuration
+        days_elapsed: Days since START_DATE (for degradation calc)
+        seed: Global seed
+        batches: Batches already generated by the numpy or des engine
+        bulk: With pregenerated batches, sensor logs and chaotic batch rows
+            are produced in bulk elsewhere and left empty here (numpy engine)
+
+    Returns:
+        Tuple of (clean batches, {raw table: chaotic records})
+    """
+    random.seed(derive_seed(seed, date, machine["machine_id"]))
+
+    vectorized = batches is not None and bulk
+    sensors = []
+    if batches is None:
+        batches = generate_production_batches(date.date(), machine, days_elapsed)
+    if not vectorized:
+        sensors = generate_sensor_logs(batches, machine)
+
+    qc = generate_qc_checks(batches, date.date())
+    ops = generate_operator_logs(batches, machine, date.date())
+
+    return batches, {
+        "sensor_logs": sensors,
+        "production_batches": [] if vectorized else apply_chaos_to_batches(batches),
+        "qc_checks": qc,
+        "operator_logs": ops
+    }
+
+
+def stream_day(date: datetime, seed: int = RANDOM_SEED, output_format: Optional[str] = None,
+               late_arrivals: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Generate a day machine by machine, streaming records straight to disk.
+
+    Records are buffered per output file and flushed to incremental writers
+    whenever a buffer reaches `chunk_size`; ground truth is accumulated as
+    each machine's batches are produced. Peak memory is bounded by the chunk
+    size (plus one machine's records) instead of the size of the day. Output
+    matches generate_day with the python engine.
+
+    Args:
+        date: Production date
+        seed: Global seed
+        output_format: Raw file format (None = default layout)
+        late_arrivals: Hold back a fraction of records for later days' drops
+        chunk_size: Records buffered per file before writing
+    """
+    date_str = date.strftime("%Y-%m-%d")
+    days_elapsed = (date.date() - START_DATE).days
+
+    raw_dir = RAW_DATA_DIR / date_str
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    clear_late_arrivals(date)
+
+    ground_truth = new_ground_truth(date.date())
+    chaos_metrics = new_chaos_metrics()
+    rngs = late_arrival_rngs(date, seed)
+
+    # Writers and buffers keyed by (delay_days, table); on-time writers exist up front
+    writers = {(0, table): open_table_writer(raw_dir, table, output_format) for table in RAW_TABLES}
+    buffers = {key: [] for key in writers}
+
+    def flush(key):
+        if key not in writers:
+            late_dir = late_arrival_dir(date, key[0])
+            late_dir.mkdir(parents=True, exist_ok=True)
+            writers[key] = open_table_writer(late_dir, key[1], output_format)
+        writers[key].write(buffers[key])
+        buffers[key] = []
+
+    try:
+        for machine in MACHINES:
+            batches, records = generate_machine_records(date, machine, days_elapsed, seed)
+            accumulate_ground_truth(ground_truth, batches)
+
+            for table, rows in records.items():
+                if late_arrivals:
+                    delays = [should_arrive_late(rngs[table])[1] for _ in range(len(rows))]
+                else:
+                    delays = [0] * len(rows)
+
+                for delay, group in split_late_arrivals(rows, delays).items():
+                    if delay == 0:
+                        accumulate_chaos_metrics(chaos_metrics, table, group)
+                    buffer = buffers.setdefault((delay, table), [])
+                    buffer.extend(group)
+                    if len(buffer) >= chunk_size:
+                        flush((delay, table))
+
+        for key in list(buffers):
+            if buffers[key]:
+                flush(key)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    save_ground_truth(date, ground_truth, output_format)
+    save_aggregates(date, ground_truth, chaos_metrics)
+
+    print(f"[OK] Streamed data for {date_str}:")
+    for table in RAW_TABLES:
+        print(f"  - {writers[(0, table)].rows_written} {table}")
+    late_rows = sum(writer.rows_written for (delay, _), writer in writers.items() if delay > 0)
+    print(f"  - {late_rows} late records")
+
+
+def generate_days(dates: List[datetime], workers: int = 1, **options):
+    """
+    Generate several days, optionally in parallel worker processes.
+
+    Output is identical for any worker count because every day is seeded
+    independently (see generate_day).
+
+    Args:
+        dates: Production dates
+        workers: Number of worker processes (1 = run serially in-process)
+        **options: Keyword arguments passed to generate_day
+    """
+    if workers <= 1:
+        for date in dates:
+            generate_day(date, **options)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(generate_day, date, **options): date for date in dates}
+        for future in as_completed(futures):
+            future.result()  # Re-raise worker failures
 
 
 def main():
@@ -457,22 +768,47 @@ def main():
     parser = argparse.ArgumentParser(description="Generate factory simulation data")
     parser.add_argument("--date", type=str, help="Specific date (YYYY-MM-DD)")
     parser.add_argument("--all", action="store_true", help="Generate all 7 days")
+    parser.add_argument("--engine", choices=ENGINES, default="python", help="Batch generation engine")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for --all backfills")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="Global random seed")
+    parser.add_argument("--format", dest="output_format", choices=FORMATS,
+                        help="Raw file format (default: sensor logs JSON, other tables CSV)")
+    parser.add_argument("--late-arrivals", action="store_true",
+                        help="Hold back ~10%% of records for drops 1-2 days later (default: every record on time)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stream records to disk machine by machine (bounded memory, python engine)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Records buffered per file in --stream mode")
+    parser.add_argument("--config", type=str, help="Factory layout file (YAML/TOML) with machine templates")
     args = parser.parse_args()
 
+    if args.config:
+        # Exported so worker processes load the same layout
+        os.environ[FACTORY_CONFIG_ENV_VAR] = args.config
+        apply_factory_config_file(args.config)
+        print(f"Loaded {len(MACHINES)} machines from {args.config}")
+
+    options = {
+        "engine": args.engine,
+        "seed": args.seed,
+        "output_format": args.output_format,
+        "late_arrivals": args.late_arrivals,
+        "chunk_size": args.chunk_size if args.stream else None
+    }
+
     if args.all:
         print(f"Generating data from {START_DATE} to {END_DATE}...")
-        current = datetime.combine(START_DATE, datetime.min.time())
-        end = datetime.combine(END_DATE, datetime.min.time())
+        start = datetime.combine(START_DATE, datetime.min.time())
+        num_days = (END_DATE - START_DATE).days + 1
+        dates = [start + timedelta(days=i) for i in range(num_days)]
 
-        while current <= end:
-            generate_day(current)
-            current += timedelta(days=1)
+        generate_days(dates, workers=args.workers, **options)
 
         print(f"\n[SUCCESS] All historical data generated!")
 
     elif args.date:
         target_date = datetime.strptime(args.date, "%Y-%m-%d")
-        generate_day(target_date)
+        generate_day(target_date, **options)
 
     else:
         print("Please specify --date YYYY-MM-DD or --all")
@@ -0,0 +1,441 @@
+"""
+Live streaming mode: emit factory events in (accelerated) real time.
+
+Instead of writing a whole day at once, a long-running asyncio producer
+emits sensor readings, batch completions, QC checks and operator logs at the
+moment they "happen" on a simulated clock, to a local sink:
+
+- ndjson: rotating NDJSON segment files, stream/<stream_id>-<first_seq>.ndjson
+- socket: a Unix domain socket a consumer listens on
+- pipe: a named pipe (FIFO), created if missing
+
+Each event is one JSON line:
+
+    {"stream": "live-...", "emitted_at": 1760000000.123, "seq": 42,
+     "table": "sensor_logs", "data": {...raw record...}}
+
+seq increases by one per event within a stream, so consumers can track
+offsets and drop replays. Records carry the same chaos as the daily files
+(drift, name variations, duplicates, local timestamps), but arrive on time:
+late drops are a file-delivery effect and are not simulated here.
+
+Event times are when a record is created: sensor readings at their (drifted)
+timestamp, batches at their end time, QC checks and operator logs at their
+true time even when the record is stamped in local time.
+
+Throughput: days are generated ahead in worker processes (the same
+per-machine seeded streams as generate_day), already encoded; the event
+loop only stamps sequence numbers and paces chunks of events. Chunks pass
+through a bounded queue to the sink writer, so a slow consumer blocks the
+producer (backpressure) instead of growing memory. --speed 0 removes the
+pacing for load tests.
+
+Usage:
+    python -m data_generators.live_stream                              # 60x real time to stream/
+    python -m data_generators.live_stream --speed 1                    # wall-clock time
+    python -m data_generators.live_stream --sink socket --path /tmp/factory.sock
+    python -m data_generators.live_stream --speed 0 --max-events 5000000 --workers 4
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import count
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from data_generators.config import MACHINES, START_DATE, RANDOM_SEED, STREAM_DIR, CHAOS_CONFIG
+from data_generators.generate_data import generate_machine_records
+from data_generators.factory_config import apply_factory_config_file, ENV_VAR as FACTORY_CONFIG_ENV_VAR
+
+SINKS = ("ndjson", "socket", "pipe")
+
+# Simulated seconds per wall-clock second
+DEFAULT_SPEED = 60.0
+
+# Events per queued chunk, and chunks the queue holds before the producer waits
+DEFAULT_CHUNK_EVENTS = 5_000
+DEFAULT_QUEUE_SIZE = 32
+
+# NDJSON segment size before rotating
+DEFAULT_SEGMENT_MB = 64
+
+# Seconds between progress lines, and the longest idle sleep
+REPORT_INTERVAL_SECONDS = 5.0
+
+# Seconds between attempts to reach a socket nobody listens on yet
+CONNECT_RETRY_SECONDS = 1.0
+
+# Windows used to recognise local-time stamps (as in generate_qc_checks/generate_operator_logs)
+OPERATOR_LOG_WINDOW_MINUTES = 10
+LOCAL_OFFSET = timedelta(hours=CHAOS_CONFIG["local_utc_offset_hours"])
+
+EPOCH = datetime(1970, 1, 1)
+
+# Shared encoder (json.dumps with default= builds a new one per call)
+ENCODER = json.JSONEncoder(default=datetime.isoformat)
+
+# ============================================================================
+# EVENT GENERATION (runs in worker processes)
+# ============================================================================
+
+
+def event_time(table: str, record: Dict, batch_ends: Dict[str, datetime], batch_starts: List[datetime]) -> datetime:
+    """
+    Return when a raw record is created.
+
+    Local-time stamps are shifted back to UTC: a QC check always follows its
+    batch's end, and an operator log lies within a few minutes of a batch
+    start, so a stamp that breaks that rule was written in local time.
+
+    Args:
+        table: Raw table name
+        record: Raw record
+        batch_ends: Batch end time per batch ID (clean batches of the machine)
+        batch_starts: Sorted batch start times of the machine
+
+    Returns:
+        Event time (naive UTC)
+    """
+    if table == "production_batches":
+        return record["end_time"]
+    if table == "sensor_logs":
+        return datetime.fromisoformat(record["timestamp"])
+
+    if table == "qc_checks":
+        stamp = datetime.fromisoformat(record["check_timestamp"])
+        end = batch_ends.get(record["batch_id"])
+        return stamp - LOCAL_OFFSET if end is not None and stamp < end else stamp
+
+    stamp = datetime.fromisoformat(record["log_timestamp"])
+    window = timedelta(minutes=OPERATOR_LOG_WINDOW_MINUTES)
+    position = bisect_left(batch_starts, stamp - window)
+    near_batch = position < len(batch_starts) and batch_starts[position] <= stamp + window
+    return stamp if near_batch else stamp - LOCAL_OFFSET
+
+
+def day_events(date: datetime, seed: int = RANDOM_SEED) -> Tuple[List[float], List[bytes]]:
+    """
+    Generate and encode one day's events, ordered by event time.
+
+    Args:
+        date: Production date
+        seed: Global seed
+
+    Returns:
+        (event times as epoch seconds, encoded event tails): each tail is the
+        '"table": ..., "data": ...}' part of the event line, newline included
+    """
+    days_elapsed = (date.date() - START_DATE).days
+    headers = {}
+    events = []
+
+    for machine in MACHINES:
+        batches, records = generate_machine_records(date, machine, days_elapsed, seed)
+        batch_ends = {batch["batch_id"]: batch["end_time"] for batch in batches}
+        batch_starts = sorted(batch["start_time"] for batch in batches)
+
+        for table, rows in records.items():
+            header = headers.setdefault(table, f'"table": "{table}", "data": '.encode())
+            for row in rows:
+                when = (event_time(table, row, batch_ends, batch_starts) - EPOCH).total_seconds()
+                events.append((when, header + ENCODER.encode(row).encode() + b"}\n"))
+
+    events.sort(key=lambda event: event[0])
+    return [event[0] for event in events], [event[1] for event in events]
+
+
+# ============================================================================
+# SINKS
+# ============================================================================
+
+
+class Sink(ABC):
+    """Destination for encoded event chunks."""
+
+    async def open(self):
+        """Prepare the sink (may wait for a consumer)."""
+
+    @abstractmethod
+    async def write(self, first_seq: int, chunk: bytes):
+        """Write a chunk of event lines starting at sequence number first_seq."""
+
+    async def close(self):
+        """Flush and release the sink."""
+
+
+class UnixSocketSink(Sink):
+    """Stream events to a consumer listening on a Unix domain socket."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.writer = None
+
+    async def open(self):
+        while self.writer is None:
+            try:
+                _, self.writer = await asyncio.open_unix_connection(str(self.path))
+            except (FileNotFoundError, ConnectionRefusedError):
+                await asyncio.sleep(CONNECT_RETRY_SECONDS)
+
+    async def write(self, first_seq: int, chunk: bytes):
+        self.writer.write(chunk)
+        await self.writer.drain()
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+
+
+class NamedPipeSink(Sink):
+    """Stream events into a named pipe; opening waits for a reader."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = None
+
+    async def open(self):
+        if not self.path.exists():
+            os.mkfifo(self.path)
+        self.file = await asyncio.to_thread(open, self.path, "wb")
+
+    async def write(self, first_seq: int, chunk: bytes):
+        # Blocking writes run in a thread: a full pipe stalls the writer, not the event loop
+        await asyncio.to_thread(self.file.write, chunk)
+
+    async def close(self):
+        if self.file is not None:
+            await asyncio.to_thread(self.file.close)
+
+
+class NdjsonSegmentSink(Sink):
+    """Append events to NDJSON segment files, rotating by size."""
+
+    def __init__(self, directory: Path, stream_id: str, segment_bytes: int):
+        self.directory = directory
+        self.stream_id = stream_id
+        self.segment_bytes = segment_bytes
+        self.file = None
+        self.size = 0
+
+    async def open(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, first_seq: int, chunk: bytes):
+        if self.file is None or self.size >= self.segment_bytes:
+            if self.file is not None:
+                self.file.close()
+            self.file = open(self.directory / f"{self.stream_id}-{first_seq:012d}.ndjson", "wb")
+            self.size = 0
+        self.file.write(chunk)
+        self.file.flush()
+        self.size += len(chunk)
+
+    async def write(self, first_seq: int, chunk: bytes):
+        await asyncio.to_thread(self._write, first_seq, chunk)
+
+    async def close(self):
+        if self.file is not None:
+            await asyncio.to_thread(self.file.close)
+
+
+def make_sink(kind: str, path: Optional[Path], stream_id: str, segment_mb: float = DEFAULT_SEGMENT_MB) -> Sink:
+    """
+    Create a sink.
+
+    Args:
+        kind: One of SINKS
+        path: Socket or pipe path, or the segment directory for ndjson (default STREAM_DIR)
+        stream_id: Stream name (segment file prefix)
+        segment_mb: Segment size for ndjson
+
+    Returns:
+        Unopened sink
+    """
+    if kind == "ndjson":
+        return NdjsonSegmentSink(path or STREAM_DIR, stream_id, int(segment_mb * 1024 * 1024))
+    if path is None:
+        raise ValueError(f"The {kind} sink needs a path")
+    return UnixSocketSink(path) if kind == "socket" else NamedPipeSink(path)
+
+
+# ============================================================================
+# PRODUCER
+# ============================================================================
+
+
+def stream_dates(start: datetime, days: Optional[int] = None) -> Iterator[datetime]:
+    """Yield production dates from start's day on (forever when days is None)."""
+    first = datetime.combine(start.date(), datetime.min.time())
+    for offset in (range(days) if days is not None else count()):
+        yield first + timedelta(days=offset)
+
+
+async def produce(queue: asyncio.Queue, stats: Dict, stream_id: str, start: datetime,
+                  days: Optional[int] = None, speed: float = DEFAULT_SPEED, seed: int = RANDOM_SEED,
+                  chunk_events: int = DEFAULT_CHUNK_EVENTS, max_events: Optional[int] = None,
+                  workers: int = 1):
+    """
+    Pace generated events onto the queue as chunks (first_seq, bytes).
+
+    Args:
+        queue: Bounded queue to the sink writer (None is put when done)
+        stats: Counters updated in place (events, bytes, simulated_time)
+        stream_id: Stream name written into every event
+        start: Simulated start time; earlier events of that day are skipped
+        days: Days to stream (None = forever)
+        speed: Simulated seconds per wall second (0 = as fast as possible)
+        seed: Global seed
+        chunk_events: Largest number of events per chunk
+        max_events: Stop after this many events
+        workers: Days generated ahead in worker processes
+    """
+    loop = asyncio.get_running_loop()
+    sim_start = (start - EPOCH).total_seconds()
+    wall_start = loop.time()
+    seq = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        dates = stream_dates(start, days)
+        pending = deque(loop.run_in_executor(executor, day_events, date, seed)
+                        for date in (next(dates, None) for _ in range(workers)) if date is not None)
+
+        while pending and (max_events is None or seq < max_events):
+            times, lines = await pending.popleft()
+            following = next(dates, None)
+            if following is not None:
+                pending.append(loop.run_in_executor(executor, day_events, following, seed))
+
+            position = bisect_left(times, sim_start)
+            while position < len(times) and (max_events is None or seq < max_events):
+                end = min(len(times), position + chunk_events)
+                if max_events is not None:
+                    end = min(end, position + max_events - seq)
+
+                if speed:
+                    now = sim_start + (loop.time() - wall_start) * speed
+                    if times[position] > now:
+                        await asyncio.sleep(min((times[position] - now) / speed, REPORT_INTERVAL_SECONDS))
+                        continue
+                    end = bisect_right(times, now, position, end)
+
+                prefix = b'{"stream": "%s", "emitted_at": %.3f, "seq": ' % (stream_id.encode(), time.time())
+                chunk = b"".join(b"%s%d, %s" % (prefix, seq + offset, line)
+                                 for offset, line in enumerate(lines[position:end]))
+                await queue.put((seq, chunk))
+
+                stats["events"] += end - position
+                stats["bytes"] += len(chunk)
+                stats["simulated_time"] = times[end - 1]
+                seq += end - position
+                position = end
+
+        for future in pending:
+            future.cancel()
+    await queue.put(None)
+
+
+async def drain(queue: asyncio.Queue, sink: Sink):
+    """Write queued chunks to the sink until the producer is done."""
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        await sink.write(*item)
+
+
+async def report(queue: asyncio.Queue, stats: Dict):
+    """Print throughput, queue depth and the simulated clock periodically."""
+    previous, previous_time = 0, time.perf_counter()
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL_SECONDS)
+        now = time.perf_counter()
+        rate = (stats["events"] - previous) / (now - previous_time)
+        clock = EPOCH + timedelta(seconds=stats["simulated_time"]) if stats["simulated_time"] else None
+        print(f"  {stats['events']:,} events ({rate:,.0f}/s), queue {queue.qsize()}/{queue.maxsize}, "
+              f"simulated {clock:%Y-%m-%d %H:%M:%S}" if clock else f"  waiting for events, queue {queue.qsize()}")
+        previous, previous_time = stats["events"], now
+
+
+async def run_stream(sink: Sink, stream_id: str, start: datetime, stats: Dict,
+                     queue_size: int = DEFAULT_QUEUE_SIZE, **options):
+    """
+    Run the producer, sink writer and progress reporter until the stream ends.
+
+    Args:
+        sink: Destination
+        stream_id: Stream name
+        start: Simulated start time
+        stats: Counters updated in place (events, bytes, simulated_time)
+        queue_size: Chunks buffered between producer and sink
+        **options: Keyword arguments passed to produce
+    """
+    queue = asyncio.Queue(maxsize=queue_size)
+
+    await sink.open()
+    reporter = asyncio.create_task(report(queue, stats))
+    try:
+        await asyncio.gather(produce(queue, stats, stream_id, start, **options), drain(queue, sink))
+    finally:
+        reporter.cancel()
+        await sink.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Stream factory events in accelerated real time")
+    parser.add_argument("--sink", choices=SINKS, default="ndjson", help="Where events go")
+    parser.add_argument("--path", type=Path, help="Socket/pipe path, or segment directory for ndjson (default stream/)")
+    parser.add_argument("--start", type=datetime.fromisoformat,
+                        help="Simulated start time, UTC (YYYY-MM-DD[THH:MM]); default is now")
+    parser.add_argument("--days", type=int, help="Days to stream (default: run until stopped)")
+    parser.add_argument("--speed", type=float, default=DEFAULT_SPEED,
+                        help="Simulated seconds per second (1 = real time, 0 = as fast as possible)")
+    parser.add_argument("--max-events", type=int, help="Stop after this many events")
+    parser.add_argument("--stream-id", type=str, help="Stream name (default: live-<start time>)")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="Global random seed")
+    parser.add_argument("--workers", type=int, default=2, help="Days generated ahead in worker processes")
+    parser.add_argument("--chunk-events", type=int, default=DEFAULT_CHUNK_EVENTS, help="Largest chunk of events")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Chunks buffered before the producer waits for the sink")
+    parser.add_argument("--segment-mb", type=float, default=DEFAULT_SEGMENT_MB, help="NDJSON segment size")
+    parser.add_argument("--config", type=str, help="Factory layout file (YAML/TOML) with machine templates")
+    args = parser.parse_args()
+
+    if args.config:
+        # Exported so worker processes load the same layout
+        os.environ[FACTORY_CONFIG_ENV_VAR] = args.config
+        apply_factory_config_file(args.config)
+
+    start = args.start or datetime.utcnow()
+    stream_id = args.stream_id or f"live-{datetime.utcnow():%Y%m%dT%H%M%S}"
+    sink = make_sink(args.sink, args.path, stream_id, args.segment_mb)
+
+    print(f"Streaming {len(MACHINES)} machines from {start:%Y-%m-%d %H:%M} as '{stream_id}' "
+          f"to {args.sink} ({'unpaced' if not args.speed else f'{args.speed:g}x'})...")
+    started = time.perf_counter()
+    stats = {"events": 0, "bytes": 0, "simulated_time": None}
+    try:
+        asyncio.run(run_stream(
+            sink, stream_id, start, stats, queue_size=args.queue_size, days=args.days, speed=args.speed,
+            seed=args.seed, chunk_events=args.chunk_events, max_events=args.max_events, workers=args.workers
+        ))
+    except KeyboardInterrupt:
+        print("\nStopped by user")
+    except (BrokenPipeError, ConnectionResetError):
+        print("\n[ERROR] Consumer disconnected")
+    elapsed = time.perf_counter() - started
+
+    print(f"[OK] Streamed {stats['events']:,} events ({stats['bytes'] / 1e6:,.1f} MB) in {elapsed:.1f}s "
+          f"({stats['events'] / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+Pluggable output formats for raw data and ground truth files.
+
+Every raw table can be written as CSV, JSON, Parquet or Arrow IPC. The
+columnar formats use typed schemas that mirror the bronze tables created by
+orchestration/init_database.py, zstd compression, and rows sorted by
+machine and time so row-group statistics let readers skip data.
+"""
+import csv
+import json
+import textwrap
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from data_generators.vocabulary import DICTIONARY_TYPE, VOCABULARIES, encode
+
+FORMATS = ("csv", "json", "parquet", "arrow-ipc")
+COLUMNAR_FORMATS = ("parquet", "arrow-ipc")
+
+FILE_EXTENSIONS = {
+    "csv": ".csv",
+    "json": ".json",
+    "parquet": ".parquet",
+    "arrow-ipc": ".arrow"
+}
+
+# Raw tables written for every day
+RAW_TABLES = ("sensor_logs", "production_batches", "qc_checks", "operator_logs")
+
+# Format used for each table when none is requested (the original layout)
+DEFAULT_TABLE_FORMATS = {
+    "sensor_logs": "json",
+    "production_batches": "csv",
+    "qc_checks": "csv",
+    "operator_logs": "csv"
+}
+
+# Typed schemas matching the bronze tables (minus load metadata columns); machine
+# IDs and product names are dictionary-encoded against the shared vocabularies
+SCHEMAS = {
+    "sensor_logs": pa.schema([
+        ("machine_id", DICTIONARY_TYPE),
+        ("timestamp", pa.timestamp("us")),
+        ("temperature", pa.float64()),
+        ("pressure", pa.float64()),
+        ("energy_kwh", pa.float64()),
+        ("efficiency_percent", pa.float64())
+    ]),
+    "production_batches": pa.schema([
+        ("batch_id", pa.string()),
+        ("machine_id", DICTIONARY_TYPE),
+        ("product_name", DICTIONARY_TYPE),
+        ("start_time", pa.timestamp("us")),
+        ("end_time", pa.timestamp("us")),
+        ("units_produced", pa.int32()),
+        ("units_defective", pa.int32())
+    ]),
+    "qc_checks": pa.schema([
+        ("check_id", pa.string()),
+        ("batch_id", pa.string()),
+        ("check_timestamp", pa.timestamp("us")),
+        ("inspector_id", pa.string()),
+        ("pass_fail", pa.string()),
+        ("defect_notes", pa.string())
+    ]),
+    "operator_logs": pa.schema([
+        ("log_id", pa.string()),
+        ("machine_id", DICTIONARY_TYPE),
+        ("operator_id", pa.string()),
+        ("log_timestamp", pa.timestamp("us")),
+        ("action", pa.string()),
+        ("notes", pa.string())
+    ]),
+    "truth": pa.schema([
+        ("date", pa.date32()),
+        ("dimension", pa.string()),
+        ("key", pa.string()),
+        ("batches", pa.int32()),
+        ("units_produced", pa.int64()),
+        ("units_defective", pa.int64()),
+        ("energy_consumed_kwh", pa.float64())
+    ]),
+    # Daily aggregate store (see data_generators/aggregates.py); the date comes from the partition path
+    "machine_daily": pa.schema([
+        ("factory_id", pa.string()),
+        ("line_id", pa.string()),
+        ("machine_id", pa.string()),
+        ("machine_type", pa.string()),
+        ("product_name", pa.string()),
+        ("batches", pa.int32()),
+        ("units_produced", pa.int64()),
+        ("units_defective", pa.int64()),
+        ("energy_consumed_kwh", pa.float64())
+    ]),
+    "chaos_daily": pa.schema([
+        ("sensor_readings", pa.int64()),
+        ("sensor_values", pa.int64()),
+        ("sensor_nulls", pa.int64()),
+        ("temperature_sum", pa.float64()),
+        ("temperature_count", pa.int64()),
+        ("pressure_sum", pa.float64()),
+        ("pressure_count", pa.int64()),
+        ("batch_rows", pa.int64()),
+        ("product_variations", pa.int32()),
+        ("duplicate_batches", pa.int64())
+    ])
+}
+
+# Sort order for columnar files; clusters rows so min/max statistics are selective
+SORT_KEYS = {
+    "sensor_logs": ["machine_id", "timestamp"],
+    "production_batches": ["machine_id", "start_time"],
+    "qc_checks": ["check_timestamp"],
+    "operator_logs": ["machine_id", "log_timestamp"],
+    "truth": ["dimension", "key"],
+    "machine_daily": ["machine_id", "product_name"],
+    "chaos_daily": ["sensor_readings"]
+}
+
+# Low-cardinality string columns that get dictionary-encoded in Parquet
+DICTIONARY_COLUMNS = ["machine_id", "product_name", "inspector_id", "operator_id", "pass_fail", "action", "dimension"]
+
+ROW_GROUP_SIZE = 128 * 1024
+
+Records = Union[List[Dict], pa.Table]
+
+
+def table_path(directory: Path, table: str, fmt: str) -> Path:
+    """Return the file path for a table written in the given format."""
+    return directory / f"{table}{FILE_EXTENSIONS[fmt]}"
+
+
+def find_table_file(directory: Path, table: str) -> Optional[Path]:
+    """
+    Locate a table's file in a directory, whichever format it was written in.
+
+    Args:
+        directory: Directory to search (e.g. raw_data/<date>)
+        table: Table name (e.g. "production_batches")
+
+    Returns:
+        Path to the file, or None if no format exists
+    """
+    for fmt in FORMATS:
+        path = table_path(directory, table, fmt)
+        if path.exists():
+            return path
+    return None
+
+
+def to_arrow(records: Records, table: str) -> pa.Table:
+    """
+    Convert records to an Arrow table with the table's typed schema.
+
+    Args:
+        records: List of record dictionaries or an Arrow table
+        table: Table name (selects the schema)
+
+    Returns:
+        Arrow table cast to the schema; ISO timestamp strings are parsed and
+        vocabulary columns dictionary-encoded
+    """
+    schema = SCHEMAS[table]
+    arrays = []
+    for field in schema:
+        if isinstance(records, pa.Table):
+            values = records.column(field.name)
+        else:
+            values = [record[field.name] for record in records]
+
+        if field.type == DICTIONARY_TYPE:
+            arrays.append(encode(values, field.name))
+        else:
+            # ISO timestamp strings cast straight to timestamp[us]
+            array = values if isinstance(values, pa.ChunkedArray) else pa.array(values)
+            arrays.append(array.cast(field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def sort_rows(data: pa.Table, table: str) -> pa.Table:
+    """
+    Sort a typed table by its SORT_KEYS.
+
+    Dictionary-encoded keys are ordered by their string values, so files
+    cluster the same way whatever the vocabulary codes are.
+    """
+    keys = SORT_KEYS[table]
+    key_columns = pa.table({
+        key: data.column(key).cast(pa.string()) if data.schema.field(key).type == DICTIONARY_TYPE else data.column(key)
+        for key in keys
+    })
+    return data.take(pc.sort_indices(key_columns, sort_keys=[(key, "ascending") for key in keys]))
+
+
+def to_records(records: Records) -> List[Dict]:
+    """Convert an Arrow table to record dictionaries (lists pass through)."""
+    if isinstance(records, pa.Table):
+        return records.to_pylist()
+    return records
+
+
+def _serialize(value):
+    """Render a value the way the text formats store it."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class TableWriter(ABC):
+    """
+    Incremental writer for one table file.
+
+    Records are appended with write() in any number of chunks; close() (or
+    leaving a ``with`` block) finalizes the file. Writing everything in one
+    call produces the same file as a one-shot writer.
+    """
+
+    def __init__(self, path: Path, table: str):
+        self.path = path
+        self.table = table
+        self.fieldnames = SCHEMAS[table].names
+        self.rows_written = 0
+
+    @abstractmethod
+    def write(self, records: Records):
+        """Append a chunk of records."""
+
+    @abstractmethod
+    def close(self):
+        """Finalize the file."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvTableWriter(TableWriter):
+    """CSV writer; the header is written with the first row, so no rows means an empty file."""
+
+    def __init__(self, path: Path, table: str):
+        super().__init__(path, table)
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.fieldnames)
+
+    def write(self, records: Records):
+        rows = to_records(records)
+        if rows and self.rows_written == 0:
+            self.writer.writeheader()
+        for row in rows:
+            self.writer.writerow({name: _serialize(row[name]) for name in self.fieldnames})
+        self.rows_written += len(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonTableWriter(TableWriter):
+    """Indented JSON array writer, streamed element by element."""
+
+    def __init__(self, path: Path, table: str):
+        super().__init__(path, table)
+        self.file = open(path, "w")
+
+    def write(self, records: Records):
+        for row in to_records(records):
+            element = json.dumps({name: _serialize(row[name]) for name in self.fieldnames}, indent=2)
+            self.file.write(("[\n" if self.rows_written == 0 else ",\n") + textwrap.indent(element, "  "))
+            self.rows_written += 1
+
+    def close(self):
+        self.file.write("[]" if self.rows_written == 0 else "\n]")
+        self.file.close()
+
+
+class ParquetTableWriter(TableWriter):
+    """zstd-compressed Parquet writer; each chunk is sorted and becomes one or more row groups."""
+
+    def __init__(self, path: Path, table: str):
+        super().__init__(path, table)
+        self.writer = pq.ParquetWriter(
+            path,
+            SCHEMAS[table],
+            compression="zstd",
+            write_statistics=True,
+            use_dictionary=[name for name in DICTIONARY_COLUMNS if name in self.fieldnames]
+        )
+
+    def write(self, records: Records):
+        data = sort_rows(to_arrow(records, self.table), self.table)
+        if data.num_rows:
+            self.writer.write_table(data, row_group_size=ROW_GROUP_SIZE)
+        self.rows_written += data.num_rows
+
+    def close(self):
+        self.writer.close()
+
+
+class ArrowIpcTableWriter(TableWriter):
+    """zstd-compressed Arrow IPC (Feather v2) file writer; each chunk is sorted."""
+
+    def __init__(self, path: Path, table: str):
+        super().__init__(path, table)
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        self.writer = pa.ipc.new_file(str(path), SCHEMAS[table], options=options)
+
+    def write(self, records: Records):
+        data = sort_rows(to_arrow(records, self.table), self.table)
+        self.writer.write_table(data, max_chunksize=ROW_GROUP_SIZE)
+        self.rows_written += data.num_rows
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {
+    "csv": CsvTableWriter,
+    "json": JsonTableWriter,
+    "parquet": ParquetTableWriter,
+    "arrow-ipc": ArrowIpcTableWriter
+}
+
+
+def open_table_writer(directory: Path, table: str, fmt: Optional[str] = None) -> TableWriter:
+    """
+    Open an incremental writer for one table.
+
+    Args:
+        directory: Output directory
+        table: Table name
+        fmt: Output format (None = the table's default format)
+
+    Returns:
+        Writer for <directory>/<table>.<ext>
+    """
+    fmt = fmt or DEFAULT_TABLE_FORMATS[table]
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown output format '{fmt}', expected one of {FORMATS}")
+
+    # Drop copies in other formats so readers never pick up a stale file
+    for other in FORMATS:
+        if other != fmt:
+            table_path(directory, table, other).unlink(missing_ok=True)
+
+    return WRITERS[fmt](table_path(directory, table, fmt), table)
+
+
+def write_table(records: Records, directory: Path, table: str, fmt: Optional[str] = None) -> Path:
+    """
+    Write one table in the requested format.
+
+    Args:
+        records: List of record dictionaries or an Arrow table
+        directory: Output directory
+        table: Table name
+        fmt: Output format (None = the table's default format)
+
+    Returns:
+        Path of the written file
+    """
+    with open_table_writer(directory, table, fmt) as writer:
+        writer.write(records)
+    return writer.path
+
+
+def flatten_ground_truth(ground_truth: Dict) -> List[Dict]:
+    """
+    Flatten a nested ground truth document into one row per machine/product/factory.
+
+    Args:
+        ground_truth: Output of generate_ground_truth
+
+    Returns:
+        List of rows matching SCHEMAS["truth"]
+    """
+    date = datetime.strptime(ground_truth["date"], "%Y-%m-%d").date()
+    rows = []
+
+    for dimension, key, metrics in (
+        [("machine", k, v) for k, v in ground_truth["by_machine"].items()]
+        + [("product", k, v) for k, v in ground_truth["by_product"].items()]
+        + [("factory", "total", {"batches": ground_truth["total_batches"], **ground_truth["factory_totals"]})]
+    ):
+        rows.append({
+            "date": date,
+            "dimension": dimension,
+            "key": key,
+            "batches": metrics["batches"],
+            "units_produced": metrics["units_produced"],
+            "units_defective": metrics["units_defective"],
+            "energy_consumed_kwh": metrics.get("energy_consumed_kwh")
+        })
+
+    return rows
+
+
+def read_table_frame(path: Path) -> pd.DataFrame:
+    """
+    Read a table file of any supported format into a DataFrame.
+
+    Args:
+        path: File written by write_table
+
+    Returns:
+        DataFrame (empty if the file has no rows); vocabulary columns are
+        Categorical in every format
+    """
+    if path.stat().st_size == 0:
+        return pd.DataFrame()
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    if path.suffix == ".arrow":
+        return pd.read_feather(path)
+    if path.suffix == ".json":
+        with open(path) as f:
+            frame = pd.DataFrame(json.load(f))
+    else:
+        frame = pd.read_csv(path)
+
+    for column in VOCABULARIES:
+        if column in frame.columns:
+            frame[column] = frame[column].astype("category")
+    return frame
@@ -0,0 +1,379 @@
+"""
+Discrete-event simulation of material flow between machines.
+
+The python and numpy engines draw each machine's batches independently. This
+engine instead drives batch starts and ends from material availability:
+every machine pulls its input_product from a buffer and pushes its
+output_product into one, so an assembler cannot build gears until smelters
+have made the plates (PRODUCTS input_ratio: 2 plates -> 1 gear).
+
+Model:
+- Buffers are scoped per (factory_id, line_id) and product. A product no
+  machine in the scope produces (e.g. Iron Ore) is an unlimited source; a
+  product no machine in the scope consumes (e.g. Gear Wheel) goes to an
+  unlimited sink.
+- A machine needs input_ratio x planned units in its input buffer to start a
+  batch. Otherwise it is starved and waits until a producer deposits.
+- A finished batch is deposited in the output buffer. If that would exceed
+  the buffer capacity the machine is blocked until a consumer makes room.
+- Machines run only during OPERATING_HOURS (a batch started before closing
+  finishes after it), with 5-20 minute changeovers and at most
+  BATCHES_PER_DAY_RANGE batches a day. A machine still blocked at closing is
+  off overnight and blocked again from opening until its batch fits.
+
+Events live in a heapq priority queue keyed by (time, sequence), so the loop
+handles each event in O(log n) and simulations are deterministic for a given
+seed. Time each machine spends busy, starved, blocked and idle is tracked to
+find the bottleneck.
+
+Usage:
+    python -m data_generators.simulation --days 30              # default factory
+    python -m data_generators.simulation --days 365 --config configs/factory_scale.yaml
+"""
+import argparse
+import heapq
+import random
+import time
+from collections import deque
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, List, Optional
+
+from data_generators.config import (
+    MACHINES, PRODUCTS, START_DATE, RANDOM_SEED, OPERATING_HOURS, BATCHES_PER_DAY_RANGE, CHAOS_CONFIG
+)
+from data_generators.factory_config import apply_factory_config_file
+
+# Units a buffer holds before its producers block
+DEFAULT_BUFFER_CAPACITY = 1000
+
+# Units in every intermediate buffer when the simulation starts
+DEFAULT_INITIAL_STOCK = 0
+
+# Days simulated ahead of a generated day so it opens with the buffers a
+# previous day left behind instead of empty ones
+WARMUP_DAYS = 1
+
+# Changeover between batches (minutes), as in generate_production_batches
+GAP_MINUTES = (5, 20)
+
+# Event kinds, in tie-break order at equal times: free buffer room and
+# output before machines try to start
+DEPOSIT, OPEN, START = 0, 1, 2
+
+STATES = ("busy", "starved", "blocked", "idle", "off")
+
+
+def input_ratios() -> Dict[str, float]:
+    """Units of input consumed per unit of each product (PRODUCTS input_ratio, default 1)."""
+    return {p["canonical_name"]: p.get("input_ratio", 1) for p in PRODUCTS}
+
+
+def simulate(start_date: date_type, days: int = 1, machines: Optional[List[Dict]] = None,
+             seed: int = RANDOM_SEED, buffer_capacity: int = DEFAULT_BUFFER_CAPACITY,
+             initial_stock: int = DEFAULT_INITIAL_STOCK) -> Dict:
+    """
+    Run the material-flow simulation over consecutive days.
+
+    Buffers carry over from one day to the next.
+
+    Args:
+        start_date: First simulated day
+        days: Number of days
+        machines: Machine configurations (default = config.MACHINES)
+        seed: Random seed
+        buffer_capacity: Units a buffer holds before producers block
+        initial_stock: Starting units in buffers fed by other machines
+
+    Returns:
+        {"batches": {machine_id: [batch, ...]}, "machines": {machine_id: hours
+        per state, batches, units, utilization and active_utilization},
+        "buffers": {name: level
+        stats}, "events": events processed}
+    """
+    machines = MACHINES if machines is None else machines
+    rng = random.Random(seed)
+    ratios = input_ratios()
+
+    # Buffers: one per (factory, line) scope and product some machine produces or consumes
+    def scope(machine):
+        return machine.get("factory_id"), machine.get("line_id")
+
+    produced = {(scope(m), m["output_product"]) for m in machines}
+    consumed = {(scope(m), m.get("input_product")) for m in machines}
+    buffer_keys = sorted(produced | consumed, key=str)
+    buffer_index = {key: i for i, key in enumerate(buffer_keys)}
+
+    unlimited_source = [key not in produced for key in buffer_keys]
+    unlimited_sink = [key not in consumed for key in buffer_keys]
+    level = [0 if unlimited_source[i] or unlimited_sink[i] else initial_stock for i in range(len(buffer_keys))]
+    peak_level = list(level)
+    starved_queue = [deque() for _ in buffer_keys]
+    blocked_queue = [deque() for _ in buffer_keys]
+
+    count = len(machines)
+    input_buffer = [buffer_index[(scope(m), m.get("input_product"))] for m in machines]
+    output_buffer = [buffer_index[(scope(m), m["output_product"])] for m in machines]
+    ratio = [ratios.get(m["output_product"], 1) for m in machines]
+
+    batches = [[] for _ in range(count)]
+    state = ["off"] * count
+    state_since = [0.0] * count
+    state_minutes = [dict.fromkeys(STATES, 0.0) for _ in range(count)]
+    waiting = [False] * count    # queued on a starved buffer
+    plan = [None] * count        # (duration, units) of the batch waiting for input
+    holding = [None] * count     # batch running or waiting for room in its output buffer
+    machine_day = [0] * count
+    batches_today = [0] * count
+    batch_limit = [0] * count
+    efficiency = [0.0] * count
+
+    origin = datetime.combine(start_date, datetime.min.time())
+    open_minute = OPERATING_HOURS["start"] * 60
+    close_minute = OPERATING_HOURS["end"] * 60
+    base_defect_rate = CHAOS_CONFIG["base_defect_rate"]
+    defect_variance = CHAOS_CONFIG["defect_rate_variance"]
+
+    events = []
+    sequence = 0
+
+    def push(minute: float, kind: int, machine: int, day: int = 0):
+        nonlocal sequence
+        sequence += 1
+        heapq.heappush(events, (minute, kind, sequence, machine, day))
+
+    def set_state(machine: int, new_state: str, minute: float):
+        state_minutes[machine][state[machine]] += minute - state_since[machine]
+        state[machine] = new_state
+        state_since[machine] = minute
+
+    for machine in range(count):
+        push(open_minute, OPEN, machine, 0)
+
+    processed = 0
+    while events:
+        minute, kind, _, machine, day = heapq.heappop(events)
+        processed += 1
+
+        if kind == OPEN:
+            # New day: degrade efficiency, draw the batch limit, start if free
+            machine_config = machines[machine]
+            days_elapsed = ((start_date + timedelta(days=day)) - START_DATE).days
+            degraded = machine_config["base_efficiency"] - machine_config["degradation_rate"] * days_elapsed
+            efficiency[machine] = max(0.5, min(1.0, degraded + rng.uniform(-0.01, 0.01)))
+            batch_limit[machine] = rng.randint(*BATCHES_PER_DAY_RANGE)
+            batches_today[machine] = 0
+            machine_day[machine] = day
+            if state[machine] == "off":
+                if holding[machine] is not None:
+                    # Still waiting overnight for room in its output buffer
+                    set_state(machine, "blocked", minute)
+                    push(day * 1440 + close_minute, START, machine)
+                else:
+                    set_state(machine, "idle", minute)
+                    push(minute, START, machine)
+            if day + 1 < days:
+                push((day + 1) * 1440 + open_minute, OPEN, machine, day + 1)
+
+        elif kind == START:
+            closing = machine_day[machine] * 1440 + close_minute
+            if holding[machine] is not None:
+                # Blocked at closing: off until the next OPEN event
+                if state[machine] == "blocked" and minute >= closing:
+                    set_state(machine, "off", minute)
+                continue
+            if state[machine] == "off":
+                continue
+            source = input_buffer[machine]
+            if minute >= closing or batches_today[machine] >= batch_limit[machine]:
+                # Done for the day; the next OPEN event restarts the machine
+                set_state(machine, "off", minute)
+                plan[machine] = None
+                if waiting[machine]:
+                    starved_queue[source].remove(machine)
+                    waiting[machine] = False
+                continue
+
+            if plan[machine] is None:
+                low, high = machines[machine]["typical_batch_minutes"]
+                duration = rng.randint(low, high)
+                expected = int(machines[machine]["base_output_rate"] * duration / 60 * efficiency[machine])
+                plan[machine] = (duration, max(1, expected + rng.randint(-5, 5)))
+            duration, units = plan[machine]
+
+            if not unlimited_source[source]:
+                needed = units * ratio[machine]
+                if level[source] < needed:
+                    if not waiting[machine]:
+                        starved_queue[source].append(machine)
+                        waiting[machine] = True
+                    if state[machine] != "starved":
+                        set_state(machine, "starved", minute)
+                        push(closing, START, machine)
+                    continue
+                level[source] -= needed
+                while blocked_queue[source]:
+                    push(minute, DEPOSIT, blocked_queue[source].popleft())
+
+            set_state(machine, "busy", minute)
+            plan[machine] = None
+            batches_today[machine] += 1
+            defect_rate = max(0.0, min(1.0, base_defect_rate + rng.uniform(-defect_variance, defect_variance)))
+            holding[machine] = (minute, duration, units, int(units * defect_rate))
+
+            machine_config = machines[machine]
+            batch_date = start_date + timedelta(days=machine_day[machine])
+            batches[machine].append({
+                "batch_id": f"{machine_config['machine_id']}_{batch_date.strftime('%Y%m%d')}_{batches_today[machine]:03d}",
+                "machine_id": machine_config["machine_id"],
+                "product_name": machine_config["output_product"],
+                "start_time": origin + timedelta(minutes=minute),
+                "end_time": origin + timedelta(minutes=minute + duration),
+                "units_produced": units,
+                "units_defective": holding[machine][3],
+                "efficiency_actual": round(efficiency[machine], 4),
+                "energy_consumed_kwh": round(units * machine_config["energy_per_unit"], 2)
+            })
+            push(minute + duration, DEPOSIT, machine)
+
+        else:
+            # Batch finished (or retrying): move its units to the output buffer
+            units = holding[machine][2]
+            target = output_buffer[machine]
+            if not unlimited_sink[target]:
+                if level[target] + units > buffer_capacity:
+                    closing = machine_day[machine] * 1440 + close_minute
+                    if minute >= closing:
+                        if state[machine] != "off":
+                            set_state(machine, "off", minute)
+                    elif state[machine] != "blocked":
+                        set_state(machine, "blocked", minute)
+                        push(closing, START, machine)
+                    blocked_queue[target].append(machine)
+                    continue
+                level[target] += units
+                peak_level[target] = max(peak_level[target], level[target])
+                while starved_queue[target]:
+                    consumer = starved_queue[target].popleft()
+                    waiting[consumer] = False
+                    push(minute, START, consumer)
+
+            holding[machine] = None
+            set_state(machine, "idle", minute)
+            push(minute + rng.randint(*GAP_MINUTES), START, machine)
+
+    # Close the books at the end of the horizon (or the last event after it)
+    end_minute = max([days * 1440] + state_since)
+    open_minutes = days * (close_minute - open_minute)
+    machine_stats = {}
+    for machine in range(count):
+        set_state(machine, state[machine], end_minute)
+        minutes = state_minutes[machine]
+        active_minutes = sum(minutes.values()) - minutes["off"]
+        machine_stats[machines[machine]["machine_id"]] = {
+            **{f"{name}_hours": round(value / 60, 2) for name, value in state_minutes[machine].items()},
+            "batches": len(batches[machine]),
+            "units_produced": sum(b["units_produced"] for b in batches[machine]),
+            "utilization": round(minutes["busy"] / open_minutes, 4) if open_minutes else 0.0,
+            # Busy share of the time the machine is not off (the bottleneck metric)
+            "active_utilization": round(minutes["busy"] / active_minutes, 4) if active_minutes else 0.0
+        }
+
+    buffer_stats = {}
+    for i, (buffer_scope, product) in enumerate(buffer_keys):
+        if unlimited_source[i] or unlimited_sink[i]:
+            continue
+        name = "/".join(part for part in buffer_scope if part)
+        buffer_stats[f"{name}:{product}" if name else product] = {
+            "final_level": level[i], "peak_level": peak_level[i], "capacity": buffer_capacity
+        }
+
+    return {
+        "batches": {machines[m]["machine_id"]: batches[m] for m in range(count)},
+        "machines": machine_stats,
+        "buffers": buffer_stats,
+        "events": processed
+    }
+
+
+def simulate_day(date: date_type, machines: Optional[List[Dict]] = None, seed: int = RANDOM_SEED,
+                 warmup_days: int = WARMUP_DAYS) -> Dict[str, List[Dict]]:
+    """
+    Simulate one day's batches, starting from carried-over buffer levels.
+
+    The simulation starts warmup_days before the date and only the date's
+    batches are kept, so plates left over from the previous day feed the
+    first assemblies instead of every day opening starved. The warm-up days
+    are simulated afresh from the seed (they are not the generated previous
+    days), which keeps each day independent of which others were generated.
+
+    Args:
+        date: Production date
+        machines: Machine configurations (default = config.MACHINES)
+        seed: Random seed
+        warmup_days: Days simulated before the date
+
+    Returns:
+        {machine_id: [batch, ...]} for batches started on the date
+    """
+    result = simulate(date - timedelta(days=warmup_days), warmup_days + 1, machines, seed)
+    return {
+        machine_id: [batch for batch in batches if batch["start_time"].date() == date]
+        for machine_id, batches in result["batches"].items()
+    }
+
+
+def bottleneck(machine_stats: Dict) -> Optional[str]:
+    """
+    Return the machine constraining throughput.
+
+    The bottleneck is the machine that is busy the largest share of the time
+    it is not off (active_utilization); machines starved or blocked by it
+    show lower shares.
+    """
+    return max(machine_stats, key=lambda machine_id: machine_stats[machine_id]["active_utilization"], default=None)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run the material-flow discrete-event simulation")
+    parser.add_argument("--start", type=str, help="First day (YYYY-MM-DD); default is START_DATE")
+    parser.add_argument("--days", type=int, default=7, help="Days to simulate (buffers carry over)")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="Random seed")
+    parser.add_argument("--buffer-capacity", type=int, default=DEFAULT_BUFFER_CAPACITY,
+                        help="Units a buffer holds before producers block")
+    parser.add_argument("--initial-stock", type=int, default=DEFAULT_INITIAL_STOCK,
+                        help="Starting units in intermediate buffers")
+    parser.add_argument("--config", type=str, help="Factory config file (YAML/TOML) to scale out machines")
+    parser.add_argument("--top", type=int, default=10, help="Machines to list")
+    args = parser.parse_args()
+
+    if args.config:
+        apply_factory_config_file(args.config)
+
+    start = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else START_DATE
+    started = time.perf_counter()
+    result = simulate(start, args.days, seed=args.seed, buffer_capacity=args.buffer_capacity,
+                      initial_stock=args.initial_stock)
+    elapsed = time.perf_counter() - started
+
+    total_batches = sum(len(b) for b in result["batches"].values())
+    print(f"[OK] Simulated {len(MACHINES)} machines over {args.days} day(s): {total_batches:,} batches, "
+          f"{result['events']:,} events in {elapsed:.2f}s ({result['events'] / elapsed * 60:,.0f} events/min)")
+
+    # Ranked by the bottleneck metric: busy share of the time not off
+    print(f"\n{'machine':<28} {'active':>6} {'util':>6} {'busy h':>8} {'starved h':>10} {'blocked h':>10} {'units':>10}")
+    ranked = sorted(result["machines"].items(), key=lambda item: -item[1]["active_utilization"])
+    for machine_id, stats in ranked[:args.top]:
+        print(f"{machine_id:<28} {stats['active_utilization']:>6.1%} {stats['utilization']:>6.1%} {stats['busy_hours']:>8.1f} "
+              f"{stats['starved_hours']:>10.1f} {stats['blocked_hours']:>10.1f} {stats['units_produced']:>10,}")
+
+    if result["buffers"]:
+        print(f"\n{'buffer':<36} {'final':>8} {'peak':>8}")
+        for name, stats in list(result["buffers"].items())[:args.top]:
+            print(f"{name:<36} {stats['final_level']:>8,} {stats['peak_level']:>8,}")
+
+    print(f"\n[OK] Bottleneck (busy share of non-off time): {bottleneck(result['machines'])}")
+
+
+if __name__ == "__main__":
+    main()
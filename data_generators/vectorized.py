@@ -0,0 +1,320 @@
+"""
+Array-backed generation engine.
+
+Draws every random quantity for a machine's day in bulk with a seeded
+``numpy.random.Generator`` instead of calling ``random`` once per value.
+Batches are held as columns (one NumPy array per field) and only turned
+into the record dictionaries used by the rest of the pipeline on demand.
+
+Each machine draws from its own generator (see generate_machine_columns),
+so adding, removing or reordering machines leaves the other machines'
+output unchanged, as in the Python engine.
+"""
+from datetime import date as date_type, datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+
+from data_generators.config import RANDOM_SEED, OPERATING_HOURS, BATCHES_PER_DAY_RANGE, SENSOR_RANGES
+from data_generators.vocabulary import machine_id_vocabulary, encode
+from data_generators.chaos_injectors import (
+    inject_null_array, inject_timestamp_drift_array, calculate_defect_rate_array,
+    add_measurement_noise_array, calculate_degraded_efficiency_array,
+    inject_product_name_variation_array, should_duplicate_array
+)
+
+EPOCH = datetime(1970, 1, 1)
+
+# Sensor value columns that can be null; each has a matching "<name>_valid" mask
+SENSOR_VALUE_COLUMNS = ("temperature", "pressure", "energy_kwh", "efficiency_percent")
+
+
+def make_rng(date: date_type, seed: int = RANDOM_SEED) -> np.random.Generator:
+    """
+    Create the random generator for a production date.
+
+    Args:
+        date: Production date
+        seed: Global seed
+
+    Returns:
+        Generator seeded from (seed, date)
+    """
+    return np.random.default_rng([seed, date.toordinal()])
+
+
+def to_epoch_seconds(timestamp: datetime) -> int:
+    """Convert a naive (UTC) datetime to integer epoch seconds."""
+    return int((timestamp - EPOCH).total_seconds())
+
+
+def generate_production_batches_vectorized(
+    date: date_type, machines: List[Dict], days_elapsed: int, rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Generate production batches for all machines on a given date in one shot.
+
+    Every machine gets a row of ``BATCHES_PER_DAY_RANGE[1]`` candidate batches;
+    start times are the cumulative sum of duration + gap along each row, and
+    candidates past the drawn batch count or the operating-hours cutoff are
+    masked out.
+
+    Args:
+        date: Production date
+        machines: Machine configurations
+        days_elapsed: Days since START_DATE (for degradation calc)
+        rng: Seeded random generator
+
+    Returns:
+        Dictionary of equal-length column arrays, ordered by machine then batch
+    """
+    num_machines = len(machines)
+    max_batches = BATCHES_PER_DAY_RANGE[1]
+    shape = (num_machines, max_batches)
+
+    base_efficiency = np.array([m["base_efficiency"] for m in machines])
+    degradation_rate = np.array([m["degradation_rate"] for m in machines])
+    base_output_rate = np.array([m["base_output_rate"] for m in machines])
+    energy_per_unit = np.array([m["energy_per_unit"] for m in machines])
+    min_duration = np.array([m["typical_batch_minutes"][0] for m in machines])
+    max_duration = np.array([m["typical_batch_minutes"][1] for m in machines])
+
+    # Current efficiency (with degradation), one per machine
+    efficiency = calculate_degraded_efficiency_array(base_efficiency, degradation_rate, days_elapsed, rng)
+
+    num_batches = rng.integers(*BATCHES_PER_DAY_RANGE, size=num_machines, endpoint=True)
+    durations = rng.integers(min_duration[:, None], max_duration[:, None], size=shape, endpoint=True)
+    gaps = rng.integers(5, 20, size=shape, endpoint=True)
+    unit_variance = rng.integers(-5, 5, size=shape, endpoint=True)
+
+    defect_rates = calculate_defect_rate_array(shape, rng)
+
+    # Start offsets (minutes after opening) are the running total of previous duration + gap
+    steps = durations + gaps
+    start_offsets = np.cumsum(steps, axis=1) - steps
+
+    # Keep drawn batches that start before closing time
+    operating_minutes = (OPERATING_HOURS["end"] - OPERATING_HOURS["start"]) * 60
+    batch_index = np.arange(max_batches)
+    keep = (batch_index < num_batches[:, None]) & (start_offsets < operating_minutes)
+
+    machine_index = np.broadcast_to(np.arange(num_machines)[:, None], shape)[keep]
+    durations = durations[keep]
+    start_offsets = start_offsets[keep]
+
+    # Calculate production
+    batch_efficiency = efficiency[machine_index]
+    expected_units = np.floor(base_output_rate[machine_index] * (durations / 60) * batch_efficiency).astype(np.int64)
+    units_produced = np.maximum(1, expected_units + unit_variance[keep])
+    units_defective = np.floor(units_produced * defect_rates[keep]).astype(np.int64)
+
+    opening = to_epoch_seconds(datetime.combine(date, datetime.min.time())) + OPERATING_HOURS["start"] * 3600
+    start_time = opening + start_offsets.astype(np.int64) * 60
+    end_time = start_time + durations.astype(np.int64) * 60
+
+    return {
+        "machine_index": machine_index.astype(np.int32),
+        "batch_num": (batch_index[None, :].repeat(num_machines, axis=0)[keep] + 1).astype(np.int32),
+        "start_time": start_time,
+        "end_time": end_time,
+        "units_produced": units_produced,
+        "units_defective": units_defective,
+        "efficiency_actual": np.round(batch_efficiency, 4),
+        "energy_consumed_kwh": np.round(units_produced * energy_per_unit[machine_index], 2),
+    }
+
+
+def batch_columns_to_records(columns: Dict[str, np.ndarray], machines: List[Dict], date: date_type) -> List[Dict]:
+    """
+    Convert batch columns into the record dictionaries produced by the Python engine.
+
+    Args:
+        columns: Output of generate_production_batches_vectorized
+        machines: Machine configurations (same order as used for generation)
+        date: Production date
+
+    Returns:
+        List of batch dictionaries
+    """
+    date_tag = date.strftime("%Y%m%d")
+    starts = columns["start_time"].astype("datetime64[s]").tolist()
+    ends = columns["end_time"].astype("datetime64[s]").tolist()
+
+    records = []
+    for i, idx in enumerate(columns["machine_index"].tolist()):
+        machine = machines[idx]
+        records.append({
+            "batch_id": f"{machine['machine_id']}_{date_tag}_{int(columns['batch_num'][i]):03d}",
+            "machine_id": machine["machine_id"],
+            "product_name": machine["output_product"],
+            "start_time": starts[i],
+            "end_time": ends[i],
+            "units_produced": int(columns["units_produced"][i]),
+            "units_defective": int(columns["units_defective"][i]),
+            "efficiency_actual": float(columns["efficiency_actual"][i]),
+            "energy_consumed_kwh": float(columns["energy_consumed_kwh"][i])
+        })
+    return records
+
+
+def batch_columns_to_arrow(
+    columns: Dict[str, np.ndarray], machines: List[Dict], date: date_type, rng: np.random.Generator
+) -> pa.Table:
+    """
+    Build the chaotic production_batches table straight from batch columns.
+
+    Product name variations and duplicates are applied to whole columns
+    (see apply_chaos_to_batches for the per-record version); each duplicate
+    directly follows its original.
+
+    Args:
+        columns: Output of generate_production_batches_vectorized
+        machines: Machine configurations (same order as used for generation)
+        date: Production date
+        rng: Seeded random generator
+
+    Returns:
+        Arrow table with the production_batches columns
+    """
+    machine_index = columns["machine_index"]
+    machine_ids = np.array([m["machine_id"] for m in machines], dtype=object)[machine_index]
+    products = np.array([m["output_product"] for m in machines], dtype=object)[machine_index]
+
+    batch_numbers = np.char.zfill(columns["batch_num"].astype(str), 3)
+    batch_ids = np.char.add(np.char.add(machine_ids.astype(str), f"_{date.strftime('%Y%m%d')}_"), batch_numbers)
+
+    product_names = inject_product_name_variation_array(products, rng)
+    rows = np.repeat(np.arange(len(machine_index)), 1 + should_duplicate_array(len(machine_index), rng))
+
+    return pa.table({
+        "batch_id": pa.array(batch_ids),
+        "machine_id": pa.DictionaryArray.from_arrays(machine_index.astype(np.int32), machine_id_vocabulary()),
+        "product_name": encode(product_names, "product_name"),
+        "start_time": pa.array(columns["start_time"].astype("datetime64[s]")),
+        "end_time": pa.array(columns["end_time"].astype("datetime64[s]")),
+        "units_produced": pa.array(columns["units_produced"]),
+        "units_defective": pa.array(columns["units_defective"])
+    }).take(pa.array(rows))
+
+
+def generate_sensor_logs_columnar(
+    batch_columns: Dict[str, np.ndarray], machines: List[Dict], rng: np.random.Generator
+) -> Dict[str, np.ndarray]:
+    """
+    Generate sensor logs for production batches as columns.
+
+    Readings are laid out flat (3-5 per batch, in batch order). Nulls are not
+    materialized: each value column has a boolean "<name>_valid" mask, and
+    timestamp drift is applied as a single vector of minute offsets.
+
+    Args:
+        batch_columns: Output of generate_production_batches_vectorized
+        machines: Machine configurations (same order as used for generation)
+        rng: Seeded random generator
+
+    Returns:
+        Dictionary of equal-length column arrays (machine_index, timestamp as
+        datetime64[us], the value columns and their validity masks)
+    """
+    num_batches = len(batch_columns["start_time"])
+
+    # Generate 3-5 sensor readings per batch
+    readings_per_batch = rng.integers(3, 5, size=num_batches, endpoint=True)
+    batch_of_reading = np.repeat(np.arange(num_batches), readings_per_batch)
+    first_reading = np.cumsum(readings_per_batch) - readings_per_batch
+    reading_num = np.arange(len(batch_of_reading)) - first_reading[batch_of_reading]
+    num_readings = len(batch_of_reading)
+
+    # Readings are evenly spaced through the batch, then drifted for chaos
+    start_us = batch_columns["start_time"].astype(np.int64) * 1_000_000
+    duration_us = (batch_columns["end_time"] - batch_columns["start_time"]).astype(np.int64) * 1_000_000
+    interval_us = duration_us / readings_per_batch
+    reading_us = start_us[batch_of_reading] + np.round(reading_num * interval_us[batch_of_reading]).astype(np.int64)
+    timestamps = inject_timestamp_drift_array(reading_us.astype("datetime64[us]"), rng)
+
+    # Per-type value ranges, looked up through each reading's machine
+    machine_index = batch_columns["machine_index"][batch_of_reading]
+    type_ranges = [SENSOR_RANGES.get(m["machine_type"], SENSOR_RANGES["Assembler"]) for m in machines]
+    temp_low = np.array([r["temperature"][0] for r in type_ranges])[machine_index]
+    temp_high = np.array([r["temperature"][1] for r in type_ranges])[machine_index]
+    pressure_low = np.array([r["pressure"][0] for r in type_ranges])[machine_index]
+    pressure_high = np.array([r["pressure"][1] for r in type_ranges])[machine_index]
+
+    # Draw values with measurement noise (3% temperature, 2% pressure)
+    temperature = add_measurement_noise_array(rng.uniform(temp_low, temp_high), rng, 0.03)
+    pressure = add_measurement_noise_array(rng.uniform(pressure_low, pressure_high), rng, 0.02)
+
+    columns = {
+        "machine_index": machine_index.astype(np.int16),
+        "timestamp": timestamps,
+        "temperature": np.round(temperature, 2),
+        "pressure": np.round(pressure, 3),
+        "energy_kwh": np.round(rng.uniform(5, 15, num_readings), 2),
+        "efficiency_percent": np.round(batch_columns["efficiency_actual"][batch_of_reading] * 100, 2),
+    }
+
+    # One draw decides nulls for every value column
+    valid = inject_null_array((len(SENSOR_VALUE_COLUMNS), num_readings), rng)
+    for i, name in enumerate(SENSOR_VALUE_COLUMNS):
+        columns[f"{name}_valid"] = valid[i]
+
+    return columns
+
+
+def concat_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate column dictionaries with the same keys."""
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def generate_machine_columns(
+    date: date_type, machines: List[Dict], days_elapsed: int, rngs: List[np.random.Generator]
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray], pa.Table]:
+    """
+    Generate a day's batches, sensor logs and chaotic batch rows machine by machine.
+
+    Every machine's draws come from its own generator, in a fixed order
+    (batches, sensor logs, batch chaos), and the results are concatenated in
+    machine order.
+
+    Args:
+        date: Production date
+        machines: Machine configurations
+        days_elapsed: Days since START_DATE (for degradation calc)
+        rngs: One seeded generator per machine
+
+    Returns:
+        (batch columns, sensor columns, production_batches table); machine_index
+        columns index into `machines`
+    """
+    batch_parts, sensor_parts, tables = [], [], []
+    for index, (machine, rng) in enumerate(zip(machines, rngs)):
+        columns = generate_production_batches_vectorized(date, [machine], days_elapsed, rng)
+        columns["machine_index"] += index
+        batch_parts.append(columns)
+        sensor_parts.append(generate_sensor_logs_columnar(columns, machines, rng))
+        tables.append(batch_columns_to_arrow(columns, machines, date, rng))
+    return concat_columns(batch_parts), concat_columns(sensor_parts), pa.concat_tables(tables)
+
+
+def sensor_columns_to_arrow(columns: Dict[str, np.ndarray], machines: List[Dict]) -> pa.Table:
+    """
+    Convert sensor columns into an Arrow table without building per-reading objects.
+
+    Validity masks become Arrow null bitmaps; machine indexes are already the
+    machine_id vocabulary codes.
+
+    Args:
+        columns: Output of generate_sensor_logs_columnar
+        machines: Machine configurations (same order as used for generation)
+
+    Returns:
+        Arrow table with the sensor_logs columns
+    """
+    data = {
+        "machine_id": pa.DictionaryArray.from_arrays(columns["machine_index"].astype(np.int32), machine_id_vocabulary()),
+        "timestamp": pa.array(columns["timestamp"])
+    }
+    for name in SENSOR_VALUE_COLUMNS:
+        data[name] = pa.array(columns[name], mask=~columns[f"{name}_valid"])
+    return pa.table(data)
@@ -0,0 +1,89 @@
+"""
+Shared dictionaries for the low-cardinality chaos columns.
+
+Product names and machine IDs in raw data are drawn from tiny vocabularies
+(the canonical values plus their CHAOS_CONFIG variations). Columnar data
+stores them as small integer codes into one shared dictionary per column, so
+Arrow tables hold an int32 per value, Parquet writes a single dictionary page
+per column chunk, pandas reads them back as Categorical, and distinct counts
+are taken on codes.
+
+Canonical values come first, in config order: a machine's code is its index
+in MACHINES and a product's its index in PRODUCTS.
+"""
+from typing import Iterable, List
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from data_generators.config import MACHINES, PRODUCTS, CHAOS_CONFIG
+
+# Arrow type of the encoded columns
+CODE_TYPE = pa.int32()
+DICTIONARY_TYPE = pa.dictionary(CODE_TYPE, pa.string())
+
+
+def build_vocabulary(values: Iterable[str]) -> pa.Array:
+    """Return the distinct values in first-seen order as an Arrow string array."""
+    return pa.array(list(dict.fromkeys(values)), pa.string())
+
+
+def product_name_vocabulary() -> pa.Array:
+    """Canonical product names followed by every configured variation."""
+    canonical = [p["canonical_name"] for p in PRODUCTS]
+    variations = [v for names in CHAOS_CONFIG["product_name_variations"].values() for v in names]
+    return build_vocabulary(canonical + variations)
+
+
+def machine_id_vocabulary() -> pa.Array:
+    """Canonical machine IDs followed by every configured variation."""
+    canonical = [m["machine_id"] for m in MACHINES]
+    variations = [v for ids in CHAOS_CONFIG["machine_id_variations"].values() for v in ids]
+    return build_vocabulary(canonical + variations)
+
+
+# Column name -> vocabulary builder
+VOCABULARIES = {
+    "product_name": product_name_vocabulary,
+    "machine_id": machine_id_vocabulary
+}
+
+
+def encode(values, column: str) -> pa.DictionaryArray:
+    """
+    Encode a column against its shared vocabulary.
+
+    Args:
+        values: Strings (list, numpy array or Arrow array)
+        column: "product_name" or "machine_id"
+
+    Returns:
+        Dictionary array whose dictionary is the full shared vocabulary
+
+    Raises:
+        ValueError: If a value is not in the vocabulary (it would otherwise
+            be silently nulled)
+    """
+    vocabulary = VOCABULARIES[column]()
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if isinstance(values, pa.DictionaryArray):
+        values = values.dictionary_decode()
+    if not isinstance(values, pa.Array):
+        values = pa.array(values.tolist() if isinstance(values, np.ndarray) else values, pa.string())
+
+    codes = pc.index_in(values, value_set=vocabulary)
+    unknown = pc.and_(pc.is_null(codes), pc.is_valid(values))
+    if pc.any(unknown).as_py():
+        sample = values.filter(unknown)[0].as_py()
+        raise ValueError(f"{column} value {sample!r} is not in the configured vocabulary")
+
+    return pa.DictionaryArray.from_arrays(codes.cast(CODE_TYPE), vocabulary)
+
+
+def distinct_codes(values, column: str) -> List[int]:
+    """Return the distinct vocabulary codes present in a column (nulls excluded)."""
+    codes = encode(values, column).indices
+    return np.unique(codes.drop_null().to_numpy()).tolist()
+
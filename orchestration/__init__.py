@@ -0,0 +1,3 @@
+"""
+Warehouse orchestration: database setup and pipeline stages.
+"""
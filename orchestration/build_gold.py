@@ -0,0 +1,288 @@
+"""
+Build the gold layer: daily machine and product KPIs.
+
+gold.machine_daily_kpis has one row per production date and machine:
+batches, units, defects, metered energy, average efficiency, OEE
+(availability x performance x quality) and QC pass rate.
+gold.product_daily_kpis rolls the same figures up per product.
+
+Refreshes are incremental per date partition. Every silver build records
+the production dates it touched in silver._changed_dates; a gold refresh
+recomputes only the dates recorded since the previous refresh
+(gold._refresh_state), replacing their rows in one transaction. Dashboards
+and reports read these small tables instead of scanning history.
+
+After a refresh the refreshed dates are reconciled against
+ground_truth/<date>/truth.json (see orchestration/reconcile.py). Dates whose
+late drops have not arrived yet are expected to fall short until they do.
+
+OEE inputs:
+- availability: batch run time / planned time (OPERATING_HOURS)
+- performance: units produced / (run hours x the machine's base_output_rate)
+- quality: good units / units produced
+
+Usage:
+    python -m orchestration.build_gold             # refresh changed dates
+    python -m orchestration.build_gold --full      # recompute every date
+"""
+import argparse
+import time
+from datetime import date as date_type, datetime
+from pathlib import Path
+from typing import List
+
+import duckdb
+import pyarrow as pa
+
+from data_generators.config import MACHINES, OPERATING_HOURS
+from orchestration.init_database import DB_PATH
+from orchestration.build_silver import create_silver_tables
+from orchestration.reconcile import reconcile
+
+PLANNED_HOURS_PER_DAY = OPERATING_HOURS["end"] - OPERATING_HOURS["start"]
+
+
+def create_gold_tables(con):
+    """Create the gold tables if they do not exist."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS gold")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS gold.machines (
+            machine_id VARCHAR PRIMARY KEY,
+            machine_type VARCHAR,
+            factory_id VARCHAR,
+            line_id VARCHAR,
+            output_product VARCHAR,
+            base_output_rate DOUBLE
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS gold.machine_daily_kpis (
+            production_date DATE,
+            machine_id VARCHAR,
+            product_name VARCHAR,
+            batches INTEGER,
+            units_produced BIGINT,
+            units_defective BIGINT,
+            run_hours DOUBLE,
+            energy_kwh DOUBLE,
+            avg_efficiency DOUBLE,
+            availability DOUBLE,
+            performance DOUBLE,
+            quality DOUBLE,
+            oee DOUBLE,
+            qc_checks INTEGER,
+            qc_passed INTEGER,
+            qc_pass_rate DOUBLE
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS gold.product_daily_kpis (
+            production_date DATE,
+            product_name VARCHAR,
+            batches INTEGER,
+            units_produced BIGINT,
+            units_defective BIGINT,
+            defect_rate DOUBLE,
+            energy_kwh DOUBLE,
+            qc_checks INTEGER,
+            qc_passed INTEGER,
+            qc_pass_rate DOUBLE
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS gold._refresh_state (
+            layer VARCHAR PRIMARY KEY,
+            refreshed_through TIMESTAMP,
+            refreshed_at TIMESTAMP
+        )
+    """)
+
+
+def refresh_machine_dimension(con):
+    """Replace gold.machines with the configured machines."""
+    machines = pa.table({
+        "machine_id": [m["machine_id"] for m in MACHINES],
+        "machine_type": [m["machine_type"] for m in MACHINES],
+        "factory_id": [m.get("factory_id") for m in MACHINES],
+        "line_id": [m.get("line_id") for m in MACHINES],
+        "output_product": [m["output_product"] for m in MACHINES],
+        "base_output_rate": pa.array([m["base_output_rate"] for m in MACHINES], pa.float64())
+    })
+    con.register("_machines", machines)
+    con.execute("DELETE FROM gold.machines")
+    con.execute("INSERT INTO gold.machines SELECT * FROM _machines")
+    con.unregister("_machines")
+
+
+def affected_dates(con, full: bool = False) -> List[date_type]:
+    """
+    Return the production dates to refresh.
+
+    Args:
+        con: DuckDB connection
+        full: Every date in silver (plus dates gold still holds)
+
+    Returns:
+        Dates, oldest first
+    """
+    if full:
+        return [row[0] for row in con.execute("""
+            SELECT CAST(start_time AS DATE) FROM silver.production_batches
+            UNION SELECT production_date FROM gold.machine_daily_kpis
+            ORDER BY 1
+        """).fetchall()]
+
+    return [row[0] for row in con.execute("""
+        SELECT DISTINCT production_date
+        FROM silver._changed_dates
+        WHERE built_at > coalesce((SELECT refreshed_through FROM gold._refresh_state WHERE layer = 'gold'),
+                                  '-infinity'::TIMESTAMP)
+          AND production_date IS NOT NULL
+        ORDER BY 1
+    """).fetchall()]
+
+
+def refresh_dates(con, dates: List[date_type]):
+    """
+    Recompute the gold rows of the given dates.
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        dates: Production dates
+    """
+    con.register("_dates", pa.table({"production_date": pa.array(dates, pa.date32())}))
+    for table in ("machine_daily_kpis", "product_daily_kpis"):
+        con.execute(f"DELETE FROM gold.{table} WHERE production_date IN (SELECT production_date FROM _dates)")
+
+    con.execute(f"""
+        INSERT INTO gold.machine_daily_kpis
+        WITH batches AS (
+            SELECT *, CAST(start_time AS DATE) AS production_date
+            FROM silver.production_batches
+            WHERE start_time >= (SELECT min(production_date) FROM _dates)
+              AND start_time < (SELECT max(production_date) FROM _dates) + INTERVAL 1 DAY
+              AND CAST(start_time AS DATE) IN (SELECT production_date FROM _dates)
+        ),
+        sensors AS (
+            SELECT batch_id, sum(energy_kwh) AS energy_kwh,
+                   sum(efficiency_percent) AS efficiency_sum, count(efficiency_percent) AS efficiency_count
+            FROM silver.sensor_readings
+            WHERE batch_id IN (SELECT batch_id FROM batches)
+            GROUP BY batch_id
+        ),
+        qc AS (
+            SELECT batch_id, count(*) AS checks, count(*) FILTER (WHERE pass_fail = 'PASS') AS passed
+            FROM silver.qc_checks
+            WHERE batch_id IN (SELECT batch_id FROM batches)
+            GROUP BY batch_id
+        ),
+        daily AS (
+            SELECT b.production_date, b.machine_id, b.product_name,
+                   count(*) AS batches,
+                   sum(b.units_produced) AS units_produced,
+                   sum(b.units_defective) AS units_defective,
+                   sum(epoch(b.end_time - b.start_time)) / 3600.0 AS run_hours,
+                   sum(s.energy_kwh) AS energy_kwh,
+                   sum(s.efficiency_sum) / nullif(sum(s.efficiency_count), 0) / 100.0 AS avg_efficiency,
+                   coalesce(sum(q.checks), 0) AS qc_checks,
+                   coalesce(sum(q.passed), 0) AS qc_passed
+            FROM batches b
+            LEFT JOIN sensors s ON s.batch_id = b.batch_id
+            LEFT JOIN qc q ON q.batch_id = b.batch_id
+            GROUP BY ALL
+        ),
+        kpis AS (
+            SELECT d.*,
+                   least(d.run_hours / {PLANNED_HOURS_PER_DAY}, 1.0) AS availability,
+                   least(d.units_produced / nullif(d.run_hours * m.base_output_rate, 0), 1.0) AS performance,
+                   (d.units_produced - d.units_defective) / nullif(d.units_produced, 0) AS quality
+            FROM daily d
+            LEFT JOIN gold.machines m ON m.machine_id = d.machine_id
+        )
+        SELECT production_date, machine_id, product_name, batches, units_produced, units_defective,
+               run_hours, energy_kwh, avg_efficiency, availability, performance, quality,
+               availability * performance * quality AS oee,
+               qc_checks, qc_passed, qc_passed / nullif(qc_checks, 0) AS qc_pass_rate
+        FROM kpis
+    """)
+
+    con.execute("""
+        INSERT INTO gold.product_daily_kpis
+        SELECT production_date, product_name,
+               sum(batches), sum(units_produced), sum(units_defective),
+               sum(units_defective) / nullif(sum(units_produced), 0),
+               sum(energy_kwh), sum(qc_checks), sum(qc_passed),
+               sum(qc_passed) / nullif(sum(qc_checks), 0)
+        FROM gold.machine_daily_kpis
+        WHERE production_date IN (SELECT production_date FROM _dates)
+        GROUP BY ALL
+    """)
+    con.unregister("_dates")
+
+
+def refresh_gold(con, full: bool = False) -> List[date_type]:
+    """
+    Refresh the gold tables for every date changed since the last refresh.
+
+    Args:
+        con: DuckDB connection
+        full: Recompute every date
+
+    Returns:
+        Refreshed dates
+    """
+    create_silver_tables(con)
+    create_gold_tables(con)
+
+    con.begin()
+    try:
+        # Everything recorded in silver so far is covered by this refresh
+        refreshed_through = con.execute("SELECT max(built_at) FROM silver._changed_dates").fetchone()[0]
+        dates = affected_dates(con, full)
+
+        refresh_machine_dimension(con)
+        if dates:
+            refresh_dates(con, dates)
+        if refreshed_through is not None:
+            con.execute("INSERT OR REPLACE INTO gold._refresh_state VALUES ('gold', ?, ?)",
+                        [refreshed_through, datetime.utcnow()])
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+
+    return dates
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Refresh the gold KPI tables")
+    parser.add_argument("--full", action="store_true", help="Recompute every date instead of changed ones")
+    parser.add_argument("--no-check", action="store_true", help="Skip the ground truth check")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args()
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+
+    started = time.perf_counter()
+    dates = refresh_gold(con, full=args.full)
+    elapsed = time.perf_counter() - started
+
+    if dates:
+        print(f"[OK] Refreshed {len(dates)} date(s): {dates[0]} to {dates[-1]} in {elapsed:.2f}s")
+    else:
+        print(f"[OK] Gold is up to date ({elapsed:.2f}s)")
+
+    if dates and not args.no_check:
+        result = reconcile(con, dates[0], dates[-1])
+        mismatches = result[result["date"].isin(dates) & ~result["matched"]]
+        for row in mismatches.itertuples():
+            print(f"[MISMATCH] {row.date} {row.level} {row.key} {row.metric}: gold {row.gold} vs truth {row.truth}")
+        if mismatches.empty:
+            print("[OK] Refreshed dates match ground truth")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
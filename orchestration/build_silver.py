@@ -0,0 +1,587 @@
+"""
+Build the silver layer from bronze.
+
+silver.production_batches holds one row per batch_id with canonical machine
+IDs and product names (see orchestration/canonicalize.py). Builds are
+incremental: silver._build_state keeps the newest bronze _loaded_at already
+processed per table, and each build only reads bronze rows loaded after it.
+New batches are deduplicated among themselves with a window over batch_id
+and against silver through its batch_id primary key, so the cost follows
+the size of the new loads rather than the whole history. Duplicates that
+arrive days later (late drops) are caught the same way.
+
+The other silver tables normalize timestamps against the batches, in bulk
+SQL joins rather than per-row heuristics:
+
+- silver.qc_checks: a check happens shortly after its batch ends. Each
+  check is equi-joined to its batch and its timestamp is tested both as UTC
+  and as factory local time; checks that only fit as local time are shifted
+  to UTC.
+- silver.operator_logs: entries have no batch_id, so the same test is a
+  range join against the machine's batch start times.
+- silver.sensor_readings: readings drift a few minutes off the batch
+  clock. The interval index (orchestration/interval_index.py) attributes
+  each reading to its batch with ASOF joins, within a drift tolerance, and
+  readings that drifted outside the window are clamped back into it.
+
+Rows whose batch has not been loaded yet (late drops) are marked 'pending'
+and their source files are re-processed on later builds. When ingestion
+replaces or removes a raw file, the silver rows that came from it are
+rebuilt from the remaining bronze rows.
+
+Every build appends per-source-file dedup counts to silver._dedup_log, and
+the production dates of every row it deleted or inserted to
+silver._changed_dates, so downstream layers can refresh just those dates.
+
+Usage:
+    python -m orchestration.build_silver            # incremental
+    python -m orchestration.build_silver --full     # rebuild from all of bronze
+"""
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+
+from data_generators.config import CHAOS_CONFIG
+from orchestration.init_database import DB_PATH, BRONZE_COLUMNS, create_bronze_tables
+from orchestration.ingest_bronze import create_manifest_table
+from orchestration.canonicalize import refresh_mappings, mapping_table
+from orchestration.interval_index import DEFAULT_DRIFT_TOLERANCE_MINUTES, attribution_sql
+
+# QC checks happen 5-30 minutes after the batch ends (generate_qc_checks)
+QC_DELAY_MINUTES = (5, 30)
+
+# Operator entries are logged within 10 minutes of the batch start (generate_operator_logs)
+OPERATOR_LOG_WINDOW_MINUTES = 10
+
+# Slack added to every window
+WINDOW_TOLERANCE_MINUTES = 5
+
+SILVER_TABLES = ("production_batches", "qc_checks", "operator_logs", "sensor_readings")
+
+# Silver table -> bronze table it is built from
+BRONZE_SOURCES = {
+    "production_batches": "production_batches",
+    "qc_checks": "qc_checks",
+    "operator_logs": "operator_logs",
+    "sensor_readings": "sensor_logs"
+}
+
+# Silver table -> production date of a row `t` (batch start time, joined as `b` where rows carry a batch_id)
+PRODUCTION_TIMES = {
+    "production_batches": "t.start_time",
+    "qc_checks": "coalesce(b.start_time, t.check_timestamp)",
+    "operator_logs": "t.log_timestamp",
+    "sensor_readings": "coalesce(b.start_time, t.timestamp)"
+}
+
+NEW_ROWS = "_loaded_at > coalesce(?::TIMESTAMP, '-infinity'::TIMESTAMP)"
+
+
+def create_silver_tables(con):
+    """Create the silver tables and build bookkeeping if they do not exist."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS silver")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver.production_batches (
+            batch_id VARCHAR PRIMARY KEY,
+            machine_id VARCHAR,
+            product_name VARCHAR,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP,
+            units_produced INTEGER,
+            units_defective INTEGER,
+            _loaded_at TIMESTAMP,
+            _source_file VARCHAR
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver.qc_checks (
+            check_id VARCHAR,
+            batch_id VARCHAR,
+            check_timestamp TIMESTAMP,
+            check_timestamp_raw TIMESTAMP,
+            timestamp_source VARCHAR,
+            inspector_id VARCHAR,
+            pass_fail VARCHAR,
+            defect_notes VARCHAR,
+            _loaded_at TIMESTAMP,
+            _source_file VARCHAR
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver.operator_logs (
+            log_id VARCHAR,
+            machine_id VARCHAR,
+            operator_id VARCHAR,
+            log_timestamp TIMESTAMP,
+            log_timestamp_raw TIMESTAMP,
+            timestamp_source VARCHAR,
+            action VARCHAR,
+            notes VARCHAR,
+            _loaded_at TIMESTAMP,
+            _source_file VARCHAR
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver.sensor_readings (
+            machine_id VARCHAR,
+            batch_id VARCHAR,
+            timestamp TIMESTAMP,
+            timestamp_raw TIMESTAMP,
+            alignment VARCHAR,
+            temperature DOUBLE,
+            pressure DOUBLE,
+            energy_kwh DOUBLE,
+            efficiency_percent DOUBLE,
+            _loaded_at TIMESTAMP,
+            _source_file VARCHAR
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver._build_state (
+            table_name VARCHAR PRIMARY KEY,
+            watermark TIMESTAMP,
+            built_at TIMESTAMP
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver._changed_dates (
+            production_date DATE,
+            table_name VARCHAR,
+            built_at TIMESTAMP
+        )
+    """)
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver._dedup_log (
+            built_at TIMESTAMP,
+            table_name VARCHAR,
+            source_file VARCHAR,
+            rows_read BIGINT,
+            rows_kept BIGINT,
+            duplicates_in_load BIGINT,
+            duplicates_of_existing BIGINT
+        )
+    """)
+
+
+def get_build_watermark(con, table: str):
+    """Return the newest bronze _loaded_at already built into a silver table (None = never built)."""
+    row = con.execute("SELECT watermark FROM silver._build_state WHERE table_name = ?", [table]).fetchone()
+    return row[0] if row else None
+
+
+def set_build_watermark(con, table: str, built_at: datetime):
+    """Advance a silver table's watermark to the newest row of its bronze source."""
+    watermark = con.execute(f"SELECT max(_loaded_at) FROM bronze.{BRONZE_SOURCES[table]}").fetchone()[0]
+    if watermark is not None:
+        con.execute("INSERT OR REPLACE INTO silver._build_state VALUES (?, ?, ?)", [table, watermark, built_at])
+
+
+def mark_changed(con, table: str, condition: str, built_at: datetime, params: Optional[list] = None):
+    """
+    Record the production dates of silver rows about to change (or just changed).
+
+    Downstream layers (orchestration/build_gold.py) refresh only the dates
+    recorded in silver._changed_dates since their last refresh.
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        table: Silver table
+        condition: SQL condition selecting rows `t` of the table
+        built_at: Build timestamp
+        params: Parameters of the condition
+    """
+    join = "LEFT JOIN silver.production_batches b ON b.batch_id = t.batch_id" if "b." in PRODUCTION_TIMES[table] else ""
+    con.execute(f"""
+        INSERT INTO silver._changed_dates
+        SELECT DISTINCT CAST({PRODUCTION_TIMES[table]} AS DATE), '{table}', ?::TIMESTAMP
+        FROM silver.{table} t
+        {join}
+        WHERE {condition}
+    """, [built_at] + (params or []))
+
+
+def stage_files(con, table: str, watermark, built_at: datetime, pending: Optional[str] = None) -> int:
+    """
+    Stage the bronze rows a file-granular silver table must (re)build.
+
+    Source files with newly loaded rows, files that left the manifest, and
+    files holding rows matching `pending` have their silver rows deleted;
+    their current bronze rows are staged in the _stage temp table with a
+    _row number and the canonical machine ID (_machine).
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        table: Silver table
+        watermark: Table's build watermark
+        built_at: Build timestamp
+        pending: SQL condition on silver rows that should be retried
+
+    Returns:
+        Number of staged rows
+    """
+    bronze = BRONZE_SOURCES[table]
+    retry = f"OR ({pending})" if pending else ""
+
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _reopened_files AS
+        SELECT DISTINCT _source_file
+        FROM silver.{table}
+        WHERE _source_file NOT IN (SELECT source_file FROM bronze._ingest_manifest) {retry}
+    """)
+    reloaded = f"_source_file IN (SELECT DISTINCT _source_file FROM bronze.{bronze} WHERE {NEW_ROWS})"
+    mark_changed(con, table, "t._source_file IN (SELECT _source_file FROM _reopened_files)", built_at)
+    mark_changed(con, table, f"t.{reloaded}", built_at, [watermark])
+    con.execute(f"DELETE FROM silver.{table} WHERE _source_file IN (SELECT _source_file FROM _reopened_files)")
+    con.execute(f"DELETE FROM silver.{table} WHERE {reloaded}", [watermark])
+
+    if "machine_id" in BRONZE_COLUMNS[bronze]:
+        machine = "coalesce(m.canonical_value, b.machine_id)"
+        join = f"LEFT JOIN {mapping_table('machine_id')} m ON m.raw_value = b.machine_id"
+    else:
+        machine, join = "NULL", ""
+
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _stage AS
+        SELECT row_number() OVER () AS _row, b.*, {machine} AS _machine
+        FROM bronze.{bronze} b
+        {join}
+        WHERE b.{NEW_ROWS} OR b._source_file IN (SELECT _source_file FROM _reopened_files)
+    """, [watermark])
+    return con.execute("SELECT count(*) FROM _stage").fetchone()[0]
+
+
+def source_counts(con, table: str, column: str) -> Dict[str, int]:
+    """Count a silver table's rows per value of a status column."""
+    return dict(con.execute(f"SELECT {column}, count(*) FROM silver.{table} GROUP BY 1 ORDER BY 1").fetchall())
+
+
+# ============================================================================
+# PRODUCTION BATCHES
+# ============================================================================
+
+def build_production_batches(con, built_at: datetime) -> List[Dict]:
+    """
+    Merge newly loaded bronze batches into silver.production_batches.
+
+    The earliest loaded copy of a batch wins (ties broken by source file).
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        built_at: Build timestamp for the dedup log
+
+    Returns:
+        Per-source-file counts written to silver._dedup_log
+    """
+    watermark = get_build_watermark(con, "production_batches")
+
+    # Silver rows whose source file was reloaded or removed since they were built
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _reopened AS
+        SELECT batch_id
+        FROM silver.production_batches
+        WHERE _source_file IN (SELECT DISTINCT _source_file FROM bronze.production_batches WHERE {NEW_ROWS})
+           OR _source_file NOT IN (SELECT source_file FROM bronze._ingest_manifest)
+    """, [watermark])
+    mark_changed(con, "production_batches", "t.batch_id IN (SELECT batch_id FROM _reopened)", built_at)
+    con.execute("DELETE FROM silver.production_batches WHERE batch_id IN (SELECT batch_id FROM _reopened)")
+    reopened = con.execute("SELECT count(*) FROM _reopened").fetchone()[0]
+
+    # New bronze rows, plus the surviving copies of reopened batches
+    candidates = f"SELECT * FROM bronze.production_batches WHERE {NEW_ROWS}"
+    if reopened:
+        candidates += " OR batch_id IN (SELECT batch_id FROM _reopened)"
+
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _candidates AS
+        SELECT c.*,
+               row_number() OVER (PARTITION BY c.batch_id ORDER BY c._loaded_at, c._source_file) AS _copy,
+               s.batch_id IS NOT NULL AS _seen
+        FROM ({candidates}) c
+        LEFT JOIN silver.production_batches s ON s.batch_id = c.batch_id
+        WHERE c.batch_id IS NOT NULL
+    """, [watermark])
+
+    con.execute(f"""
+        INSERT INTO silver.production_batches
+        SELECT c.batch_id,
+               coalesce(m.canonical_value, c.machine_id),
+               coalesce(p.canonical_value, c.product_name),
+               c.start_time, c.end_time, c.units_produced, c.units_defective,
+               c._loaded_at, c._source_file
+        FROM _candidates c
+        LEFT JOIN {mapping_table("machine_id")} m ON m.raw_value = c.machine_id
+        LEFT JOIN {mapping_table("product_name")} p ON p.raw_value = c.product_name
+        WHERE c._copy = 1 AND NOT c._seen
+    """)
+    mark_changed(con, "production_batches",
+                 "t.batch_id IN (SELECT batch_id FROM _candidates WHERE _copy = 1 AND NOT _seen)", built_at)
+
+    log = con.execute("""
+        SELECT ?::TIMESTAMP AS built_at, 'production_batches' AS table_name, _source_file AS source_file,
+               count(*) AS rows_read,
+               count(*) FILTER (WHERE _copy = 1 AND NOT _seen) AS rows_kept,
+               count(*) FILTER (WHERE _copy > 1 AND NOT _seen) AS duplicates_in_load,
+               count(*) FILTER (WHERE _seen) AS duplicates_of_existing
+        FROM _candidates
+        GROUP BY _source_file
+        ORDER BY _source_file
+    """, [built_at]).fetchdf()
+
+    set_build_watermark(con, "production_batches", built_at)
+
+    con.register("_dedup_rows", log)
+    con.execute("INSERT INTO silver._dedup_log SELECT * FROM _dedup_rows")
+    con.unregister("_dedup_rows")
+    con.execute("DROP TABLE _candidates")
+    con.execute("DROP TABLE _reopened")
+
+    return log.to_dict("records")
+
+
+# ============================================================================
+# TIMESTAMP NORMALIZATION
+# ============================================================================
+
+def local_to_utc(column: str) -> str:
+    """SQL expression reading a timestamp column as factory local time and converting it to UTC."""
+    return f"({column} - INTERVAL ({CHAOS_CONFIG['local_utc_offset_hours']}) HOUR)"
+
+
+def timestamp_source(utc_fits: str, local_fits: str, has_reference: str = "TRUE",
+                     unmatched: str = "unresolved") -> str:
+    """
+    SQL CASE classifying a timestamp as 'utc', 'local', 'ambiguous', 'unresolved' or 'pending'.
+
+    Args:
+        utc_fits: Condition: the raw value fits the expected window as UTC
+        local_fits: Condition: it fits once converted from local time
+        has_reference: Condition: the batch data to test against exists
+        unmatched: Status when neither reading fits
+    """
+    return f"""CASE
+            WHEN NOT ({has_reference}) THEN 'pending'
+            WHEN ({utc_fits}) AND ({local_fits}) THEN 'ambiguous'
+            WHEN {utc_fits} THEN 'utc'
+            WHEN {local_fits} THEN 'local'
+            ELSE '{unmatched}'
+        END"""
+
+
+def build_qc_checks(con, built_at: datetime) -> Dict[str, int]:
+    """
+    Rebuild silver.qc_checks for new and pending source files.
+
+    Each check is joined to its batch on batch_id; a timestamp that only
+    falls inside [end_time + 5 min, end_time + 30 min] (plus tolerance) when
+    read as local time is converted to UTC.
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        built_at: Build timestamp
+
+    Returns:
+        Silver row counts per timestamp_source
+    """
+    stage_files(con, "qc_checks", get_build_watermark(con, "qc_checks"), built_at, pending="timestamp_source = 'pending'")
+
+    earliest = f"b.end_time + INTERVAL ({QC_DELAY_MINUTES[0] - WINDOW_TOLERANCE_MINUTES}) MINUTE"
+    latest = f"b.end_time + INTERVAL ({QC_DELAY_MINUTES[1] + WINDOW_TOLERANCE_MINUTES}) MINUTE"
+    source = timestamp_source(
+        f"q.check_timestamp BETWEEN {earliest} AND {latest}",
+        f"{local_to_utc('q.check_timestamp')} BETWEEN {earliest} AND {latest}",
+        "b.batch_id IS NOT NULL"
+    )
+
+    con.execute(f"""
+        INSERT INTO silver.qc_checks
+        SELECT check_id, batch_id,
+               CASE WHEN timestamp_source = 'local' THEN {local_to_utc('check_timestamp')} ELSE check_timestamp END,
+               check_timestamp, timestamp_source, inspector_id, pass_fail, defect_notes, _loaded_at, _source_file
+        FROM (
+            SELECT q.*, {source} AS timestamp_source
+            FROM _stage q
+            LEFT JOIN silver.production_batches b ON b.batch_id = q.batch_id
+        )
+    """)
+
+    mark_changed(con, "qc_checks", "t._source_file IN (SELECT DISTINCT _source_file FROM _stage)", built_at)
+    set_build_watermark(con, "qc_checks", built_at)
+    return source_counts(con, "qc_checks", "timestamp_source")
+
+
+def build_operator_logs(con, built_at: datetime) -> Dict[str, int]:
+    """
+    Rebuild silver.operator_logs for new and pending source files.
+
+    An entry is logged within 10 minutes of a batch start on its machine.
+    Two range joins against the machine's batches test the raw timestamp as
+    UTC and as local time; entries that only match as local time are
+    converted to UTC.
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        built_at: Build timestamp
+
+    Returns:
+        Silver row counts per timestamp_source
+    """
+    stage_files(con, "operator_logs", get_build_watermark(con, "operator_logs"), built_at, pending="timestamp_source = 'pending'")
+
+    window = f"INTERVAL ({OPERATOR_LOG_WINDOW_MINUTES + WINDOW_TOLERANCE_MINUTES}) MINUTE"
+    # Without any match the machine's batches may still be on their way
+    source = timestamp_source("o._row IN (SELECT _row FROM utc)", "o._row IN (SELECT _row FROM local)",
+                              unmatched="pending")
+
+    con.execute(f"""
+        INSERT INTO silver.operator_logs
+        WITH utc AS (
+            SELECT DISTINCT o._row
+            FROM _stage o
+            JOIN silver.production_batches b
+              ON b.machine_id = o._machine
+             AND b.start_time BETWEEN o.log_timestamp - {window} AND o.log_timestamp + {window}
+        ),
+        local AS (
+            SELECT DISTINCT o._row
+            FROM _stage o
+            JOIN silver.production_batches b
+              ON b.machine_id = o._machine
+             AND b.start_time BETWEEN {local_to_utc('o.log_timestamp')} - {window}
+                                  AND {local_to_utc('o.log_timestamp')} + {window}
+        )
+        SELECT log_id, _machine, operator_id,
+               CASE WHEN timestamp_source = 'local' THEN {local_to_utc('log_timestamp')} ELSE log_timestamp END,
+               log_timestamp, timestamp_source, action, notes, _loaded_at, _source_file
+        FROM (SELECT o.*, {source} AS timestamp_source FROM _stage o)
+    """)
+
+    mark_changed(con, "operator_logs", "t._source_file IN (SELECT DISTINCT _source_file FROM _stage)", built_at)
+    set_build_watermark(con, "operator_logs", built_at)
+    return source_counts(con, "operator_logs", "timestamp_source")
+
+
+def build_sensor_readings(con, built_at: datetime,
+                          drift_tolerance: float = DEFAULT_DRIFT_TOLERANCE_MINUTES) -> Dict[str, int]:
+    """
+    Rebuild silver.sensor_readings for new and pending source files.
+
+    Each reading is attributed to the closest batch window of its machine
+    (see interval_index.attribution_sql). Readings that drifted outside the
+    window are clamped to its edge.
+
+    Args:
+        con: DuckDB connection (inside a transaction)
+        built_at: Build timestamp
+        drift_tolerance: Minutes outside a batch window still attributed to it
+
+    Returns:
+        Silver row counts per alignment ('in_window', 'realigned', 'pending')
+    """
+    stage_files(con, "sensor_readings", get_build_watermark(con, "sensor_readings"), built_at, pending="alignment = 'pending'")
+
+    matches = attribution_sql("_stage", "silver.production_batches", machine="_machine",
+                              tolerance_minutes=drift_tolerance)
+    con.execute(f"""
+        INSERT INTO silver.sensor_readings
+        WITH matches AS ({matches})
+        SELECT s._machine, m.batch_id,
+               coalesce(least(greatest(s.timestamp, m.start_time), m.end_time), s.timestamp),
+               s.timestamp,
+               CASE
+                   WHEN m.batch_id IS NULL THEN 'pending'
+                   WHEN s.timestamp BETWEEN m.start_time AND m.end_time THEN 'in_window'
+                   ELSE 'realigned'
+               END,
+               s.temperature, s.pressure, s.energy_kwh, s.efficiency_percent, s._loaded_at, s._source_file
+        FROM _stage s
+        LEFT JOIN matches m ON m._row = s._row
+    """)
+
+    mark_changed(con, "sensor_readings", "t._source_file IN (SELECT DISTINCT _source_file FROM _stage)", built_at)
+    set_build_watermark(con, "sensor_readings", built_at)
+    return source_counts(con, "sensor_readings", "alignment")
+
+
+def build_silver(con, full: bool = False, drift_tolerance: float = DEFAULT_DRIFT_TOLERANCE_MINUTES) -> Dict:
+    """
+    Incrementally build every silver table in one transaction.
+
+    Args:
+        con: DuckDB connection
+        full: Discard silver tables and rebuild from all of bronze (the
+            mapping tables are re-resolved from all of bronze too)
+        drift_tolerance: Minutes outside a batch window a sensor reading may drift
+
+    Returns:
+        Dedup log rows for production_batches, and row counts per
+        timestamp_source / alignment for the other tables
+    """
+    create_bronze_tables(con)
+    create_manifest_table(con)
+    create_silver_tables(con)
+    # Only spellings loaded since the last refresh are scanned
+    refresh_mappings(con, rebuild=full)
+
+    built_at = datetime.utcnow()
+    con.begin()
+    try:
+        if full:
+            for table in SILVER_TABLES:
+                mark_changed(con, table, "TRUE", built_at)
+                con.execute(f"DELETE FROM silver.{table}")
+            con.execute("DELETE FROM silver._build_state")
+
+        # Batches first: the other tables are normalized against them
+        results = {
+            "production_batches": build_production_batches(con, built_at),
+            "qc_checks": build_qc_checks(con, built_at),
+            "operator_logs": build_operator_logs(con, built_at),
+            "sensor_readings": build_sensor_readings(con, built_at, drift_tolerance)
+        }
+        con.execute("DROP TABLE IF EXISTS _stage")
+        con.execute("DROP TABLE IF EXISTS _reopened_files")
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build the silver layer from bronze")
+    parser.add_argument("--full", action="store_true", help="Rebuild from all of bronze instead of new loads only")
+    parser.add_argument("--drift-tolerance", type=float, default=DEFAULT_DRIFT_TOLERANCE_MINUTES,
+                        help="Minutes a sensor reading may drift outside its batch window")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args()
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+
+    started = time.perf_counter()
+    results = build_silver(con, full=args.full, drift_tolerance=args.drift_tolerance)
+    elapsed = time.perf_counter() - started
+
+    log = results.pop("production_batches")
+    kept = sum(row["rows_kept"] for row in log)
+    in_load = sum(row["duplicates_in_load"] for row in log)
+    existing = sum(row["duplicates_of_existing"] for row in log)
+    print(f"[OK] silver.production_batches: {kept} new rows, {in_load} duplicates within the load, "
+          f"{existing} duplicates of earlier loads ({len(log)} source file(s))")
+
+    for table, counts in results.items():
+        summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+        print(f"[OK] silver.{table}: {summary or 'empty'}")
+
+    print(f"[OK] Silver build finished in {elapsed:.2f}s")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+"""
+Canonicalization index for product names and machine IDs.
+
+Raw data spells products and machines many ways ("iron_plate", "IronPlate",
+"Smelter #1", ...) and free-typed values pick up typos. The index maps any
+raw spelling back to its canonical value in PRODUCTS / MACHINES:
+
+1. Exact: the raw value is the canonical value or a configured variation.
+2. Normalized: the raw value's normalized key (lowercase, alphanumerics only,
+   leading zeros stripped from numbers) matches a known spelling's key.
+3. Fuzzy: the key is within MAX_EDIT_DISTANCE edits (insert, delete,
+   substitute, transpose) of exactly one known key. Candidates come from a
+   precomputed symmetric-delete index, so a lookup is a few hash probes
+   rather than a scan of the vocabulary. Numbers must match, so "smelter3"
+   never resolves to "smelter1".
+
+Keys claimed by more than one canonical value are dropped, and ties between
+fuzzy candidates resolve to nothing: an unmatched value is better than a
+wrong one.
+
+In the warehouse the index is materialized as silver mapping tables
+(silver.product_name_map, silver.machine_id_map) with one row per distinct
+raw spelling. Refreshing them reads only bronze rows loaded since the last
+refresh (silver._mapping_state) and resolves only spellings not seen before,
+so cleaning bronze rows is a hash join on raw_value.
+
+Usage:
+    python -m orchestration.canonicalize                     # refresh mapping tables
+    python -m orchestration.canonicalize --rebuild
+    python -m orchestration.canonicalize --lookup "Smleter-1" --column machine_id
+"""
+import argparse
+import re
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import duckdb
+import pyarrow as pa
+
+from data_generators.config import MACHINES, PRODUCTS, CHAOS_CONFIG
+from orchestration.init_database import DB_PATH, create_bronze_tables
+
+# Largest edit distance accepted by the fuzzy fallback
+MAX_EDIT_DISTANCE = 1
+
+# Shorter keys are only matched exactly (too many neighbours to be safe)
+MIN_FUZZY_KEY_LENGTH = 5
+
+# Canonicalized column -> bronze tables that carry it
+CANONICAL_COLUMNS = {
+    "product_name": ["production_batches"],
+    "machine_id": ["sensor_logs", "production_batches", "operator_logs"]
+}
+
+NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+LEADING_ZEROS = re.compile(r"(?<![0-9])0+(?=[0-9])")
+
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+def normalize_key(value: str) -> str:
+    """
+    Reduce a spelling to its comparison key.
+
+    "SMELTER-01", "Smelter #1" and "smelter1" all become "smelter1".
+
+    Args:
+        value: Raw spelling
+
+    Returns:
+        Lowercase alphanumeric key with leading zeros stripped from numbers
+    """
+    return LEADING_ZEROS.sub("", NON_ALPHANUMERIC.sub("", value.lower()))
+
+
+def deletes(key: str, max_distance: int) -> Set[str]:
+    """Return every string obtained by deleting up to max_distance characters from key."""
+    variants = {key}
+    for count in range(1, min(max_distance, len(key)) + 1):
+        for positions in combinations(range(len(key)), count):
+            variants.add("".join(c for i, c in enumerate(key) if i not in positions))
+    return variants
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Args:
+        a: First string
+        b: Second string
+        limit: Distances above this are reported as limit + 1
+
+    Returns:
+        Edit distance, capped at limit + 1
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def known_spellings(column: str) -> Dict[str, List[str]]:
+    """
+    Return every configured spelling of a column's canonical values.
+
+    Args:
+        column: "product_name" or "machine_id"
+
+    Returns:
+        Canonical value -> spellings (canonical first), in config order
+    """
+    if column == "product_name":
+        canonical = [p["canonical_name"] for p in PRODUCTS]
+        variations = CHAOS_CONFIG["product_name_variations"]
+    elif column == "machine_id":
+        canonical = [m["machine_id"] for m in MACHINES]
+        variations = CHAOS_CONFIG["machine_id_variations"]
+    else:
+        raise ValueError(f"No canonicalization index for column: {column}")
+
+    return {value: list(dict.fromkeys([value] + variations.get(value, []))) for value in canonical}
+
+
+def build_index(column: str, max_distance: int = MAX_EDIT_DISTANCE) -> Dict:
+    """
+    Build the lookup structures for one column from config.
+
+    Args:
+        column: "product_name" or "machine_id"
+        max_distance: Largest edit distance for fuzzy matches
+
+    Returns:
+        {"column", "max_distance", "exact", "keys", "deletes"}: raw spelling
+        -> canonical, normalized key -> canonical, and delete variant ->
+        normalized keys
+    """
+    exact, keys = {}, {}
+    ambiguous_spellings, ambiguous_keys = set(), set()
+
+    for canonical, spellings in known_spellings(column).items():
+        for spelling in spellings:
+            if exact.setdefault(spelling, canonical) != canonical:
+                ambiguous_spellings.add(spelling)
+            key = normalize_key(spelling)
+            if keys.setdefault(key, canonical) != canonical:
+                ambiguous_keys.add(key)
+
+    for spelling in ambiguous_spellings:
+        del exact[spelling]
+    for key in ambiguous_keys:
+        del keys[key]
+
+    delete_index = {}
+    for key in keys:
+        if len(key) >= MIN_FUZZY_KEY_LENGTH:
+            for variant in deletes(key, max_distance):
+                delete_index.setdefault(variant, set()).add(key)
+
+    return {
+        "column": column,
+        "max_distance": max_distance,
+        "exact": exact,
+        "keys": keys,
+        "deletes": delete_index
+    }
+
+
+@lru_cache(maxsize=None)
+def get_index(column: str) -> Dict:
+    """Return the column's index, built from config on first use."""
+    return build_index(column)
+
+
+def resolve(value: Optional[str], index: Dict) -> Tuple[Optional[str], str, Optional[int]]:
+    """
+    Map one raw spelling to its canonical value.
+
+    Args:
+        value: Raw spelling
+        index: Output of build_index
+
+    Returns:
+        (canonical value or None, match type, edit distance). Match type is
+        "exact", "normalized", "fuzzy" or "unmatched"
+    """
+    if value is None:
+        return None, "unmatched", None
+    if value in index["exact"]:
+        return index["exact"][value], "exact", 0
+
+    key = normalize_key(value)
+    if key in index["keys"]:
+        return index["keys"][key], "normalized", 0
+    if len(key) < MIN_FUZZY_KEY_LENGTH:
+        return None, "unmatched", None
+
+    max_distance = index["max_distance"]
+    candidates = set()
+    for variant in deletes(key, max_distance):
+        candidates.update(index["deletes"].get(variant, ()))
+
+    # Typos never change which numbers a value contains
+    digits = sorted(c for c in key if c.isdigit())
+    best_distance, best = max_distance + 1, set()
+    for candidate in candidates:
+        if sorted(c for c in candidate if c.isdigit()) != digits:
+            continue
+        distance = edit_distance(key, candidate, max_distance)
+        if distance < best_distance:
+            best_distance, best = distance, {index["keys"][candidate]}
+        elif distance == best_distance:
+            best.add(index["keys"][candidate])
+
+    if len(best) == 1:
+        return best.pop(), "fuzzy", best_distance
+    return None, "unmatched", None
+
+
+def canonicalize(value: Optional[str], column: str) -> Optional[str]:
+    """
+    Return the canonical product name or machine ID for a raw spelling.
+
+    Args:
+        value: Raw spelling
+        column: "product_name" or "machine_id"
+
+    Returns:
+        Canonical value, or None if the spelling cannot be resolved safely
+    """
+    return resolve(value, get_index(column))[0]
+
+
+def canonicalize_many(values: Iterable[Optional[str]], column: str) -> Dict[str, Optional[str]]:
+    """
+    Resolve a batch of spellings, each distinct value once.
+
+    Args:
+        values: Raw spellings
+        column: "product_name" or "machine_id"
+
+    Returns:
+        Raw spelling -> canonical value (None if unresolved)
+    """
+    index = get_index(column)
+    return {value: resolve(value, index)[0] for value in set(values) if value is not None}
+
+
+# ============================================================================
+# WAREHOUSE MAPPING TABLES
+# ============================================================================
+
+def mapping_table(column: str) -> str:
+    """Return the silver mapping table name for a column."""
+    return f"silver.{column}_map"
+
+
+def create_mapping_tables(con):
+    """Create the silver mapping tables and their refresh watermarks if they do not exist."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS silver")
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS silver._mapping_state (
+            table_name VARCHAR PRIMARY KEY,
+            watermark TIMESTAMP
+        )
+    """)
+    for column in CANONICAL_COLUMNS:
+        con.execute(f"""
+            CREATE TABLE IF NOT EXISTS {mapping_table(column)} (
+                raw_value VARCHAR PRIMARY KEY,
+                canonical_value VARCHAR,
+                match_type VARCHAR,
+                edit_distance INTEGER
+            )
+        """)
+
+
+def mapping_rows(values: Iterable[str], index: Dict) -> pa.Table:
+    """Resolve spellings into mapping table rows."""
+    values = sorted(set(values))
+    resolved = [resolve(value, index) for value in values]
+    return pa.table({
+        "raw_value": pa.array(values, pa.string()),
+        "canonical_value": pa.array([r[0] for r in resolved], pa.string()),
+        "match_type": pa.array([r[1] for r in resolved], pa.string()),
+        "edit_distance": pa.array([r[2] for r in resolved], pa.int32())
+    })
+
+
+def refresh_mappings(con, rebuild: bool = False) -> Dict[str, int]:
+    """
+    Add newly seen bronze spellings to the mapping tables.
+
+    Every configured spelling is always present. Only bronze rows loaded
+    after each table's watermark in silver._mapping_state are scanned, so a
+    refresh costs the size of the new loads rather than the whole history.
+    Their values that are not in the table yet, and spellings that were
+    unmatched last time (the config may have grown since), are resolved in
+    Python; only distinct values are read.
+
+    Args:
+        con: DuckDB connection
+        rebuild: Re-resolve every row from all of bronze (e.g. after a config change)
+
+    Returns:
+        Rows inserted or updated per mapping table
+    """
+    create_bronze_tables(con)
+    create_mapping_tables(con)
+    counts = {}
+    if rebuild:
+        con.execute("DELETE FROM silver._mapping_state")
+
+    # Fix each bronze table's new watermark before scanning so rows loaded meanwhile are not skipped
+    bronze_tables = sorted({t for tables in CANONICAL_COLUMNS.values() for t in tables})
+    watermarks = dict(con.execute("SELECT table_name, watermark FROM silver._mapping_state").fetchall())
+    loaded = {t: con.execute(f"SELECT max(_loaded_at) FROM bronze.{t}").fetchone()[0] for t in bronze_tables}
+
+    for column, tables in CANONICAL_COLUMNS.items():
+        table = mapping_table(column)
+        index = get_index(column)
+        if rebuild:
+            con.execute(f"DELETE FROM {table}")
+
+        seen = " UNION ".join(
+            f"SELECT {column} AS raw_value FROM bronze.{t} "
+            f"WHERE _loaded_at > coalesce(?::TIMESTAMP, '-infinity'::TIMESTAMP) "
+            f"AND _loaded_at <= ?::TIMESTAMP"
+            for t in tables
+        )
+        params = [value for t in tables for value in (watermarks.get(t), loaded[t])]
+        pending = con.execute(f"""
+            SELECT DISTINCT b.raw_value
+            FROM (
+                {seen}
+                UNION SELECT unnest(?::VARCHAR[])
+                UNION SELECT raw_value FROM {table} WHERE canonical_value IS NULL
+            ) b
+            LEFT JOIN {table} m ON m.raw_value = b.raw_value
+            WHERE b.raw_value IS NOT NULL AND (m.raw_value IS NULL OR m.canonical_value IS NULL)
+        """, params + [list(index["exact"])]).fetchall()
+
+        rows = mapping_rows((row[0] for row in pending), index)
+        con.register("_mapping_rows", rows)
+        con.execute(f"INSERT OR REPLACE INTO {table} SELECT * FROM _mapping_rows")
+        con.unregister("_mapping_rows")
+        counts[table] = rows.num_rows
+
+    for t, watermark in loaded.items():
+        if watermark is not None:
+            con.execute("INSERT OR REPLACE INTO silver._mapping_state VALUES (?, ?)", [t, watermark])
+    return counts
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Maintain the product name / machine ID canonicalization maps")
+    parser.add_argument("--rebuild", action="store_true", help="Re-resolve every mapping row")
+    parser.add_argument("--lookup", type=str, help="Resolve a single spelling instead of refreshing tables")
+    parser.add_argument("--column", choices=sorted(CANONICAL_COLUMNS), default="machine_id",
+                        help="Column for --lookup")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args()
+
+    if args.lookup is not None:
+        canonical, match_type, distance = resolve(args.lookup, get_index(args.column))
+        print(f"{args.lookup!r} -> {canonical!r} ({match_type}" + (f", distance {distance})" if distance else ")"))
+        return
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+    for table, rows in refresh_mappings(con, rebuild=args.rebuild).items():
+        print(f"[OK] {table}: {rows} spelling(s) resolved")
+
+    for column in CANONICAL_COLUMNS:
+        unmatched = con.execute(
+            f"SELECT count(*) FROM {mapping_table(column)} WHERE canonical_value IS NULL"
+        ).fetchone()[0]
+        if unmatched:
+            print(f"[WARN] {mapping_table(column)}: {unmatched} unmatched spelling(s)")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Bulk-load raw data files into the bronze tables of the DuckDB warehouse.
+
+Each raw_data/<date>/ directory is loaded with DuckDB's native file scanners
+(read_csv / read_json / read_parquet; Arrow IPC files are scanned through a
+registered Arrow table), never row by row. All files for a day are loaded in
+a single transaction.
+
+Loading is incremental and idempotent: bronze._ingest_manifest records each
+file's size, mtime and content hash, unchanged files are skipped, and a
+changed file replaces only its own rows (delete-then-insert on
+_source_file). Without arguments only partitions at or after the watermark
+(the newest loaded date) are scanned.
+
+Usage:
+    python -m orchestration.ingest_bronze                   # incremental
+    python -m orchestration.ingest_bronze --date 2025-12-01
+    python -m orchestration.ingest_bronze --all             # scan every partition
+"""
+import argparse
+import hashlib
+import re
+import time
+from datetime import datetime, date as date_type
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+
+from data_generators.config import RAW_DATA_DIR, DATA_ROOT, LATE_DIR_NAME
+from data_generators.output_formats import find_table_file
+from orchestration.init_database import DB_PATH, BRONZE_COLUMNS, create_bronze_tables
+
+# Raw partition directories are named by date
+PARTITION_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def sql_literal(value: str) -> str:
+    """Quote a string as a SQL literal."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def source_name(path: Path) -> str:
+    """Return the _source_file value for a raw file (path relative to the data root)."""
+    return path.resolve().relative_to(DATA_ROOT.resolve()).as_posix()
+
+
+def scan_sql(con, path: Path, table: str) -> str:
+    """
+    Build the FROM clause that scans a raw file with the table's bronze types.
+
+    Args:
+        con: DuckDB connection (Arrow IPC files are registered on it)
+        path: Raw file
+        table: Bronze table name
+
+    Returns:
+        SQL table expression
+    """
+    columns = BRONZE_COLUMNS[table]
+    column_types = "{" + ", ".join(f"{sql_literal(n)}: {sql_literal(t)}" for n, t in columns.items()) + "}"
+    file_literal = sql_literal(str(path))
+
+    if path.suffix == ".csv":
+        return f"read_csv({file_literal}, header = true, columns = {column_types})"
+    if path.suffix == ".json":
+        return f"read_json({file_literal}, format = 'array', columns = {column_types})"
+    if path.suffix == ".parquet":
+        return f"read_parquet({file_literal})"
+    if path.suffix == ".arrow":
+        with pa.memory_map(str(path)) as source:
+            con.register("_arrow_scan", pa.ipc.open_file(source).read_all())
+        return "_arrow_scan"
+    raise ValueError(f"Unsupported raw file type: {path}")
+
+
+def load_file(con, path: Path, table: str, loaded_at: datetime) -> int:
+    """
+    Append one raw file to its bronze table.
+
+    Args:
+        con: DuckDB connection
+        path: Raw file
+        table: Bronze table name
+        loaded_at: Value for the _loaded_at column
+
+    Returns:
+        Number of rows loaded
+    """
+    # Tables with no rows are written as empty files
+    if path.stat().st_size == 0:
+        return 0
+
+    columns = list(BRONZE_COLUMNS[table])
+    select_list = ", ".join(f"CAST({name} AS {BRONZE_COLUMNS[table][name]})" for name in columns)
+    row_count = con.execute(f"""
+        INSERT INTO bronze.{table} ({", ".join(columns)}, _loaded_at, _source_file)
+        SELECT {select_list}, ?, ?
+        FROM {scan_sql(con, path, table)}
+    """, [loaded_at, source_name(path)]).fetchone()[0]
+
+    if path.suffix == ".arrow":
+        con.unregister("_arrow_scan")
+    return row_count
+
+
+def create_manifest_table(con):
+    """Create the ingestion manifest if it does not exist."""
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS bronze._ingest_manifest (
+            source_file VARCHAR PRIMARY KEY,
+            table_name VARCHAR,
+            partition_date DATE,
+            file_size BIGINT,
+            file_mtime DOUBLE,
+            content_hash VARCHAR,
+            row_count BIGINT,
+            loaded_at TIMESTAMP
+        )
+    """)
+
+
+def file_hash(path: Path) -> str:
+    """Return the BLAKE2b hex digest of a file's contents."""
+    digest = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def partition_files(day_dir: Path) -> List[Tuple[str, Path]]:
+    """
+    List the raw files that belong to a partition directory.
+
+    Includes late-arriving drops under late/<event_date>/.
+
+    Args:
+        day_dir: raw_data/<date> directory
+
+    Returns:
+        (bronze table, file path) pairs
+    """
+    directories = [day_dir]
+    late_root = day_dir / LATE_DIR_NAME
+    if late_root.is_dir():
+        directories += sorted(p for p in late_root.iterdir() if p.is_dir())
+
+    files = []
+    for directory in directories:
+        for table in BRONZE_COLUMNS:
+            path = find_table_file(directory, table)
+            if path:
+                files.append((table, path))
+    return files
+
+
+def get_watermark(con) -> Optional[date_type]:
+    """
+    Return the newest partition date loaded with on-time data.
+
+    Partitions that so far only hold late drops (for a day not generated yet)
+    do not advance the watermark.
+    """
+    return con.execute(f"""
+        SELECT max(partition_date)
+        FROM bronze._ingest_manifest
+        WHERE source_file NOT LIKE '%/{LATE_DIR_NAME}/%'
+    """).fetchone()[0]
+
+
+def load_day(con, date_str: str, raw_root: Path = RAW_DATA_DIR, force: bool = False) -> Dict[str, int]:
+    """
+    Load new or changed raw files for one day in a single transaction.
+
+    Files whose size and mtime match the manifest are skipped without being
+    read; files whose content hash is unchanged only get their manifest
+    entry refreshed. Anything else replaces its previous rows. Manifest
+    entries for files that no longer exist are removed with their rows.
+
+    Args:
+        con: DuckDB connection
+        date_str: Date (YYYY-MM-DD)
+        raw_root: Root of the raw_data tree
+        force: Reload every file regardless of the manifest
+
+    Returns:
+        Rows loaded per bronze table (only tables that were reloaded)
+    """
+    day_dir = raw_root / date_str
+    loaded_at = datetime.utcnow()
+    counts = {}
+
+    manifest = {
+        row[0]: row[1:]
+        for row in con.execute("""
+            SELECT source_file, table_name, file_size, file_mtime, content_hash
+            FROM bronze._ingest_manifest
+            WHERE partition_date = ?
+        """, [date_str]).fetchall()
+    }
+
+    con.begin()
+    try:
+        current_files = set()
+
+        for table, path in partition_files(day_dir):
+            source_file = source_name(path)
+            current_files.add(source_file)
+            stat = path.stat()
+            previous = manifest.get(source_file)
+
+            if not force and previous and previous[1] == stat.st_size and previous[2] == stat.st_mtime:
+                continue
+
+            content_hash = file_hash(path)
+            if not force and previous and previous[3] == content_hash:
+                con.execute("UPDATE bronze._ingest_manifest SET file_mtime = ? WHERE source_file = ?",
+                            [stat.st_mtime, source_file])
+                continue
+
+            # Replace this file's rows
+            con.execute(f"DELETE FROM bronze.{table} WHERE _source_file = ?", [source_file])
+            row_count = load_file(con, path, table, loaded_at)
+            counts[table] = counts.get(table, 0) + row_count
+
+            con.execute("""
+                INSERT OR REPLACE INTO bronze._ingest_manifest
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [source_file, table, date_str, stat.st_size, stat.st_mtime, content_hash, row_count, loaded_at])
+
+        # Files that disappeared (e.g. regenerated in another format)
+        for source_file, (table, *_) in manifest.items():
+            if source_file not in current_files:
+                con.execute(f"DELETE FROM bronze.{table} WHERE _source_file = ?", [source_file])
+                con.execute("DELETE FROM bronze._ingest_manifest WHERE source_file = ?", [source_file])
+
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+
+    return counts
+
+
+def ingest(con, raw_root: Path = RAW_DATA_DIR, dates: Optional[List[str]] = None,
+           full_scan: bool = False, force: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    Incrementally load raw partitions.
+
+    Args:
+        con: DuckDB connection
+        raw_root: Root of the raw_data tree
+        dates: Partitions to load (None = discover them under raw_root)
+        full_scan: Check every partition instead of only those at or after the watermark
+        force: Reload files regardless of the manifest
+
+    Returns:
+        Rows loaded per partition and table (partitions with no changes are omitted)
+    """
+    create_bronze_tables(con)
+    create_manifest_table(con)
+
+    if dates is None:
+        dates = sorted(p.name for p in raw_root.iterdir() if p.is_dir() and PARTITION_PATTERN.fullmatch(p.name))
+        watermark = get_watermark(con)
+        if watermark and not full_scan:
+            dates = [d for d in dates if d >= watermark.strftime("%Y-%m-%d")]
+
+    results = {}
+    for date_str in dates:
+        counts = load_day(con, date_str, raw_root, force=force)
+        if counts:
+            results[date_str] = counts
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load raw data files into bronze tables")
+    parser.add_argument("--date", type=str, help="Specific date (YYYY-MM-DD)")
+    parser.add_argument("--all", action="store_true", help="Scan every partition, not just those since the watermark")
+    parser.add_argument("--force", action="store_true", help="Reload files even if unchanged")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args()
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+
+    started = time.perf_counter()
+    if args.date and not (RAW_DATA_DIR / args.date).is_dir():
+        print(f"[SKIP] No raw data for {args.date}")
+        results = {}
+    else:
+        dates = [args.date] if args.date else None
+        results = ingest(con, dates=dates, full_scan=args.all, force=args.force)
+    elapsed = time.perf_counter() - started
+
+    for date_str, counts in results.items():
+        print(f"[OK] Loaded {date_str}:")
+        for table, rows in counts.items():
+            print(f"  - bronze.{table}: {rows} rows")
+
+    print(f"[OK] {len(results)} partition(s) changed, finished in {elapsed:.2f}s")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+"""
+Micro-batch ingestion of live stream events into the bronze tables.
+
+Pairs with data_generators/live_stream.py. Events are read from a source,
+buffered as raw NDJSON and flushed to bronze.* in bulk when the buffer holds
+--max-events events or its oldest event has waited --max-latency seconds:
+
+- segments: tail the rotating NDJSON segment files in stream/
+- socket: listen on a Unix domain socket for a producer to connect
+
+A flush parses the whole block with Arrow's JSON reader into one record
+batch (the "data" objects of every table share one struct type), registers
+it with DuckDB and appends each table with a single INSERT ... SELECT, all
+in one transaction that also stores the consumer offsets in
+bronze._stream_offsets: the last sequence number loaded per stream and, for
+segments, the file and byte position to resume from.
+
+Exactly-once: events at or below a stream's committed seq are dropped, and
+offsets commit atomically with the rows, so restarting after a crash
+re-reads from the last commit without loading anything twice. A socket
+cannot replay, so events in flight when the consumer stops are lost (never
+duplicated).
+
+Every flush is its own source unit: its rows are tagged _source_file =
+stream/<stream_id>/<table>/<first seq in the flush>, and each tag is
+registered in bronze._ingest_manifest (with no partition date, so file
+ingestion leaves it alone). A tag is never written to again, so build_silver
+stages a flush once, as new rows past its watermark, like a newly loaded
+raw file.
+
+DuckDB allows one writing process per database: while the consumer runs,
+other pipeline steps must use a different warehouse or wait.
+
+Usage:
+    python -m orchestration.ingest_stream                          # tail stream/ until stopped
+    python -m orchestration.ingest_stream --once                   # load what is there and exit
+    python -m orchestration.ingest_stream --source socket --path /tmp/factory.sock
+"""
+import io
+import time
+import asyncio
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as pj
+
+from data_generators.config import STREAM_DIR
+from orchestration.init_database import DB_PATH, BRONZE_COLUMNS, create_bronze_tables
+from orchestration.ingest_bronze import create_manifest_table
+
+SOURCES = ("segments", "socket")
+
+# Flush thresholds
+DEFAULT_MAX_EVENTS = 100_000
+DEFAULT_MAX_LATENCY_SECONDS = 1.0
+
+# Largest read from a segment or socket at once
+READ_BYTES = 8 * 1024 * 1024
+
+# Seconds between segment directory polls, and between progress lines
+POLL_INTERVAL_SECONDS = 0.1
+REPORT_INTERVAL_SECONDS = 5.0
+
+# Arrow types used to parse event data (bronze casts them on insert)
+ARROW_TYPES = {"VARCHAR": pa.string(), "TIMESTAMP": pa.timestamp("us"), "DOUBLE": pa.float64(), "INTEGER": pa.int64()}
+
+# Event line schema: the union of every bronze table's columns under "data"
+EVENT_SCHEMA = pa.schema([
+    ("stream", pa.string()),
+    ("emitted_at", pa.float64()),
+    ("seq", pa.int64()),
+    ("table", pa.string()),
+    ("data", pa.struct({
+        name: ARROW_TYPES[sql_type] for columns in BRONZE_COLUMNS.values() for name, sql_type in columns.items()
+    }))
+])
+
+# Stream -> (last seq loaded, segment file, byte offset in it)
+Offsets = Dict[str, Tuple[int, Optional[str], Optional[int]]]
+
+
+def create_offsets_table(con):
+    """Create the stream offsets table if it does not exist."""
+    con.execute("""
+        CREATE TABLE IF NOT EXISTS bronze._stream_offsets (
+            stream_id VARCHAR PRIMARY KEY,
+            last_seq BIGINT,
+            segment VARCHAR,
+            segment_offset BIGINT,
+            events_loaded BIGINT,
+            updated_at TIMESTAMP
+        )
+    """)
+
+
+def load_offsets(con) -> Offsets:
+    """Return the committed offsets per stream."""
+    return {
+        row[0]: row[1:]
+        for row in con.execute("SELECT stream_id, last_seq, segment, segment_offset FROM bronze._stream_offsets").fetchall()
+    }
+
+
+def load_events(con, block: bytes, offsets: Offsets,
+                positions: Optional[Dict[str, Tuple[str, int]]] = None) -> Dict[str, float]:
+    """
+    Append a block of NDJSON events to bronze and commit the offsets.
+
+    Args:
+        con: DuckDB connection
+        block: Complete event lines
+        offsets: Committed offsets, updated in place after the commit
+        positions: Segment file and byte offset reached per stream (segments source)
+
+    Returns:
+        {"events", "loaded", "skipped", "max_latency", "mean_latency"}
+    """
+    positions = positions or {}
+    events = pj.read_json(io.BytesIO(block), parse_options=pj.ParseOptions(
+        explicit_schema=EVENT_SCHEMA, unexpected_field_behavior="ignore"
+    ))
+
+    # Drop events an earlier flush already committed
+    keep = pa.array([False] * len(events))
+    for stream in pc.unique(events["stream"]).to_pylist():
+        committed = offsets.get(stream, (-1,))[0]
+        keep = pc.or_(keep, pc.and_(pc.equal(events["stream"], stream), pc.greater(events["seq"], committed)))
+    events = events.filter(keep)
+
+    loaded_at = datetime.utcnow()
+    con.register("_events", events)
+    con.begin()
+    try:
+        for table, columns in BRONZE_COLUMNS.items():
+            select_list = ", ".join(f"CAST(data.{name} AS {sql_type})" for name, sql_type in columns.items())
+            con.execute(f"""
+                INSERT INTO bronze.{table} ({", ".join(columns)}, _loaded_at, _source_file)
+                SELECT {select_list}, ?, 'stream/' || stream || '/{table}/' || min(seq) OVER (PARTITION BY stream)
+                FROM _events
+                WHERE "table" = '{table}'
+            """, [loaded_at])
+
+        con.execute("""
+            INSERT INTO bronze._ingest_manifest
+            SELECT 'stream/' || stream || '/' || "table" || '/' || min(seq), "table", NULL, NULL, NULL, NULL, count(*), ?
+            FROM _events
+            GROUP BY stream, "table"
+        """, [loaded_at])
+
+        loaded = {stream: (last_seq, count) for stream, last_seq, count in con.execute(
+            "SELECT stream, max(seq), count(*) FROM _events GROUP BY stream"
+        ).fetchall()}
+        updated = {}
+        for stream in loaded.keys() | positions.keys():
+            previous_seq, previous_segment, previous_offset = offsets.get(stream, (-1, None, None))
+            last_seq, count = loaded.get(stream, (previous_seq, 0))
+            segment, segment_offset = positions.get(stream, (previous_segment, previous_offset))
+            updated[stream] = (last_seq, segment, segment_offset)
+            con.execute("""
+                INSERT INTO bronze._stream_offsets VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (stream_id) DO UPDATE
+                SET last_seq = excluded.last_seq,
+                    segment = excluded.segment,
+                    segment_offset = excluded.segment_offset,
+                    events_loaded = events_loaded + excluded.events_loaded,
+                    updated_at = excluded.updated_at
+            """, [stream, last_seq, segment, segment_offset, count, loaded_at])
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.unregister("_events")
+
+    offsets.update(updated)
+    latency = pc.subtract(pa.scalar(time.time()), events["emitted_at"]) if len(events) else None
+    return {
+        "events": block.count(b"\n"),
+        "loaded": len(events),
+        "skipped": block.count(b"\n") - len(events),
+        "max_latency": pc.max(latency).as_py() if latency is not None else 0.0,
+        "mean_latency": pc.mean(latency).as_py() if latency is not None else 0.0
+    }
+
+
+# ============================================================================
+# MICRO-BATCH BUFFER
+# ============================================================================
+
+
+class MicroBatcher:
+    """
+    Buffer event lines and flush them to bronze by size or age.
+
+    add() waits while a flush is running, so a slow warehouse slows the
+    reader (and, over a socket, the producer) instead of growing the buffer.
+    """
+
+    def __init__(self, con, max_events: int = DEFAULT_MAX_EVENTS,
+                 max_latency: float = DEFAULT_MAX_LATENCY_SECONDS):
+        self.con = con
+        self.max_events = max_events
+        self.max_latency = max_latency
+        self.offsets = load_offsets(con)
+        self.chunks = []
+        self.buffered = 0
+        self.first_arrival = None
+        self.positions = {}
+        self.lock = asyncio.Lock()
+        self.stats = {"flushes": 0, "loaded": 0, "skipped": 0, "max_latency": 0.0, "latency_sum": 0.0}
+
+    async def add(self, chunk: bytes, stream: Optional[str] = None, position: Optional[Tuple[str, int]] = None):
+        """Buffer complete event lines (and the segment position they end at)."""
+        async with self.lock:
+            self.chunks.append(chunk)
+            self.buffered += chunk.count(b"\n")
+            if stream is not None:
+                self.positions[stream] = position
+            if self.first_arrival is None:
+                self.first_arrival = time.monotonic()
+        if self.buffered >= self.max_events:
+            await self.flush()
+
+    async def flush(self):
+        """Load everything buffered in one transaction."""
+        async with self.lock:
+            if not self.chunks:
+                return
+            block, positions = b"".join(self.chunks), self.positions
+            self.chunks, self.buffered, self.first_arrival, self.positions = [], 0, None, {}
+
+            result = await asyncio.to_thread(load_events, self.con, block, self.offsets, positions)
+            self.stats["flushes"] += 1
+            self.stats["loaded"] += result["loaded"]
+            self.stats["skipped"] += result["skipped"]
+            self.stats["max_latency"] = max(self.stats["max_latency"], result["max_latency"])
+            self.stats["latency_sum"] += result["mean_latency"] * result["loaded"]
+
+    async def flush_when_due(self):
+        """Flush whenever the oldest buffered event reaches max_latency."""
+        while True:
+            await asyncio.sleep(self.max_latency / 10)
+            if self.first_arrival is not None and time.monotonic() - self.first_arrival >= self.max_latency:
+                await self.flush()
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+
+def segment_streams(directory: Path) -> Dict[str, List[str]]:
+    """Group segment file names (<stream_id>-<first_seq>.ndjson) by stream, oldest first."""
+    streams = {}
+    for path in sorted(directory.glob("*.ndjson")):
+        streams.setdefault(path.stem.rsplit("-", 1)[0], []).append(path.name)
+    return streams
+
+
+def read_segments(directory: Path, positions: Dict[str, Tuple[str, int]]) -> List[Tuple[str, bytes, Tuple[str, int]]]:
+    """
+    Read the complete lines appended to every stream's segments since the last read.
+
+    A stream moves on to its next segment once the current one is read to
+    its end and a newer one exists (the producer only appends to the newest).
+
+    Args:
+        directory: Segment directory
+        positions: Segment and byte offset reached per stream, updated in place
+
+    Returns:
+        (stream, lines, position after them) per read
+    """
+    reads = []
+    for stream, segments in segment_streams(directory).items():
+        segment, offset = positions.get(stream) or (segments[0], 0)
+        if segment not in segments:
+            # Resume segment is gone: continue with the next one
+            later = [name for name in segments if name > segment]
+            if not later:
+                continue
+            segment, offset = later[0], 0
+
+        while True:
+            with open(directory / segment, "rb") as f:
+                f.seek(offset)
+                data = f.read(READ_BYTES)
+            end = data.rfind(b"\n") + 1
+            if end:
+                offset += end
+                reads.append((stream, data[:end], (segment, offset)))
+            if len(data) == READ_BYTES:
+                continue
+
+            position = segments.index(segment)
+            if end == len(data) and position + 1 < len(segments):
+                segment, offset = segments[position + 1], 0
+                continue
+            break
+        positions[stream] = (segment, offset)
+    return reads
+
+
+async def tail_segments(batcher: MicroBatcher, directory: Path, once: bool = False):
+    """
+    Feed segment lines to the batcher, polling for new data.
+
+    Args:
+        batcher: Micro-batch buffer
+        directory: Segment directory
+        once: Return once every segment is read to its end
+    """
+    positions = {stream: (segment, offset) for stream, (_, segment, offset) in batcher.offsets.items() if segment}
+    while True:
+        reads = await asyncio.to_thread(read_segments, directory, positions) if directory.is_dir() else []
+        for stream, lines, position in reads:
+            await batcher.add(lines, stream, position)
+        if once and not reads:
+            return
+        if not reads:
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+
+async def serve_socket(batcher: MicroBatcher, path: Path, once: bool = False):
+    """
+    Accept producers on a Unix socket and feed their lines to the batcher.
+
+    Args:
+        batcher: Micro-batch buffer
+        path: Socket path (a stale socket file is replaced)
+        once: Return when the first producer disconnects
+    """
+    done = asyncio.Event()
+
+    async def handle(reader, writer):
+        remainder = b""
+        while True:
+            data = await reader.read(READ_BYTES)
+            if not data:
+                break
+            data = remainder + data
+            end = data.rfind(b"\n") + 1
+            remainder = data[end:]
+            if end:
+                await batcher.add(data[:end])
+        writer.close()
+        done.set()
+
+    if path.exists():
+        path.unlink()
+    server = await asyncio.start_unix_server(handle, str(path))
+    async with server:
+        if once:
+            await done.wait()
+        else:
+            await server.serve_forever()
+
+
+async def report(batcher: MicroBatcher):
+    """Print load rate and latency periodically."""
+    previous, previous_time = 0, time.perf_counter()
+    while True:
+        await asyncio.sleep(REPORT_INTERVAL_SECONDS)
+        stats, now = batcher.stats, time.perf_counter()
+        mean_latency = stats["latency_sum"] / stats["loaded"] if stats["loaded"] else 0.0
+        print(f"  {stats['loaded']:,} events loaded ({(stats['loaded'] - previous) / (now - previous_time):,.0f}/s) "
+              f"in {stats['flushes']} flush(es), latency mean {mean_latency:.2f}s max {stats['max_latency']:.2f}s")
+        previous, previous_time = stats["loaded"], now
+
+
+async def run_ingest(batcher: MicroBatcher, source: str, path: Path, once: bool = False):
+    """Run a source, the flush timer and the reporter; flush what is left when the source ends."""
+    timer = asyncio.create_task(batcher.flush_when_due())
+    reporter = asyncio.create_task(report(batcher))
+    try:
+        if source == "segments":
+            await tail_segments(batcher, path, once)
+        else:
+            await serve_socket(batcher, path, once)
+    finally:
+        timer.cancel()
+        reporter.cancel()
+        await batcher.flush()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load live stream events into bronze in micro-batches")
+    parser.add_argument("--source", choices=SOURCES, default="segments", help="Where events come from")
+    parser.add_argument("--path", type=Path, help="Segment directory (default stream/) or socket path")
+    parser.add_argument("--max-events", type=int, default=DEFAULT_MAX_EVENTS, help="Events per flush")
+    parser.add_argument("--max-latency", type=float, default=DEFAULT_MAX_LATENCY_SECONDS,
+                        help="Seconds an event may wait in the buffer")
+    parser.add_argument("--once", action="store_true",
+                        help="Exit once the segments are read (or the first producer disconnects)")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args()
+
+    if args.source == "socket" and args.path is None:
+        parser.error("--source socket needs --path")
+    path = args.path or STREAM_DIR
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+    create_bronze_tables(con)
+    create_manifest_table(con)
+    create_offsets_table(con)
+
+    batcher = MicroBatcher(con, args.max_events, args.max_latency)
+    print(f"Ingesting {args.source} from {path} (flush at {args.max_events:,} events or {args.max_latency:g}s)...")
+    started = time.perf_counter()
+    try:
+        asyncio.run(run_ingest(batcher, args.source, path, args.once))
+    except KeyboardInterrupt:
+        print("\nStopped by user")
+    elapsed = time.perf_counter() - started
+
+    stats = batcher.stats
+    mean_latency = stats["latency_sum"] / stats["loaded"] if stats["loaded"] else 0.0
+    print(f"[OK] Loaded {stats['loaded']:,} events in {stats['flushes']} flush(es) over {elapsed:.1f}s "
+          f"({stats['skipped']:,} already loaded), latency mean {mean_latency:.2f}s max {stats['max_latency']:.2f}s")
+    con.close()
+
+
+if __name__ == "__main__":
+    main()
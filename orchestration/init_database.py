@@ -7,6 +7,59 @@ from pathlib import Path
 # Database path
 DB_PATH = Path(__file__).parent.parent / "duckdb" / "warehouse.db"
 
+# Bronze table columns, in raw file order (load metadata columns are appended)
+BRONZE_COLUMNS = {
+    "sensor_logs": {
+        "machine_id": "VARCHAR",
+        "timestamp": "TIMESTAMP",
+        "temperature": "DOUBLE",
+        "pressure": "DOUBLE",
+        "energy_kwh": "DOUBLE",
+        "efficiency_percent": "DOUBLE"
+    },
+    "production_batches": {
+        "batch_id": "VARCHAR",
+        "machine_id": "VARCHAR",
+        "product_name": "VARCHAR",
+        "start_time": "TIMESTAMP",
+        "end_time": "TIMESTAMP",
+        "units_produced": "INTEGER",
+        "units_defective": "INTEGER"
+    },
+    "qc_checks": {
+        "check_id": "VARCHAR",
+        "batch_id": "VARCHAR",
+        "check_timestamp": "TIMESTAMP",
+        "inspector_id": "VARCHAR",
+        "pass_fail": "VARCHAR",
+        "defect_notes": "VARCHAR"
+    },
+    "operator_logs": {
+        "log_id": "VARCHAR",
+        "machine_id": "VARCHAR",
+        "operator_id": "VARCHAR",
+        "log_timestamp": "TIMESTAMP",
+        "action": "VARCHAR",
+        "notes": "VARCHAR"
+    }
+}
+
+
+def create_bronze_tables(con):
+    """Create the bronze schema and its raw tables if they do not exist."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS bronze")
+
+    for table, columns in BRONZE_COLUMNS.items():
+        column_defs = ",\n            ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+        con.execute(f"""
+        CREATE TABLE IF NOT EXISTS bronze.{table} (
+            {column_defs},
+            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            _source_file VARCHAR
+        )
+    """)
+
+
 def init_database():
     """Create DuckDB database and initialize schemas."""
 
@@ -27,59 +80,7 @@ def init_database():
 
     # Create bronze tables (will be populated by ingestion scripts)
     # These are raw, immutable tables with metadata
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS bronze.sensor_logs (
-            machine_id VARCHAR,
-            timestamp TIMESTAMP,
-            temperature DOUBLE,
-            pressure DOUBLE,
-            energy_kwh DOUBLE,
-            efficiency_percent DOUBLE,
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS bronze.production_batches (
-            batch_id VARCHAR,
-            machine_id VARCHAR,
-            product_name VARCHAR,
-            start_time TIMESTAMP,
-            end_time TIMESTAMP,
-            units_produced INTEGER,
-            units_defective INTEGER,
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS bronze.qc_checks (
-            check_id VARCHAR,
-            batch_id VARCHAR,
-            check_timestamp TIMESTAMP,
-            inspector_id VARCHAR,
-            pass_fail VARCHAR,
-            defect_notes VARCHAR,
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR
-        )
-    """)
-
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS bronze.operator_logs (
-            log_id VARCHAR,
-            machine_id VARCHAR,
-            operator_id VARCHAR,
-            log_timestamp TIMESTAMP,
-            action VARCHAR,
-            notes VARCHAR,
-            _loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            _source_file VARCHAR
-        )
-    """)
+    create_bronze_tables(con)
 
     print("[OK] Created bronze tables:")
     print("  - bronze.sensor_logs")
@@ -0,0 +1,170 @@
+"""
+Per-machine interval index over production batch windows.
+
+Sensor readings carry only a machine ID and a drifted timestamp. A machine's
+batches never overlap, so once they are sorted by start time each reading
+has at most two candidates: the last batch starting at or before it, and
+the next batch starting after it. Attributing n readings to m batches is
+then one binary search per reading, O(n log m), instead of testing every
+(reading, batch) pair.
+
+The index is available in two forms that apply the same rule:
+
+- build_interval_index / attribute_readings: NumPy arrays and searchsorted,
+  for data in memory (generators, benchmarks, verification).
+- attribution_sql: two DuckDB ASOF joins, for warehouse tables (the silver
+  sensor_readings build).
+
+Rule: a reading belongs to the candidate window [start_time, end_time] it is
+closest to (distance 0 inside the window), provided that distance is within
+the drift tolerance; on a tie the later batch wins.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+from data_generators.config import CHAOS_CONFIG
+
+# Default: the largest drift the generator injects
+DEFAULT_DRIFT_TOLERANCE_MINUTES = max(abs(m) for m in CHAOS_CONFIG["timestamp_drift_range"])
+
+# Distance used for a missing candidate (larger than any real one)
+NO_CANDIDATE = np.iinfo(np.int64).max
+
+
+def build_interval_index(machine_ids, start_times, end_times) -> Dict:
+    """
+    Sort batch windows by machine and start time.
+
+    Args:
+        machine_ids: Machine ID per batch
+        start_times: Batch start times (datetime64 or anything NumPy converts)
+        end_times: Batch end times
+
+    Returns:
+        {"machines", "offsets", "order", "starts", "ends"}: sorted distinct
+        machine IDs, the slice of the sorted arrays that belongs to each
+        machine, the sort permutation, and the sorted windows
+    """
+    starts = np.asarray(start_times, dtype="datetime64[ns]")
+    ends = np.asarray(end_times, dtype="datetime64[ns]")
+    machines, codes = np.unique(np.asarray(machine_ids), return_inverse=True)
+
+    order = np.lexsort((starts, codes))
+    offsets = np.searchsorted(codes[order], np.arange(len(machines) + 1))
+
+    return {
+        "machines": machines,
+        "offsets": offsets,
+        "order": order,
+        "starts": starts[order],
+        "ends": ends[order]
+    }
+
+
+def attribute_readings(index: Dict, machine_ids, timestamps,
+                       tolerance_minutes: float = DEFAULT_DRIFT_TOLERANCE_MINUTES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Attribute readings to batches with a binary search per reading.
+
+    Args:
+        index: Output of build_interval_index
+        machine_ids: Machine ID per reading
+        timestamps: Reading times
+        tolerance_minutes: Largest distance outside a batch window still attributed to it
+
+    Returns:
+        (batch positions, aligned timestamps): the position of each reading's
+        batch in the arrays passed to build_interval_index (-1 if none), and
+        the timestamps clamped into the batch window
+    """
+    machine_ids = np.asarray(machine_ids)
+    timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+    tolerance = int(tolerance_minutes * 60 * 10**9)
+
+    positions = np.full(len(timestamps), -1, dtype=np.int64)
+    aligned = timestamps.copy()
+    if len(index["machines"]) == 0 or len(timestamps) == 0:
+        return positions, aligned
+
+    # Machine code per reading (-1 for machines without batches)
+    codes = np.searchsorted(index["machines"], machine_ids)
+    codes = np.minimum(codes, len(index["machines"]) - 1)
+    codes = np.where((index["machines"][codes] == machine_ids) & ~np.isnat(timestamps), codes, -1)
+
+    reading_order = np.argsort(codes, kind="stable")
+    reading_offsets = np.searchsorted(codes[reading_order], np.arange(len(index["machines"]) + 1))
+
+    for code in range(len(index["machines"])):
+        readings = reading_order[reading_offsets[code]:reading_offsets[code + 1]]
+        lo, hi = index["offsets"][code], index["offsets"][code + 1]
+        if len(readings) == 0 or lo == hi:
+            continue
+
+        starts = index["starts"][lo:hi].astype(np.int64)
+        ends = index["ends"][lo:hi].astype(np.int64)
+        times = timestamps[readings].astype(np.int64)
+
+        # Candidates: last batch starting at or before the reading, and the next one
+        previous = np.searchsorted(starts, times, side="right") - 1
+        following = previous + 1
+        has_previous = previous >= 0
+        has_following = following < len(starts)
+
+        previous_distance = np.where(
+            has_previous, np.maximum(times - ends[np.maximum(previous, 0)], 0), NO_CANDIDATE
+        )
+        following_distance = np.where(
+            has_following, starts[np.minimum(following, len(starts) - 1)] - times, NO_CANDIDATE
+        )
+
+        use_following = following_distance <= previous_distance
+        chosen = np.where(use_following, following, previous)
+        distance = np.where(use_following, following_distance, previous_distance)
+        matched = distance <= tolerance
+
+        batches = chosen[matched]
+        positions[readings[matched]] = index["order"][lo + batches]
+        aligned[readings[matched]] = np.clip(times[matched], starts[batches], ends[batches]).astype("datetime64[ns]")
+
+    return positions, aligned
+
+
+def attribution_sql(readings: str, batches: str, key: str = "_row", machine: str = "machine_id",
+                    timestamp: str = "timestamp",
+                    tolerance_minutes: float = DEFAULT_DRIFT_TOLERANCE_MINUTES) -> str:
+    """
+    Build a DuckDB query attributing readings to batches with ASOF joins.
+
+    One ASOF join finds each reading's last batch starting at or before it,
+    another the next batch starting after it; the closer one within the
+    tolerance is kept. Readings without a batch are left out.
+
+    Args:
+        readings: Readings relation (table name or parenthesized query)
+        batches: Batches relation with machine_id, batch_id, start_time, end_time
+        key: Unique reading column to return
+        machine: Machine ID column of the readings
+        timestamp: Time column of the readings
+        tolerance_minutes: Largest distance outside a batch window still attributed to it
+
+    Returns:
+        SQL returning (key, batch_id, start_time, end_time)
+    """
+    tolerance = f"to_microseconds(CAST({tolerance_minutes * 60 * 10**6} AS BIGINT))"
+    candidate = """
+            SELECT r.{key}, b.batch_id, b.start_time, b.end_time,
+                   greatest(b.start_time - r.{timestamp}, r.{timestamp} - b.end_time, INTERVAL 0 SECOND) AS _distance
+            FROM {readings} r
+            ASOF JOIN {batches} b ON b.machine_id = r.{machine} AND r.{timestamp} {op} b.start_time"""
+
+    return f"""
+        SELECT {key}, batch_id, start_time, end_time
+        FROM (
+            {candidate.format(key=key, timestamp=timestamp, readings=readings, batches=batches, machine=machine, op=">=")}
+            UNION ALL
+            {candidate.format(key=key, timestamp=timestamp, readings=readings, batches=batches, machine=machine, op="<")}
+        )
+        WHERE _distance <= {tolerance}
+        QUALIFY row_number() OVER (PARTITION BY {key} ORDER BY _distance, start_time DESC) = 1
+    """
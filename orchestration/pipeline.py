@@ -0,0 +1,424 @@
+"""
+Run the medallion pipeline as a task graph: generate -> ingest -> silver ->
+gold -> reconcile.
+
+Tasks and their dependencies:
+
+- generate:<date>     one per production date (data_generators.generate_data)
+- ingest:<date>       one per raw partition, after every generate task that
+                      writes into it (its own date, plus the late drops of
+                      the days before; partitions up to late_arrival_days past
+                      the last date are included so every drop is loaded)
+- silver              after every ingest task (silver builds are global and
+                      incremental, see build_silver.py)
+- gold                after silver (refreshes the dates silver changed)
+- reconcile:<date>    one per production date, after gold
+
+Generate tasks run in a pool of worker processes. Warehouse tasks run one
+at a time on a single connection (DuckDB allows one writer), overlapping
+with generation of later dates: ingest:<date> starts as soon as its inputs
+exist.
+
+Every task has a fingerprint of its inputs: the generation settings and
+machine layout, the size and mtime of a partition's raw files, the bronze
+load watermarks, silver's change log, the truth files. A task whose last run
+succeeded with the same fingerprint is skipped. Task state is kept in a
+SQLite file next to the warehouse, written as each task starts and ends, so
+after a failure (or a crash) rerunning the same command resumes with the
+failed task instead of recomputing upstream work. Tasks downstream of a
+failure are marked blocked; independent tasks still run.
+
+Usage:
+    python -m orchestration.pipeline                                  # START_DATE..END_DATE
+    python -m orchestration.pipeline --start 2025-12-01 --end 2025-12-07 --workers 4
+    python -m orchestration.pipeline --force                          # rerun every task
+"""
+import os
+import sys
+import json
+import uuid
+import sqlite3
+import hashlib
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date as date_type, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+
+from data_generators.config import (
+    MACHINES, START_DATE, END_DATE, RANDOM_SEED, RAW_DATA_DIR, GROUND_TRUTH_DIR, CHAOS_CONFIG
+)
+from data_generators.generate_data import ENGINES, generate_day
+from data_generators.output_formats import FORMATS
+from data_generators.factory_config import apply_factory_config_file, ENV_VAR as FACTORY_CONFIG_ENV_VAR
+from orchestration.init_database import DB_PATH, BRONZE_COLUMNS, create_bronze_tables
+from orchestration.ingest_bronze import create_manifest_table, partition_files, load_day, source_name
+from orchestration.build_silver import build_silver, create_silver_tables
+from orchestration.build_gold import refresh_gold
+from orchestration.reconcile import reconcile, parse_date
+
+STAGES = ("generate", "ingest", "silver", "gold", "reconcile")
+
+# Task outcomes
+SUCCEEDED, SKIPPED, FAILED, BLOCKED, RUNNING = "succeeded", "skipped", "failed", "blocked", "running"
+
+# Pipeline state file (next to the warehouse unless --state is given)
+STATE_FILE_NAME = "pipeline_state.db"
+
+# Days a record may arrive after its production date
+MAX_LATE_DAYS = CHAOS_CONFIG["late_arrival_days"][1]
+
+
+# ============================================================================
+# TASK GRAPH
+# ============================================================================
+
+
+def build_graph(dates: List[date_type]) -> Dict[str, Dict]:
+    """
+    Build the task graph for a range of production dates.
+
+    Args:
+        dates: Production dates, oldest first
+
+    Returns:
+        {task_id: {"stage", "date", "deps"}} in dispatch order
+    """
+    tasks = {}
+    for day in dates:
+        tasks[f"generate:{day}"] = {"stage": "generate", "date": day, "deps": []}
+
+    # Arrival partitions: every production date, plus the days late drops of the last ones land on
+    arrivals = dates + [dates[-1] + timedelta(days=offset) for offset in range(1, MAX_LATE_DAYS + 1)]
+    for day in arrivals:
+        sources = [day - timedelta(days=offset) for offset in range(MAX_LATE_DAYS + 1)]
+        tasks[f"ingest:{day}"] = {
+            "stage": "ingest", "date": day,
+            "deps": [f"generate:{source}" for source in sources if f"generate:{source}" in tasks]
+        }
+
+    tasks["silver"] = {"stage": "silver", "date": None, "deps": [f"ingest:{day}" for day in arrivals]}
+    tasks["gold"] = {"stage": "gold", "date": None, "deps": ["silver"]}
+    for day in dates:
+        tasks[f"reconcile:{day}"] = {"stage": "reconcile", "date": day, "deps": ["gold"]}
+    return tasks
+
+
+def fingerprint(parts) -> str:
+    """Hash a JSON-serializable description of a task's inputs."""
+    return hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def generate_fingerprint(day: date_type, options: Dict) -> Optional[str]:
+    """
+    Fingerprint a generate task: its settings and the machine layout.
+
+    Returns None (always run) when the day's ground truth is missing.
+    """
+    if not (GROUND_TRUTH_DIR / day.strftime("%Y-%m-%d") / "truth.json").exists():
+        return None
+    return fingerprint({"date": day, "options": options, "machines": MACHINES})
+
+
+def warehouse_fingerprint(con, task: Dict) -> str:
+    """
+    Fingerprint a warehouse task from the state of its inputs.
+
+    Args:
+        con: DuckDB connection
+        task: Task from build_graph
+
+    Returns:
+        Fingerprint
+    """
+    stage, day = task["stage"], task["date"]
+
+    if stage == "ingest":
+        files = [(source_name(path), path.stat().st_size, path.stat().st_mtime)
+                 for _, path in partition_files(RAW_DATA_DIR / day.strftime("%Y-%m-%d"))]
+        return fingerprint(files)
+
+    if stage == "silver":
+        loads = [con.execute(f"SELECT max(_loaded_at), count(*) FROM bronze.{table}").fetchone()
+                 for table in BRONZE_COLUMNS]
+        files = con.execute("SELECT count(*), max(loaded_at) FROM bronze._ingest_manifest").fetchone()
+        return fingerprint([loads, files])
+
+    if stage == "gold":
+        return fingerprint(con.execute("SELECT max(built_at), count(*) FROM silver._changed_dates").fetchone())
+
+    truth = GROUND_TRUTH_DIR / day.strftime("%Y-%m-%d") / "truth.json"
+    changed = con.execute("SELECT max(built_at) FROM silver._changed_dates WHERE production_date = ?",
+                          [day]).fetchone()[0]
+    return fingerprint([changed, truth.stat().st_mtime if truth.exists() else None])
+
+
+# ============================================================================
+# TASK EXECUTION
+# ============================================================================
+
+
+def run_generate(day: date_type, options: Dict):
+    """Generate one day (runs in a worker process)."""
+    generate_day(datetime.combine(day, datetime.min.time()), **options)
+
+
+def run_warehouse_task(con, task: Dict, previous: Optional[Dict], force: bool = False) -> Dict:
+    """
+    Run a warehouse task unless its inputs are unchanged since its last success.
+
+    Args:
+        con: DuckDB connection (used by one task at a time)
+        task: Task from build_graph
+        previous: Last recorded state of the task (None = never run)
+        force: Run even if the fingerprint matches
+
+    Returns:
+        {"status", "fingerprint"}
+    """
+    current = warehouse_fingerprint(con, task)
+    if not force and previous and previous["status"] in (SUCCEEDED, SKIPPED) and previous["fingerprint"] == current:
+        return {"status": SKIPPED, "fingerprint": current}
+
+    stage, day = task["stage"], task["date"]
+    if stage == "ingest":
+        load_day(con, day.strftime("%Y-%m-%d"))
+    elif stage == "silver":
+        build_silver(con)
+    elif stage == "gold":
+        refresh_gold(con)
+    else:
+        result = reconcile(con, day, day)
+        if result.empty:
+            raise RuntimeError(f"No ground truth for {day}")
+        mismatches = int((~result["matched"]).sum())
+        if mismatches:
+            raise RuntimeError(f"{mismatches} value(s) outside tolerance")
+
+    # Running a task can change its own inputs (e.g. silver's change log); record them as of now
+    return {"status": SUCCEEDED, "fingerprint": warehouse_fingerprint(con, task)}
+
+
+# ============================================================================
+# RUN STATE
+# ============================================================================
+
+
+def open_state(path: Path) -> sqlite3.Connection:
+    """Open (and create) the pipeline state database."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = sqlite3.connect(str(path), timeout=30)
+    state.row_factory = sqlite3.Row
+    state.executescript("""
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id TEXT PRIMARY KEY,
+            started_at TEXT,
+            finished_at TEXT,
+            first_date TEXT,
+            last_date TEXT,
+            succeeded INTEGER,
+            skipped INTEGER,
+            failed INTEGER,
+            blocked INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS task_runs (
+            task_id TEXT PRIMARY KEY,
+            stage TEXT,
+            partition_date TEXT,
+            status TEXT,
+            fingerprint TEXT,
+            run_id TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            duration_seconds REAL,
+            error TEXT
+        );
+    """)
+    return state
+
+
+def task_state(state: sqlite3.Connection, task_id: str) -> Optional[Dict]:
+    """Return a task's last recorded state."""
+    row = state.execute("SELECT * FROM task_runs WHERE task_id = ?", [task_id]).fetchone()
+    return dict(row) if row else None
+
+
+def record_task(state: sqlite3.Connection, task_id: str, task: Dict, run_id: str, status: str,
+                fingerprint_value: Optional[str] = None, started_at: Optional[datetime] = None,
+                duration: Optional[float] = None, error: Optional[str] = None):
+    """Write a task's state (kept fingerprint when none is given, e.g. for failures)."""
+    with state:
+        state.execute("""
+            INSERT INTO task_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (task_id) DO UPDATE SET
+                status = excluded.status,
+                fingerprint = coalesce(excluded.fingerprint, fingerprint),
+                run_id = excluded.run_id,
+                started_at = excluded.started_at,
+                finished_at = excluded.finished_at,
+                duration_seconds = excluded.duration_seconds,
+                error = excluded.error
+        """, [task_id, task["stage"], str(task["date"]) if task["date"] else None, status, fingerprint_value,
+              run_id, started_at.isoformat() if started_at else None,
+              datetime.utcnow().isoformat() if status != RUNNING else None, duration, error])
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+
+def run_pipeline(dates: List[date_type], con, state: sqlite3.Connection, workers: int = 1,
+                 options: Optional[Dict] = None, force: bool = False) -> Dict[str, str]:
+    """
+    Run the task graph for a range of production dates.
+
+    Args:
+        dates: Production dates, oldest first
+        con: DuckDB warehouse connection
+        state: Pipeline state database (see open_state)
+        workers: Worker processes for generate tasks
+        options: Keyword arguments for generate_day (engine, seed, output_format, late_arrivals)
+        force: Run every task even if its inputs are unchanged
+
+    Returns:
+        Outcome per task ID
+    """
+    options = options or {}
+    tasks = build_graph(dates)
+    run_id = uuid.uuid4().hex[:12]
+    run_started = datetime.utcnow()
+    outcomes = {}
+
+    create_bronze_tables(con)
+    create_manifest_table(con)
+    create_silver_tables(con)
+
+    def finish(task_id, status, fingerprint_value=None, started_at=None, duration=None, error=None):
+        outcomes[task_id] = status
+        record_task(state, task_id, tasks[task_id], run_id, status, fingerprint_value, started_at, duration, error)
+        detail = f" ({duration:.2f}s)" if duration is not None else ""
+        print(f"[{status.upper()}] {task_id}{detail}" + (f": {error}" if error else ""))
+
+    # Tasks are only submitted when their lane has room, so a task's clock starts when it does
+    capacity = {"generate": workers, "warehouse": 1}
+    busy = {lane: 0 for lane in capacity}
+    pending = dict(tasks)
+    running = {}
+    with ProcessPoolExecutor(max_workers=workers) as generators, ThreadPoolExecutor(max_workers=1) as warehouse:
+        while pending or running:
+            for task_id, task in list(pending.items()):
+                deps = [outcomes.get(dep) for dep in task["deps"]]
+                if any(outcome in (FAILED, BLOCKED) for outcome in deps):
+                    del pending[task_id]
+                    finish(task_id, BLOCKED)
+                    continue
+                if not all(outcome in (SUCCEEDED, SKIPPED) for outcome in deps):
+                    continue
+
+                previous = task_state(state, task_id)
+                lane = "generate" if task["stage"] == "generate" else "warehouse"
+                if lane == "generate":
+                    current = generate_fingerprint(task["date"], options)
+                    if not force and current and previous and previous["status"] in (SUCCEEDED, SKIPPED) \
+                            and previous["fingerprint"] == current:
+                        del pending[task_id]
+                        finish(task_id, SKIPPED, current)
+                        continue
+                if busy[lane] >= capacity[lane]:
+                    continue
+
+                del pending[task_id]
+                started_at = datetime.utcnow()
+                if lane == "generate":
+                    future = generators.submit(run_generate, task["date"], options)
+                else:
+                    future = warehouse.submit(run_warehouse_task, con, task, previous, force)
+
+                record_task(state, task_id, task, run_id, RUNNING, started_at=started_at)
+                running[future] = (task_id, lane, started_at, time.perf_counter())
+                busy[lane] += 1
+
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_id, lane, started_at, started = running.pop(future)
+                busy[lane] -= 1
+                duration = time.perf_counter() - started
+                try:
+                    result = future.result()
+                except Exception as e:
+                    finish(task_id, FAILED, started_at=started_at, duration=duration, error=f"{type(e).__name__}: {e}")
+                    continue
+
+                if tasks[task_id]["stage"] == "generate":
+                    result = {"status": SUCCEEDED, "fingerprint": generate_fingerprint(tasks[task_id]["date"], options)}
+                finish(task_id, result["status"], result["fingerprint"], started_at,
+                       duration if result["status"] == SUCCEEDED else None)
+
+    counts = {status: sum(1 for outcome in outcomes.values() if outcome == status)
+              for status in (SUCCEEDED, SKIPPED, FAILED, BLOCKED)}
+    with state:
+        state.execute("INSERT INTO pipeline_runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                      [run_id, run_started.isoformat(), datetime.utcnow().isoformat(), str(dates[0]), str(dates[-1]),
+                       counts[SUCCEEDED], counts[SKIPPED], counts[FAILED], counts[BLOCKED]])
+    return outcomes
+
+
+def main() -> int:
+    """Main entry point (returns the process exit status)."""
+    parser = argparse.ArgumentParser(description="Run generate -> ingest -> silver -> gold -> reconcile")
+    parser.add_argument("--start", type=parse_date, help="First production date (default START_DATE)")
+    parser.add_argument("--end", type=parse_date, help="Last production date (default END_DATE)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for generation")
+    parser.add_argument("--force", action="store_true", help="Rerun tasks whose inputs are unchanged")
+    parser.add_argument("--engine", choices=ENGINES, default="python", help="Batch generation engine")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="Global random seed")
+    parser.add_argument("--format", dest="output_format", choices=FORMATS, help="Raw file format")
+    parser.add_argument("--late-arrivals", action="store_true",
+                        help="Hold back ~10%% of records for drops 1-2 days later")
+    parser.add_argument("--config", type=str, help="Factory layout file (YAML/TOML) with machine templates")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    parser.add_argument("--state", type=Path, help=f"Pipeline state file (default: {STATE_FILE_NAME} next to --db)")
+    args = parser.parse_args()
+
+    if args.config:
+        # Exported so worker processes load the same layout
+        os.environ[FACTORY_CONFIG_ENV_VAR] = args.config
+        apply_factory_config_file(args.config)
+
+    start, end = args.start or START_DATE, args.end or END_DATE
+    dates = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    if not dates:
+        print("[ERROR] --end is before --start")
+        return 1
+
+    args.db.parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(args.db))
+    state = open_state(args.state or args.db.parent / STATE_FILE_NAME)
+    options = {"engine": args.engine, "seed": args.seed, "output_format": args.output_format,
+               "late_arrivals": args.late_arrivals}
+
+    print(f"Running pipeline for {dates[0]} to {dates[-1]} ({len(dates)} day(s), {args.workers} worker(s))...")
+    started = time.perf_counter()
+    outcomes = run_pipeline(dates, con, state, workers=args.workers, options=options, force=args.force)
+    elapsed = time.perf_counter() - started
+    con.close()
+    state.close()
+
+    summary = ", ".join(f"{sum(1 for o in outcomes.values() if o == status)} {status}"
+                        for status in (SUCCEEDED, SKIPPED, FAILED, BLOCKED))
+    if any(outcome in (FAILED, BLOCKED) for outcome in outcomes.values()):
+        print(f"\n[FAILED] {summary} in {elapsed:.2f}s; rerun to resume")
+        return 1
+    print(f"\n[SUCCESS] {summary} in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""
+Reconcile the gold layer against ground truth.
+
+Every ground_truth/<date>/truth.json in the requested range is compared to
+the gold KPI tables in one DuckDB query. The query scans the truth files in
+parallel with read_json, unnests the per-machine and per-product maps, and
+full-outer-joins both sides on (date, level, key, metric). The levels are:
+
+- factory: daily totals (truth factory_totals vs the sum of gold machines)
+- machine: truth by_machine vs gold.machine_daily_kpis
+- product: truth by_product vs gold.product_daily_kpis
+
+A value matches when |gold - truth| <= tolerance x |truth| (default 2%, the
+project's validation margin). Rows present on one side only never match.
+Energy is not reconciled: truth energy is derived from machine config,
+while gold energy is what the sensors metered.
+
+Usage:
+    python -m orchestration.reconcile                               # every truth date
+    python -m orchestration.reconcile --start 2025-12-01 --end 2025-12-07
+    python -m orchestration.reconcile --tolerance 0                 # exact match
+
+Exits with status 1 when any value is outside its tolerance.
+"""
+import argparse
+import sys
+import time
+from datetime import date as date_type, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+
+from data_generators.config import GROUND_TRUTH_DIR
+from orchestration.init_database import DB_PATH
+
+# Relative tolerance per metric
+DEFAULT_TOLERANCES = {
+    "batches": 0.02,
+    "units_produced": 0.02,
+    "units_defective": 0.02
+}
+
+TOTALS_TYPE = "STRUCT(batches BIGINT, units_produced BIGINT, units_defective BIGINT)"
+
+TRUTH_COLUMNS = {
+    "date": "DATE",
+    "total_batches": "BIGINT",
+    "by_machine": f"MAP(VARCHAR, {TOTALS_TYPE})",
+    "by_product": f"MAP(VARCHAR, {TOTALS_TYPE})",
+    "factory_totals": "STRUCT(units_produced BIGINT, units_defective BIGINT)"
+}
+
+# Mismatches listed by the CLI
+DEFAULT_SHOW = 20
+
+
+def truth_files(start: Optional[date_type] = None, end: Optional[date_type] = None) -> List[str]:
+    """
+    List the truth.json files whose date lies in a range.
+
+    Args:
+        start: First date (inclusive, default = earliest)
+        end: Last date (inclusive, default = latest)
+
+    Returns:
+        File paths, oldest first
+    """
+    files = []
+    for directory in sorted(GROUND_TRUTH_DIR.glob("????-??-??")):
+        day = datetime.strptime(directory.name, "%Y-%m-%d").date()
+        if (start and day < start) or (end and day > end):
+            continue
+        if (directory / "truth.json").exists():
+            files.append((directory / "truth.json").as_posix())
+    return files
+
+
+def reconcile(con, start: Optional[date_type] = None, end: Optional[date_type] = None,
+              tolerances: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """
+    Compare gold aggregates with ground truth for a date range in one query.
+
+    Only dates with a truth file are compared.
+
+    Args:
+        con: DuckDB connection holding the gold tables
+        start: First date (inclusive, default = earliest truth date)
+        end: Last date (inclusive, default = latest truth date)
+        tolerances: Relative tolerance per metric (default DEFAULT_TOLERANCES)
+
+    Returns:
+        One row per (date, level, key, metric): truth, gold, diff,
+        relative_diff, tolerance and matched
+    """
+    tolerances = {**DEFAULT_TOLERANCES, **(tolerances or {})}
+    files = truth_files(start, end)
+    if not files:
+        return pd.DataFrame(columns=["date", "level", "key", "metric", "truth", "gold",
+                                     "diff", "relative_diff", "tolerance", "matched"])
+
+    column_types = "{" + ", ".join(f"'{name}': '{sql_type}'" for name, sql_type in TRUTH_COLUMNS.items()) + "}"
+    metrics = ", ".join(tolerances)
+    con.register("_tolerances", pa.table({"metric": list(tolerances), "tolerance": list(tolerances.values())}))
+
+    try:
+        result = con.execute(f"""
+            WITH truth AS (
+                SELECT * FROM read_json(?, format = 'auto', columns = {column_types})
+            ),
+            truth_wide AS (
+                SELECT date, 'factory' AS level, 'all' AS key, total_batches AS batches,
+                       factory_totals.units_produced AS units_produced,
+                       factory_totals.units_defective AS units_defective
+                FROM truth
+                UNION ALL
+                SELECT date, 'machine', entry.key, entry.value.batches,
+                       entry.value.units_produced, entry.value.units_defective
+                FROM (SELECT date, unnest(map_entries(by_machine)) AS entry FROM truth)
+                UNION ALL
+                SELECT date, 'product', entry.key, entry.value.batches,
+                       entry.value.units_produced, entry.value.units_defective
+                FROM (SELECT date, unnest(map_entries(by_product)) AS entry FROM truth)
+            ),
+            gold_wide AS (
+                SELECT production_date AS date, 'factory' AS level, 'all' AS key,
+                       sum(batches) AS batches, sum(units_produced) AS units_produced,
+                       sum(units_defective) AS units_defective
+                FROM gold.machine_daily_kpis
+                GROUP BY production_date
+                UNION ALL
+                SELECT production_date, 'machine', machine_id, batches, units_produced, units_defective
+                FROM gold.machine_daily_kpis
+                UNION ALL
+                SELECT production_date, 'product', product_name, batches, units_produced, units_defective
+                FROM gold.product_daily_kpis
+            ),
+            truth_long AS (
+                UNPIVOT truth_wide ON {metrics} INTO NAME metric VALUE truth
+            ),
+            gold_long AS (
+                UNPIVOT (SELECT * FROM gold_wide WHERE date IN (SELECT date FROM truth))
+                ON {metrics} INTO NAME metric VALUE gold
+            ),
+            compared AS (
+                SELECT coalesce(t.date, g.date) AS date,
+                       coalesce(t.level, g.level) AS level,
+                       coalesce(t.key, g.key) AS key,
+                       coalesce(t.metric, g.metric) AS metric,
+                       CAST(t.truth AS DOUBLE) AS truth,
+                       CAST(g.gold AS DOUBLE) AS gold
+                FROM truth_long t
+                FULL OUTER JOIN gold_long g
+                  ON g.date = t.date AND g.level = t.level AND g.key = t.key AND g.metric = t.metric
+            )
+            SELECT c.*,
+                   c.gold - c.truth AS diff,
+                   abs(c.gold - c.truth) / nullif(abs(c.truth), 0) AS relative_diff,
+                   tol.tolerance,
+                   coalesce(abs(c.gold - c.truth) <= tol.tolerance * abs(c.truth), false) AS matched
+            FROM compared c
+            JOIN _tolerances tol ON tol.metric = c.metric
+            ORDER BY date, level, key, metric
+        """, [files]).df()
+    finally:
+        con.unregister("_tolerances")
+
+    result["date"] = result["date"].dt.date
+    return result
+
+
+def summarize(result: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize a reconciliation per level and metric.
+
+    Args:
+        result: Output of reconcile
+
+    Returns:
+        One row per (level, metric): compared, mismatched, max_relative_diff
+    """
+    return result.groupby(["level", "metric"], sort=True).agg(
+        compared=("matched", "size"),
+        mismatched=("matched", lambda matched: int((~matched).sum())),
+        max_relative_diff=("relative_diff", "max")
+    ).reset_index()
+
+
+def parse_date(value: str) -> date_type:
+    """Parse a YYYY-MM-DD command line date."""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main entry point (returns the process exit status)."""
+    parser = argparse.ArgumentParser(description="Reconcile gold KPIs against ground truth")
+    parser.add_argument("--start", type=parse_date, help="First date (YYYY-MM-DD); default is the earliest truth date")
+    parser.add_argument("--end", type=parse_date, help="Last date (YYYY-MM-DD); default is the latest truth date")
+    parser.add_argument("--tolerance", type=float, help="Relative tolerance for every metric (default 0.02)")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW, help="Mismatches to list")
+    parser.add_argument("--threads", type=int, help="DuckDB threads (default: all cores)")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"[ERROR] No warehouse at {args.db}; run ingest_bronze, build_silver and build_gold first")
+        return 1
+
+    con = duckdb.connect(str(args.db), read_only=True)
+    if args.threads:
+        con.execute(f"SET threads = {args.threads}")
+
+    tolerances = {metric: args.tolerance for metric in DEFAULT_TOLERANCES} if args.tolerance is not None else None
+    started = time.perf_counter()
+    result = reconcile(con, args.start, args.end, tolerances)
+    elapsed = time.perf_counter() - started
+    con.close()
+
+    if result.empty:
+        print("[SKIP] No ground truth in the requested range")
+        return 0
+
+    dates = result["date"].nunique()
+    print(f"Reconciled {dates} day(s) ({result['date'].min()} to {result['date'].max()}), "
+          f"{len(result)} values in {elapsed:.2f}s\n")
+
+    for row in summarize(result).itertuples():
+        status = "[OK]" if row.mismatched == 0 else "[MISMATCH]"
+        max_diff = 0.0 if pd.isna(row.max_relative_diff) else row.max_relative_diff
+        print(f"{status} {row.level:<8} {row.metric:<16} {row.compared:>6} compared, "
+              f"{row.mismatched} outside tolerance (max diff {max_diff:.2%})")
+
+    mismatches = result[~result["matched"]]
+    if mismatches.empty:
+        print("\n[SUCCESS] Gold matches ground truth")
+        return 0
+
+    print(f"\n{len(mismatches)} mismatch(es):")
+    for row in mismatches.head(args.show).itertuples():
+        truth = "missing" if pd.isna(row.truth) else f"{row.truth:g}"
+        gold = "missing" if pd.isna(row.gold) else f"{row.gold:g}"
+        print(f"  {row.date} {row.level} {row.key} {row.metric}: gold {gold} vs truth {truth}")
+    if len(mismatches) > args.show:
+        print(f"  ... {len(mismatches) - args.show} more")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,18 +4,42 @@ Daily Data Generation Scheduler using APScheduler.
 This script runs as a long-running process to automatically generate
 factory simulation data daily at a specified time.
 
+Every generated (and, with --load, loaded) date is recorded in a run ledger,
+a SQLite file next to raw_data/: when it ran, which process ran it, how long
+it took and whether it failed. On startup, and again at every daily run, the
+scheduler catches up: each due date after the last successful one (and any
+earlier date in the backfill window that failed) is generated in a bounded
+pool of worker processes. A worker claims its date in the ledger right
+before generating it, so two scheduler instances sharing a data root never
+generate the same day; a claim older than CLAIM_TIMEOUT is treated as
+abandoned.
+
 Usage:
     python scheduler.py
+    python scheduler.py --workers 4 --max-backfill-days 14
+    python scheduler.py --since 2025-12-01 --load     # backfill from a date and load bronze
 
 To stop: Press Ctrl+C
 """
+import os
+import socket
 import logging
-from datetime import datetime
+import sqlite3
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date as date_type, datetime, time as time_type, timedelta
 from pathlib import Path
+from typing import List, Optional
+
+import duckdb
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from data_generators.config import DATA_ROOT, RAW_DATA_DIR, CHAOS_CONFIG
 from data_generators.generate_data import generate_day
+from orchestration.init_database import DB_PATH, create_bronze_tables
+from orchestration.ingest_bronze import create_manifest_table, load_day
 
 # Create logs directory if it doesn't exist
 LOG_DIR = Path(__file__).parent / "logs"
@@ -32,53 +56,386 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Daily run time; a date becomes due once this time has passed on that day
+RUN_AT = time_type(hour=9, minute=0)
+
+LEDGER_PATH = DATA_ROOT / "scheduler_ledger.db"
+
+# Ledger stages and statuses
+GENERATE, LOAD = "generate", "load"
+RUNNING, SUCCEEDED, FAILED = "running", "succeeded", "failed"
+
+# A claim this old belongs to a scheduler that died mid-run
+CLAIM_TIMEOUT = timedelta(hours=1)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_BACKFILL_DAYS = 30
+
+# Late drops of a date land in the raw partitions of the following days
+MAX_LATE_DAYS = CHAOS_CONFIG["late_arrival_days"][1]
+
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+
+# =============================================================================
+# RUN LEDGER
+# =============================================================================
+
+def open_ledger(path: Path = LEDGER_PATH) -> sqlite3.Connection:
+    """
+    Open (and create) the run ledger.
+
+    The connection is in autocommit mode so claims can take the write lock
+    explicitly with BEGIN IMMEDIATE.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ledger = sqlite3.connect(str(path), timeout=30, isolation_level=None)
+    ledger.row_factory = sqlite3.Row
+    ledger.execute("""
+        CREATE TABLE IF NOT EXISTS scheduler_runs (
+            run_date TEXT,
+            stage TEXT,
+            status TEXT,
+            owner TEXT,
+            attempts INTEGER,
+            started_at TEXT,
+            finished_at TEXT,
+            duration_seconds REAL,
+            error TEXT,
+            PRIMARY KEY (run_date, stage)
+        )
+    """)
+    return ledger
+
+
+def claim_date(ledger: sqlite3.Connection, day: date_type, stage: str = GENERATE, owner: str = OWNER) -> bool:
+    """
+    Claim a date for a scheduler.
+
+    The check and the claim run in one write transaction, so of two
+    schedulers racing for the same date exactly one wins.
+
+    Args:
+        ledger: Ledger connection (see open_ledger)
+        day: Date to claim
+        stage: Ledger stage
+        owner: Claiming scheduler
+
+    Returns:
+        True if claimed; False if the date already succeeded or another
+        process holds a live claim on it
+    """
+    now = datetime.utcnow()
+    ledger.execute("BEGIN IMMEDIATE")
+    try:
+        row = ledger.execute(
+            "SELECT status, started_at FROM scheduler_runs WHERE run_date = ? AND stage = ?",
+            [day.isoformat(), stage]
+        ).fetchone()
+        if row and (row["status"] == SUCCEEDED or (
+                row["status"] == RUNNING and now - datetime.fromisoformat(row["started_at"]) < CLAIM_TIMEOUT)):
+            ledger.execute("COMMIT")
+            return False
+
+        ledger.execute("""
+            INSERT INTO scheduler_runs (run_date, stage, status, owner, attempts, started_at)
+            VALUES (?, ?, ?, ?, 1, ?)
+            ON CONFLICT (run_date, stage) DO UPDATE SET
+                status = excluded.status,
+                owner = excluded.owner,
+                attempts = scheduler_runs.attempts + 1,
+                started_at = excluded.started_at,
+                finished_at = NULL,
+                duration_seconds = NULL,
+                error = NULL
+        """, [day.isoformat(), stage, RUNNING, owner, now.isoformat()])
+        ledger.execute("COMMIT")
+        return True
+    except Exception:
+        ledger.execute("ROLLBACK")
+        raise
+
+
+def finish_date(ledger: sqlite3.Connection, day: date_type, stage: str, status: str,
+                duration: Optional[float] = None, error: Optional[str] = None, owner: str = OWNER):
+    """
+    Record the outcome of a claimed date.
+
+    Only the claim's owner can finish it: if the claim timed out and another
+    process took the date over, the late result is dropped.
+    """
+    ledger.execute("""
+        UPDATE scheduler_runs
+        SET status = ?, finished_at = ?, duration_seconds = ?, error = ?
+        WHERE run_date = ? AND stage = ? AND owner = ?
+    """, [status, datetime.utcnow().isoformat(), duration, error, day.isoformat(), stage, owner])
+
+
+def record_date(ledger: sqlite3.Connection, day: date_type, stage: str, status: str,
+                started_at: datetime, duration: float, error: Optional[str] = None):
+    """Record an unclaimed run (loads are serialized by the warehouse itself)."""
+    ledger.execute("""
+        INSERT INTO scheduler_runs (run_date, stage, status, owner, attempts, started_at,
+                                    finished_at, duration_seconds, error)
+        VALUES (?, ?, ?, ?, 1, ?, ?, ?, ?)
+        ON CONFLICT (run_date, stage) DO UPDATE SET
+            status = excluded.status,
+            owner = excluded.owner,
+            attempts = scheduler_runs.attempts + 1,
+            started_at = excluded.started_at,
+            finished_at = excluded.finished_at,
+            duration_seconds = excluded.duration_seconds,
+            error = excluded.error
+    """, [day.isoformat(), stage, status, OWNER, started_at.isoformat(),
+          datetime.utcnow().isoformat(), duration, error])
+
+
+# =============================================================================
+# CATCH-UP
+# =============================================================================
+
+def last_due_date(now: datetime) -> date_type:
+    """The latest date whose daily run time has passed."""
+    return now.date() if now.time() >= RUN_AT else now.date() - timedelta(days=1)
+
 
-def daily_generation_job():
+def due_dates(ledger: sqlite3.Connection, now: datetime, max_backfill_days: int = DEFAULT_MAX_BACKFILL_DAYS,
+              since: Optional[date_type] = None) -> List[date_type]:
+    """
+    List the dates that should have been generated but were not.
+
+    Without a since date, the gap starts after the last successful run (or
+    at the earliest failed date in the window, if that is earlier); a fresh
+    ledger only has the latest due date. The window is capped at
+    max_backfill_days.
+
+    Args:
+        ledger: Ledger connection
+        now: Current local time
+        max_backfill_days: Oldest date to consider, in days before the latest due date
+        since: Backfill every date from this one instead
+
+    Returns:
+        Dates not yet generated successfully, oldest first
+    """
+    last_due = last_due_date(now)
+    window_start = last_due - timedelta(days=max_backfill_days - 1)
+
+    if since is None:
+        last_success, first_failed = ledger.execute("""
+            SELECT max(run_date) FILTER (WHERE status = ?),
+                   min(run_date) FILTER (WHERE status <> ?)
+            FROM scheduler_runs
+            WHERE stage = ? AND run_date >= ?
+        """, [SUCCEEDED, SUCCEEDED, GENERATE, window_start.isoformat()]).fetchone()
+        candidates = [last_due]
+        if last_success:
+            candidates.append(date_type.fromisoformat(last_success) + timedelta(days=1))
+        if first_failed:
+            candidates.append(date_type.fromisoformat(first_failed))
+        since = min(candidates)
+
+    start = max(since, window_start)
+    succeeded = {
+        row[0] for row in ledger.execute(
+            "SELECT run_date FROM scheduler_runs WHERE stage = ? AND status = ? AND run_date >= ?",
+            [GENERATE, SUCCEEDED, start.isoformat()]
+        )
+    }
+    days = (last_due - start).days + 1
+    return [day for day in (start + timedelta(days=offset) for offset in range(days))
+            if day.isoformat() not in succeeded]
+
+
+def generate_date(day: date_type, ledger_path: Path = LEDGER_PATH, owner: str = OWNER) -> Optional[float]:
+    """
+    Claim and generate one date in a worker process.
+
+    The claim is taken immediately before generating, not when the date is
+    queued, so a long backlog never holds claims that could expire while
+    they wait for a free worker.
+
+    Args:
+        day: Date to generate
+        ledger_path: Run ledger path
+        owner: Scheduler the claim is taken for
+
+    Returns:
+        Generation time in seconds, or None if the date was already generated
+        or another scheduler holds it
+    """
+    ledger = open_ledger(ledger_path)
+    try:
+        if not claim_date(ledger, day, owner=owner):
+            return None
+        started = time.perf_counter()
+        try:
+            generate_day(datetime.combine(day, time_type()))
+        except Exception as e:
+            finish_date(ledger, day, GENERATE, FAILED, time.perf_counter() - started,
+                        f"{type(e).__name__}: {e}", owner)
+            raise
+        duration = time.perf_counter() - started
+        finish_date(ledger, day, GENERATE, SUCCEEDED, duration, owner=owner)
+        return duration
+    finally:
+        ledger.close()
+
+
+def backfill(dates: List[date_type], workers: int = DEFAULT_WORKERS,
+             ledger_path: Path = LEDGER_PATH) -> List[date_type]:
+    """
+    Generate dates concurrently in a bounded process pool.
+
+    Args:
+        dates: Dates to generate
+        workers: Maximum number of concurrent generations
+        ledger_path: Run ledger path
+
+    Returns:
+        Dates generated successfully by this process
+    """
+    generated = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(dates))) as executor:
+        futures = {executor.submit(generate_date, day, ledger_path, OWNER): day for day in dates}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                duration = future.result()
+            except Exception as e:
+                logger.error(f"Data generation FAILED for {day}: {e}")
+                continue
+            if duration is None:
+                logger.info(f"Skipping {day}: already generated or claimed by another scheduler")
+                continue
+            generated.append(day)
+            logger.info(f"Generated {day} in {duration:.2f}s")
+    return sorted(generated)
+
+
+def load_dates(ledger: sqlite3.Connection, generated: List[date_type], db_path: Path = DB_PATH):
+    """
+    Load the raw partitions written by a set of generated dates into bronze.
+
+    A date's records land in its own partition and, as late drops, in the
+    partitions of the next MAX_LATE_DAYS days. Loads are incremental (see
+    ingest_bronze.load_day), so reloading a partition only reads new files.
+    """
+    partitions = sorted({day + timedelta(days=offset) for day in generated for offset in range(MAX_LATE_DAYS + 1)})
+    partitions = [day for day in partitions if (RAW_DATA_DIR / day.isoformat()).is_dir()]
+    if not partitions:
+        return
+
+    con = duckdb.connect(str(db_path))
+    try:
+        create_bronze_tables(con)
+        create_manifest_table(con)
+        for day in partitions:
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            try:
+                counts = load_day(con, day.isoformat())
+            except Exception as e:
+                record_date(ledger, day, LOAD, FAILED, started_at, time.perf_counter() - started,
+                            f"{type(e).__name__}: {e}")
+                logger.error(f"Bronze load FAILED for {day}: {e}")
+                continue
+            record_date(ledger, day, LOAD, SUCCEEDED, started_at, time.perf_counter() - started)
+            logger.info(f"Loaded {day} into bronze ({sum(counts.values())} rows)")
+    finally:
+        con.close()
+
+
+def daily_generation_job(workers: int = DEFAULT_WORKERS, max_backfill_days: int = DEFAULT_MAX_BACKFILL_DAYS,
+                         since: Optional[date_type] = None, load: bool = False, db_path: Path = DB_PATH,
+                         ledger_path: Path = LEDGER_PATH):
     """
     Daily job to generate factory simulation data.
 
-    This runs automatically at the scheduled time and generates
-    data for the current date.
+    This runs at startup and at the scheduled time. It generates every
+    due date that has not been generated yet (today's, plus any days
+    missed while the scheduler was down), not just the current date.
+
+    Args:
+        workers: Maximum number of concurrent generations
+        max_backfill_days: How far back to look for missed dates
+        since: Backfill every date from this one (first run only)
+        load: Load the generated partitions into bronze
+        db_path: Warehouse database path
+        ledger_path: Run ledger path
     """
+    ledger = open_ledger(ledger_path)
     try:
-        today = datetime.now()
+        dates = due_dates(ledger, datetime.now(), max_backfill_days, since)
+        if not dates:
+            logger.info("No missed dates; data is up to date")
+            return
+
         logger.info(f"=" * 60)
-        logger.info(f"Starting daily data generation for {today.strftime('%Y-%m-%d')}")
+        logger.info(f"Starting data generation for {len(dates)} date(s): {dates[0]} to {dates[-1]}")
         logger.info(f"=" * 60)
 
-        # Generate data for today
-        generate_day(today)
+        generated = backfill(dates, workers, ledger_path)
+        if load and generated:
+            load_dates(ledger, generated, db_path)
 
         logger.info(f"=" * 60)
-        logger.info(f"Successfully completed data generation for {today.strftime('%Y-%m-%d')}")
+        logger.info(f"Completed data generation: {len(generated)} of {len(dates)} date(s) generated")
         logger.info(f"=" * 60)
 
     except Exception as e:
         logger.error(f"Data generation FAILED: {e}", exc_info=True)
         raise
+    finally:
+        ledger.close()
 
 
 def main():
     """
     Start the APScheduler with daily data generation job.
 
-    The scheduler will run continuously and execute the job
-    daily at 9:00 AM local time.
+    Missed dates are backfilled first; the scheduler then runs
+    continuously and executes the job daily at 9:00 AM local time.
     """
+    parser = argparse.ArgumentParser(description="Generate factory data daily and backfill missed days")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent backfill generations")
+    parser.add_argument("--max-backfill-days", type=int, default=DEFAULT_MAX_BACKFILL_DAYS,
+                        help="How many days back to look for missed dates")
+    parser.add_argument("--since", type=date_type.fromisoformat,
+                        help="Backfill every date from this one (YYYY-MM-DD) at startup")
+    parser.add_argument("--load", action="store_true", help="Load generated partitions into bronze")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="Warehouse database path (with --load)")
+    parser.add_argument("--ledger", type=Path, default=LEDGER_PATH, help="Run ledger path")
+    args = parser.parse_args()
+
+    options = {
+        "workers": args.workers,
+        "max_backfill_days": args.max_backfill_days,
+        "load": args.load,
+        "db_path": args.db,
+        "ledger_path": args.ledger
+    }
+
     logger.info("=" * 70)
     logger.info("FACTORY DATA SCHEDULER STARTING")
     logger.info("=" * 70)
 
+    # Catch up on dates missed while the scheduler was down
+    daily_generation_job(since=args.since, **options)
+
     # Create scheduler
     scheduler = BlockingScheduler()
 
     # Add daily job at 9:00 AM
     scheduler.add_job(
         daily_generation_job,
-        CronTrigger(hour=9, minute=0),  # Run at 9:00 AM daily
+        CronTrigger(hour=RUN_AT.hour, minute=RUN_AT.minute),  # Run at 9:00 AM daily
+        kwargs=options,
         id='daily_factory_data',
         name='Generate Daily Factory Data',
-        replace_existing=True
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1
     )
 
     # Log scheduled jobs
@@ -2,8 +2,6 @@
 Factory Simulation Dashboard - Main Streamlit App
 """
 import streamlit as st
-import pandas as pd
-import json
 from pathlib import Path
 from datetime import datetime, timedelta
 import time
@@ -13,7 +11,18 @@ import sys
 
 # Add parent directory to path to import config
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from data_generators.config import START_DATE, END_DATE
+from data_generators.config import START_DATE, END_DATE, FACTORY, MACHINES, PRODUCTS, CHAOS_CONFIG
+from streamlit_app.data_access import day_summary, sensor_averages, chaos_metrics
+
+# Card icon per machine type
+MACHINE_ICONS = {"Smelter": "🔥", "Assembler": "⚙️"}
+
+# Summary icon per product tier
+TIER_ICONS = {"Raw": "🟤", "Intermediate": "⬜", "Final": "⚙️"}
+
+# Large layouts show a capped number of cards and chart lines per production line
+MAX_MACHINE_CARDS = 12
+MAX_CHART_MACHINES = 12
 
 # Page config
 st.set_page_config(
@@ -87,49 +96,10 @@ if 'speed' not in st.session_state:
 if 'last_update' not in st.session_state:
     st.session_state.last_update = time.time()
 
-# Data loading functions
-@st.cache_data
-def load_all_data():
-    """Load all ground truth data from START_DATE to END_DATE."""
-    data_by_day = {}
-
-    # Calculate number of days from config
-    num_days = (END_DATE - START_DATE).days + 1
-
-    for day in range(num_days):
-        date = START_DATE + timedelta(days=day)
-        date_str = date.strftime("%Y-%m-%d")
-        truth_file = Path(f"ground_truth/{date_str}/truth.json")
-
-        if truth_file.exists():
-            with open(truth_file) as f:
-                data_by_day[day + 1] = json.load(f)
-
-    return data_by_day
-
-@st.cache_data
-def load_raw_batches(day):
-    """Load raw production batches for a specific day."""
-    date = START_DATE + timedelta(days=day - 1)
-    date_str = date.strftime("%Y-%m-%d")
-    batch_file = Path(f"raw_data/{date_str}/production_batches.csv")
-
-    if batch_file.exists():
-        return pd.read_csv(batch_file)
-    return pd.DataFrame()
-
-@st.cache_data
-def load_sensor_logs(day):
-    """Load sensor logs for a specific day."""
-    date = START_DATE + timedelta(days=day - 1)
-    date_str = date.strftime("%Y-%m-%d")
-    sensor_file = Path(f"raw_data/{date_str}/sensor_logs.json")
-
-    if sensor_file.exists():
-        with open(sensor_file) as f:
-            data = json.load(f)
-        return pd.DataFrame(data)
-    return pd.DataFrame()
+# Helper functions
+def day_to_date(day):
+    """Convert a 1-based simulation day to its production date."""
+    return START_DATE + timedelta(days=day - 1)
 
 def get_machine_status(efficiency):
     """Determine machine status based on efficiency."""
@@ -140,34 +110,21 @@ def get_machine_status(efficiency):
     else:
         return "critical", "🔴", "#ef4444"
 
-def calculate_chaos_metrics(day):
-    """Calculate data quality chaos metrics."""
-    batches = load_raw_batches(day)
-    sensors = load_sensor_logs(day)
-
-    chaos = {
-        "null_count": 0,
-        "null_percent": 0,
-        "product_variations": 0,
-        "duplicates": 0,
-        "duplicate_percent": 0
-    }
-
-    if not sensors.empty:
-        null_count = sensors.isnull().sum().sum()
-        total_values = sensors.shape[0] * sensors.shape[1]
-        chaos["null_count"] = int(null_count)
-        chaos["null_percent"] = (null_count / total_values * 100) if total_values > 0 else 0
-
-    if not batches.empty:
-        chaos["product_variations"] = batches['product_name'].nunique()
-        chaos["duplicates"] = batches['batch_id'].duplicated().sum()
-        chaos["duplicate_percent"] = (chaos["duplicates"] / len(batches) * 100) if len(batches) > 0 else 0
+def expected_efficiency(machine, day):
+    """Configured efficiency of a machine on a given day (base minus degradation)."""
+    efficiency = machine['base_efficiency'] - machine['degradation_rate'] * (day - 1)
+    return max(0.5, min(1.0, efficiency))
 
-    return chaos
+def line_label(machine):
+    """Production line a machine belongs to (the default layout has a single line)."""
+    return f"{machine.get('factory_id', FACTORY['name'])} / {machine.get('line_id', 'Main Line')}"
 
-# Load data
-all_data = load_all_data()
+def group_machines_by_line():
+    """Group configured machines by production line, preserving config order."""
+    lines = {}
+    for machine in MACHINES:
+        lines.setdefault(line_label(machine), []).append(machine)
+    return lines
 
 # Calculate total number of days
 TOTAL_DAYS = (END_DATE - START_DATE).days + 1
@@ -231,12 +188,22 @@ with col4:
 st.markdown("---")
 
 # Get current day data
-current_data = all_data.get(st.session_state.current_day, {})
+current_data = day_summary(day_to_date(st.session_state.current_day))
+machines_data = current_data.get('by_machine', {})
+
+# Production lines from config; scale-out layouts have several
+LINES = group_machines_by_line()
 
 # ============================================================================
 # MAIN DASHBOARD - 4 QUADRANTS
 # ============================================================================
 
+if len(LINES) > 1:
+    selected_line = st.selectbox("Production Line:", options=list(LINES), key="line_selector")
+else:
+    selected_line = next(iter(LINES))
+line_machines = LINES[selected_line]
+
 # Top row
 top_left, top_right = st.columns([6, 4])
 
@@ -247,55 +214,54 @@ with top_left:
     st.markdown("### 🏭 PRODUCTION FLOOR")
 
     if current_data:
-        machines_data = current_data.get('by_machine', {})
-
-        # Display 3 machine cards
-        machine_cols = st.columns(3)
-
-        machine_configs = [
-            ("SMELTER-01", "🔥", machines_data.get("SMELTER-01", {})),
-            ("SMELTER-02", "🔥", machines_data.get("SMELTER-02", {})),
-            ("ASSEMBLER-01", "⚙️", machines_data.get("ASSEMBLER-01", {}))
-        ]
-
-        for idx, (machine_id, icon, data) in enumerate(machine_configs):
-            with machine_cols[idx]:
-                if data:
-                    batches = data.get('batches', 0)
-                    units = data.get('units_produced', 0)
-                    energy = data.get('energy_consumed_kwh', 0)
-
-                    # Calculate efficiency (degradation for SMELTER-02)
-                    if machine_id == "SMELTER-02":
-                        base_efficiency = 1.0 - (0.02 * (st.session_state.current_day - 1))
-                    else:
-                        base_efficiency = 0.98 if machine_id == "SMELTER-01" else 0.95
-
-                    status, status_icon, color = get_machine_status(base_efficiency)
-
-                    # Machine card
-                    st.markdown(f"""
-                    <div class="machine-card machine-{status}">
-                        <h3>{icon} {machine_id}</h3>
-                        <p><strong>Status:</strong> {status_icon} {status.upper()}</p>
-                        <p><strong>Batches:</strong> {batches}</p>
-                        <p><strong>Units:</strong> {units:,}</p>
-                        <p><strong>Energy:</strong> {energy:.2f} kWh</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-
-                    # Efficiency meter
-                    st.metric(
-                        "Efficiency",
-                        f"{base_efficiency*100:.1f}%",
-                        delta=f"{-2.0 if machine_id == 'SMELTER-02' else 0}%" if st.session_state.current_day > 1 else None,
-                        delta_color="inverse"
-                    )
-
-                    # Progress bar
-                    avg_per_batch = units / batches if batches > 0 else 0
-                    progress_val = min(avg_per_batch / 100, 1.0)
-                    st.progress(progress_val, text=f"{avg_per_batch:.0f} units/batch")
+        if len(line_machines) > MAX_MACHINE_CARDS:
+            st.caption(f"Showing {MAX_MACHINE_CARDS} of {len(line_machines)} machines on {selected_line}")
+
+        # Machine cards, three per row
+        card_machines = line_machines[:MAX_MACHINE_CARDS]
+        for row_start in range(0, len(card_machines), 3):
+            machine_cols = st.columns(3)
+
+            for idx, machine in enumerate(card_machines[row_start:row_start + 3]):
+                machine_id = machine['machine_id']
+                icon = MACHINE_ICONS.get(machine['machine_type'], "🏭")
+                data = machines_data.get(machine_id, {})
+
+                with machine_cols[idx]:
+                    if data:
+                        batches = data.get('batches', 0)
+                        units = data.get('units_produced', 0)
+                        energy = data.get('energy_consumed_kwh', 0)
+
+                        # Calculate efficiency (with configured degradation)
+                        base_efficiency = expected_efficiency(machine, st.session_state.current_day)
+                        degradation = machine['degradation_rate']
+
+                        status, status_icon, color = get_machine_status(base_efficiency)
+
+                        # Machine card
+                        st.markdown(f"""
+                        <div class="machine-card machine-{status}">
+                            <h3>{icon} {machine_id}</h3>
+                            <p><strong>Status:</strong> {status_icon} {status.upper()}</p>
+                            <p><strong>Batches:</strong> {batches}</p>
+                            <p><strong>Units:</strong> {units:,}</p>
+                            <p><strong>Energy:</strong> {energy:.2f} kWh</p>
+                        </div>
+                        """, unsafe_allow_html=True)
+
+                        # Efficiency meter
+                        st.metric(
+                            "Efficiency",
+                            f"{base_efficiency*100:.1f}%",
+                            delta=(f"{-degradation * 100:.1f}%" if degradation else "0%") if st.session_state.current_day > 1 else None,
+                            delta_color="inverse"
+                        )
+
+                        # Progress bar
+                        avg_per_batch = units / batches if batches > 0 else 0
+                        progress_val = min(avg_per_batch / 100, 1.0)
+                        st.progress(progress_val, text=f"{avg_per_batch:.0f} units/batch")
 
 # ============================================================================
 # QUADRANT 2: MACHINE HEALTH MONITOR (Top Right)
@@ -304,36 +270,22 @@ with top_right:
     st.markdown("### 📈 MACHINE HEALTH MONITOR")
 
     # Build efficiency over time chart
-    days = list(range(1, 8))
-    smelter1_eff = [0.98] * 7
-    smelter2_eff = [1.0 - (0.02 * (d-1)) for d in days]
-    assembler_eff = [0.95] * 7
+    days = list(range(1, TOTAL_DAYS + 1))
 
     fig = go.Figure()
 
-    fig.add_trace(go.Scatter(
-        x=days, y=smelter1_eff,
-        mode='lines+markers',
-        name='Smelter #1',
-        line=dict(color='#10b981', width=3),
-        marker=dict(size=8)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=days, y=smelter2_eff,
-        mode='lines+markers',
-        name='Smelter #2 (Degrading)',
-        line=dict(color='#ef4444', width=3),
-        marker=dict(size=8)
-    ))
-
-    fig.add_trace(go.Scatter(
-        x=days, y=assembler_eff,
-        mode='lines+markers',
-        name='Assembler #1',
-        line=dict(color='#3b82f6', width=3),
-        marker=dict(size=8)
-    ))
+    for machine in line_machines[:MAX_CHART_MACHINES]:
+        name = machine['machine_name']
+        if machine['degradation_rate'] > 0:
+            name += " (Degrading)"
+
+        fig.add_trace(go.Scatter(
+            x=days, y=[expected_efficiency(machine, d) for d in days],
+            mode='lines+markers',
+            name=name,
+            line=dict(width=3),
+            marker=dict(size=8)
+        ))
 
     # Add vertical line for current day
     fig.add_vline(
@@ -360,20 +312,18 @@ with top_right:
 
     # Real-time sensor gauges
     st.markdown("#### 🌡️ Real-Time Sensors (Latest Readings)")
-    sensor_data = load_sensor_logs(st.session_state.current_day)
+    sensors = sensor_averages(day_to_date(st.session_state.current_day))
 
-    if not sensor_data.empty:
+    if sensors:
         gauge_cols = st.columns(2)
 
         # Temperature gauge
         with gauge_cols[0]:
-            avg_temp = sensor_data['temperature'].dropna().mean()
-            st.metric("Avg Temperature", f"{avg_temp:.0f}°C", delta="±25°C variance")
+            st.metric("Avg Temperature", f"{sensors['temperature']:.0f}°C", delta="±25°C variance")
 
         # Pressure gauge
         with gauge_cols[1]:
-            avg_pressure = sensor_data['pressure'].dropna().mean()
-            st.metric("Avg Pressure", f"{avg_pressure:.2f} bar", delta="±0.3 variance")
+            st.metric("Avg Pressure", f"{sensors['pressure']:.2f} bar", delta="±0.3 variance")
 
 # Bottom row
 bottom_left, bottom_right = st.columns([6, 4])
@@ -387,27 +337,36 @@ with bottom_left:
     if current_data:
         products = current_data.get('by_product', {})
 
+        # Material flow for the selected line: input product -> machine -> output product
+        input_ratios = {p['canonical_name']: p.get('input_ratio', 1) for p in PRODUCTS}
+        product_nodes = [p['canonical_name'] for p in PRODUCTS]
+        labels = product_nodes + [m['machine_name'] for m in line_machines]
+        colors = ["#92400e" if p['product_tier'] == "Raw" else "#94a3b8" for p in PRODUCTS] + \
+                 ["#ef4444" if m['machine_type'] == "Smelter" else "#3b82f6" for m in line_machines]
+
+        sources, targets, values = [], [], []
+        for idx, machine in enumerate(line_machines):
+            node = len(product_nodes) + idx
+            units = machines_data.get(machine['machine_id'], {}).get('units_produced', 0)
+
+            sources += [product_nodes.index(machine['input_product']), node]
+            targets += [node, product_nodes.index(machine['output_product'])]
+            values += [units * input_ratios[machine['output_product']], units]
+
         # Create Sankey diagram
         fig = go.Figure(data=[go.Sankey(
             node=dict(
                 pad=15,
                 thickness=20,
                 line=dict(color="black", width=0.5),
-                label=["Iron Ore", "Smelter #1", "Smelter #2", "Iron Plates", "Assembler #1", "Gear Wheels"],
-                color=["#92400e", "#ef4444", "#ef4444", "#94a3b8", "#3b82f6", "#fbbf24"]
+                label=labels,
+                color=colors
             ),
             link=dict(
-                source=[0, 0, 1, 2, 3, 4],
-                target=[1, 2, 3, 3, 4, 5],
-                value=[
-                    machines_data.get("SMELTER-01", {}).get('units_produced', 0),
-                    machines_data.get("SMELTER-02", {}).get('units_produced', 0),
-                    machines_data.get("SMELTER-01", {}).get('units_produced', 0),
-                    machines_data.get("SMELTER-02", {}).get('units_produced', 0),
-                    products.get("Iron Plate", {}).get('units_produced', 0),
-                    products.get("Gear Wheel", {}).get('units_produced', 0)
-                ],
-                color=["rgba(239, 68, 68, 0.4)"] * 6
+                source=sources,
+                target=targets,
+                value=values,
+                color=["rgba(239, 68, 68, 0.4)"] * len(values)
             )
         )])
 
@@ -421,22 +380,24 @@ with bottom_left:
 
         st.plotly_chart(fig, use_container_width=True)
 
-        # Daily production summary
+        # Daily production summary (all lines); raw materials show consumption
         st.markdown("#### 📦 Daily Production Summary")
-        prod_cols = st.columns(3)
+        prod_cols = st.columns(len(PRODUCTS))
 
-        with prod_cols[0]:
-            iron_ore = machines_data.get("SMELTER-01", {}).get('units_produced', 0) + \
-                       machines_data.get("SMELTER-02", {}).get('units_produced', 0)
-            st.metric("🟤 Iron Ore Consumed", f"{iron_ore:,}")
+        for col, product in zip(prod_cols, PRODUCTS):
+            name = product['canonical_name']
+            icon = TIER_ICONS.get(product['product_tier'], "📦")
 
-        with prod_cols[1]:
-            plates = products.get("Iron Plate", {}).get('units_produced', 0)
-            st.metric("⬜ Iron Plates", f"{plates:,}")
-
-        with prod_cols[2]:
-            gears = products.get("Gear Wheel", {}).get('units_produced', 0)
-            st.metric("⚙️ Gear Wheels", f"{gears:,}")
+            with col:
+                if product['product_tier'] == "Raw":
+                    consumed = sum(
+                        machines_data.get(m['machine_id'], {}).get('units_produced', 0) * input_ratios[m['output_product']]
+                        for m in MACHINES if m['input_product'] == name
+                    )
+                    st.metric(f"{icon} {name} Consumed", f"{consumed:,}")
+                else:
+                    produced = products.get(name, {}).get('units_produced', 0)
+                    st.metric(f"{icon} {name}s", f"{produced:,}")
 
 # ============================================================================
 # QUADRANT 4: DATA QUALITY ALERTS (Bottom Right)
@@ -444,7 +405,7 @@ with bottom_left:
 with bottom_right:
     st.markdown("### 🚨 DATA QUALITY ALERTS")
 
-    chaos = calculate_chaos_metrics(st.session_state.current_day)
+    chaos = chaos_metrics(day_to_date(st.session_state.current_day))
 
     # Chaos metrics
     st.markdown("#### Chaos Detected:")
@@ -465,7 +426,8 @@ with bottom_right:
     st.progress(min(chaos['duplicate_percent'] / 10, 1.0))
 
     # Machine ID variations
-    st.markdown("🟡 **Machine ID Variations:** 5+ detected")
+    id_variations = sum(len(v) - 1 for v in CHAOS_CONFIG['machine_id_variations'].values())
+    st.markdown(f"🟡 **Machine ID Variations:** {id_variations} configured")
     st.progress(0.5)
 
     # Timestamp drift
@@ -475,13 +437,16 @@ with bottom_right:
     st.markdown("---")
     st.markdown("#### 📋 Recent Events:")
 
-    # Sample event log
+    # Sample event log, naming configured machines
+    first_machine = MACHINES[0]['machine_id']
+    variation_machine = MACHINES[min(1, len(MACHINES) - 1)]['machine_id']
+    variations = CHAOS_CONFIG['machine_id_variations'].get(variation_machine, [variation_machine])
     events = [
-        ("⚠️", "Null temperature detected on SMELTER-01"),
+        ("⚠️", f"Null temperature detected on {first_machine}"),
         ("📝", f"Product name variation: found {chaos['product_variations']} spellings"),
         ("🔁", f"{chaos['duplicates']} duplicate batches detected"),
         ("⏰", "Timestamp drift: +4 minutes detected"),
-        ("🔧", "Machine ID variation: 'Smelter-2' vs 'SMELTER-02'")
+        ("🔧", f"Machine ID variation: '{variations[1] if len(variations) > 1 else variation_machine}' vs '{variation_machine}'")
     ]
 
     for icon, event in events[:5]:
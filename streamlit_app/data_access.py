@@ -0,0 +1,185 @@
+"""
+Server-side query layer for the dashboard.
+
+Every Streamlit session shares one in-process DuckDB engine
+(st.cache_resource). The engine holds no tables of its own; queries scan the
+aggregate store's Parquet partitions for the requested dates (see
+data_generators/aggregates.py) on a per-query cursor, and return only small
+results (a handful of numbers per machine). Results are cached per date with
+st.cache_data, so sessions viewing the same day share one computation.
+"""
+from datetime import date as date_type
+from typing import Dict, List, Optional
+
+import duckdb
+import streamlit as st
+
+from data_generators.config import AGGREGATES_DIR
+from data_generators.aggregates import partition_files
+
+# Cached query results expire so regenerated days show up without a restart
+QUERY_TTL_SECONDS = 60
+
+# Threads per query on the shared engine; queries are tiny, sessions are many
+ENGINE_THREADS = 2
+
+
+@st.cache_resource
+def get_engine() -> duckdb.DuckDBPyConnection:
+    """
+    Create the DuckDB engine shared by all sessions.
+
+    DuckDB cannot open an in-memory database read-only, and the engine needs
+    no database file of its own (it only scans Parquet). It is locked down
+    instead: file access is limited to the aggregate store and the
+    configuration is frozen, so no query can touch other files or undo that.
+    """
+    engine = duckdb.connect(":memory:", config={"threads": ENGINE_THREADS})
+    engine.execute("SET allowed_directories = ?", [[AGGREGATES_DIR.resolve().as_posix() + "/"]])
+    engine.execute("SET enable_external_access = false")
+    engine.execute("SET lock_configuration = true")
+    return engine
+
+
+def run_query(sql: str, table: str, start: date_type, end: Optional[date_type] = None) -> List[Dict]:
+    """
+    Run a query over one aggregate table's partitions for a date range.
+
+    The query reads the partitions through the ``agg`` relation and runs on
+    its own cursor of the shared engine, so concurrent sessions do not
+    contend for a single connection.
+
+    Args:
+        sql: Query selecting FROM agg
+        table: Aggregate table ("machine_daily" or "chaos_daily")
+        start: First date (inclusive)
+        end: Last date (inclusive, default = start)
+
+    Returns:
+        Result rows as dictionaries (empty if no partition exists)
+    """
+    files = partition_files(table, start, end)
+    if not files:
+        return []
+
+    cursor = get_engine().cursor()
+    try:
+        result = cursor.execute(
+            f"WITH agg AS (SELECT * FROM read_parquet(?, hive_partitioning = true)) {sql}", [files]
+        )
+        columns = [column[0] for column in result.description]
+        return [dict(zip(columns, row)) for row in result.fetchall()]
+    finally:
+        cursor.close()
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def machine_day_stats(date: date_type) -> List[Dict]:
+    """
+    Per-machine production totals for a day.
+
+    Args:
+        date: Production date
+
+    Returns:
+        One row per machine (machine_id, product_name, batches, units_produced,
+        units_defective, energy_consumed_kwh)
+    """
+    return run_query("""
+        SELECT machine_id, product_name, batches, units_produced, units_defective, energy_consumed_kwh
+        FROM agg
+        ORDER BY machine_id
+    """, "machine_daily", date)
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def day_summary(date: date_type) -> Dict:
+    """
+    A day's production totals shaped like truth.json.
+
+    Args:
+        date: Production date
+
+    Returns:
+        {"total_batches", "by_machine", "by_product", "factory_totals"}, or {}
+        if the day has no aggregates
+    """
+    machines = machine_day_stats(date)
+    if not machines:
+        return {}
+
+    products = run_query("""
+        SELECT product_name,
+               CAST(sum(batches) AS INTEGER) AS batches,
+               CAST(sum(units_produced) AS BIGINT) AS units_produced,
+               CAST(sum(units_defective) AS BIGINT) AS units_defective
+        FROM agg
+        GROUP BY product_name
+    """, "machine_daily", date)
+
+    return {
+        "total_batches": sum(m["batches"] for m in machines),
+        "by_machine": {
+            m["machine_id"]: {
+                "batches": m["batches"],
+                "units_produced": m["units_produced"],
+                "units_defective": m["units_defective"],
+                "energy_consumed_kwh": m["energy_consumed_kwh"]
+            }
+            for m in machines
+        },
+        "by_product": {p.pop("product_name"): p for p in products},
+        "factory_totals": {
+            "units_produced": sum(m["units_produced"] for m in machines),
+            "units_defective": sum(m["units_defective"] for m in machines),
+            "energy_consumed_kwh": sum(m["energy_consumed_kwh"] for m in machines)
+        }
+    }
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def sensor_averages(date: date_type) -> Optional[Dict]:
+    """
+    Average non-null temperature and pressure for a day.
+
+    Args:
+        date: Production date
+
+    Returns:
+        {"temperature", "pressure"} (None when there are no readings)
+    """
+    rows = run_query("""
+        SELECT sum(temperature_sum) / nullif(sum(temperature_count), 0) AS temperature,
+               sum(pressure_sum) / nullif(sum(pressure_count), 0) AS pressure
+        FROM agg
+    """, "chaos_daily", date)
+
+    if not rows or rows[0]["temperature"] is None or rows[0]["pressure"] is None:
+        return None
+    return rows[0]
+
+
+@st.cache_data(ttl=QUERY_TTL_SECONDS)
+def chaos_metrics(date: date_type) -> Dict:
+    """
+    Data-quality metrics for a day's on-time raw files.
+
+    Args:
+        date: Production date
+
+    Returns:
+        {"null_count", "null_percent", "product_variations", "duplicates",
+        "duplicate_percent"} (zeros if the day has no aggregates)
+    """
+    rows = run_query("""
+        SELECT CAST(sum(sensor_nulls) AS BIGINT) AS null_count,
+               coalesce(sum(sensor_nulls) * 100.0 / nullif(sum(sensor_values), 0), 0) AS null_percent,
+               CAST(max(product_variations) AS INTEGER) AS product_variations,
+               CAST(sum(duplicate_batches) AS BIGINT) AS duplicates,
+               coalesce(sum(duplicate_batches) * 100.0 / nullif(sum(batch_rows), 0), 0) AS duplicate_percent
+        FROM agg
+    """, "chaos_daily", date)
+
+    if not rows:
+        return {"null_count": 0, "null_percent": 0, "product_variations": 0, "duplicates": 0, "duplicate_percent": 0}
+    return rows[0]